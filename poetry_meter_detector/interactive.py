@@ -7,72 +7,182 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.preprocess import (
     clean_text, split_into_lines, 
-    detect_stress_pattern, identify_meter, load_ruaccent_model,
-    detect_stress_pattern_en, identify_meter_en, analyze_english_poem
+    detect_stress_pattern, detect_stress_patterns_batch, identify_meters_batch, get_ruaccent_model,
+    detect_stress_patterns_en, identify_meters_en, load_stress_dict
 )
+from utils.records import LineAnalysis
+from utils.streaming import MeterStatistics
 
 def print_separator():
     """Выводит разделитель для лучшей читаемости"""
     print("\n" + "-" * 50 + "\n")
 
+class InteractiveSession:
+    def __init__(self, language='ru', accentizer=None):
+        self.language = language
+        self.accentizer = accentizer
+        self.stress_dict = load_stress_dict(language='en') if language == 'en' else None
+        self.lines = []
+        self.results = {}
+        self.stats = MeterStatistics(language)
+        self.analysed = 0
+
+    def _analyze_new(self, texts):
+        texts = [text for text in dict.fromkeys(texts) if text not in self.results]
+        if not texts:
+            return
+        clean_lines = [clean_text(text) for text in texts]
+        if self.language == 'en':
+            stress_patterns = detect_stress_patterns_en(clean_lines, self.stress_dict)
+            for text, stress_pattern, (meter, scores) in zip(texts, stress_patterns, identify_meters_en(stress_patterns)):
+                self.results[text] = LineAnalysis(text, stress_pattern, meter, scores=scores)
+        else:
+            stress_patterns = detect_stress_patterns_batch(clean_lines, accentizer=self.accentizer)
+            for text, stress_pattern, meter in zip(texts, stress_patterns, identify_meters_batch(stress_patterns)):
+                self.results[text] = LineAnalysis(text, stress_pattern, meter)
+        self.analysed += len(texts)
+
+    def result(self, index):
+        return self.results[self.lines[index]]
+
+    def _attach(self, text):
+        result = self.results[text]
+        self.stats.add(result.stress_pattern, result.meter)
+        return result
+
+    def _detach(self, text):
+        result = self.results[text]
+        self.stats.remove(result.stress_pattern, result.meter)
+
+    def add(self, text):
+        self._analyze_new([text])
+        self.lines.append(text)
+        return self._attach(text)
+
+    def extend(self, texts):
+        texts = [text for text in texts if clean_text(text).strip()]
+        self._analyze_new(texts)
+        for text in texts:
+            self.lines.append(text)
+            self._attach(text)
+
+    def edit(self, index, text):
+        self._analyze_new([text])
+        self._detach(self.lines[index])
+        self.lines[index] = text
+        return self._attach(text)
+
+    def remove(self, index):
+        self._detach(self.lines[index])
+        return self.results[self.lines.pop(index)]
+
+    def dominant(self):
+        if not self.stats.line_meters:
+            return None, 0
+        return self.stats.line_meters.most_common(1)[0]
+
+    def summary(self):
+        summary = self.stats.summary()
+        summary['analysed'] = self.analysed
+        return summary
+
+def print_line_result(number, result):
+    print(f"Строка {number}: '{result.line}'")
+    print(f"Схема ударений: {list(result.stress_pattern)}")
+    print(f"Размер: {result.meter}")
+    if result.scores:
+        print_scores(result.scores, "Оценки для размеров:")
+
+def print_scores(scores, title):
+    if 'costs' in scores:
+        print(f"Уверенность скандирования: {scores['confidence'] * 100:.1f}%")
+        print("Штрафы выравнивания по стопам:")
+        for m, cost in scores['costs'].items():
+            print(f"- {m}: {cost:.2f}")
+        return
+    print(title)
+    for m, s in scores.items():
+        print(f"- {m}: {s:.1f}%")
+
 def analyze_with_ruaccent(lines, accentizer=None):
+    session = InteractiveSession('ru', accentizer)
+    session.extend(lines)
     results = []
-    
     for i, line in enumerate(lines):
-        clean_line = clean_text(line)
-        
-        if not clean_line.strip():
+        if not clean_text(line).strip():
             continue
-            
-        stress_pattern = detect_stress_pattern(clean_line, language='ru', use_ruaccent=True, accentizer=accentizer)
-        
-        meter = identify_meter(stress_pattern)
-        
-        print(f"Строка {i+1}: '{line}'")
-        print(f"Схема ударений: {stress_pattern}")
-        print(f"Размер: {meter}")
+        result = session.results[line]
+        print_line_result(i + 1, result)
         print("---")
-        
-        results.append({
-            'line': line,
-            'stress_pattern': stress_pattern,
-            'meter': meter
-        })
-    
+        results.append(result)
     return results
 
 def analyze_english_text(lines):
-    results = []
-    
-    text = "\n".join(lines)
-    
-    analysis = analyze_english_poem(text)
-    
-    print(f"Общий размер стихотворения: {analysis['overall_meter']}")
-    print("Оценки для каждого размера:")
-    for meter, score in analysis['overall_scores'].items():
-        print(f"- {meter}: {score:.1f}%")
+    session = InteractiveSession('en')
+    session.extend(lines)
+    summary = session.summary()
+    print(f"Общий размер стихотворения: {summary['overall_meter']}")
+    print_scores(summary['overall_scores'], "Оценки для каждого размера:")
     print_separator()
-    
-    for i, line_analysis in enumerate(analysis['lines_analysis']):
-        line = line_analysis['line']
-        stress_pattern = line_analysis['stress_pattern']
-        meter = line_analysis['meter']
-        scores = line_analysis['scores']
-        
-        print(f"Строка {i+1}: '{line}'")
-        print(f"Схема ударений: {stress_pattern}")
-        print(f"Размер: {meter}")
-        
-        print("Оценки для размеров:")
-        for m, s in scores.items():
-            print(f"- {m}: {s:.1f}%")
+    results = [session.result(i) for i in range(len(session.lines))]
+    for number, result in enumerate(results, 1):
+        print_line_result(number, result)
         print("---")
-        
-        results.append(line_analysis)
-    
     return results
 
+def print_session_status(session):
+    meter, count = session.dominant()
+    if meter is None:
+        print("Пока нет проанализированных строк.")
+        return
+    if session.language == 'en':
+        print(f"Сейчас: {session.stats.overall_meter()} (по строкам чаще всего {meter}, {count}/{session.stats.lines})")
+    else:
+        print(f"Сейчас: {meter} ({count}/{session.stats.lines} строк)")
+
+SESSION_HELP = (
+    "Команды: ':e N текст' - заменить строку N, ':d N' - удалить строку N, "
+    "':p' - показать все строки, ':h' - справка. Пустая строка или 'exit' - завершить."
+)
+
+def _line_index(session, value):
+    try:
+        index = int(value) - 1
+    except ValueError:
+        return None
+    if 0 <= index < len(session.lines):
+        return index
+    return None
+
+def run_session_command(session, command):
+    parts = command.split(maxsplit=2)
+    name = parts[0]
+    if name == ':h':
+        print(SESSION_HELP)
+    elif name == ':p':
+        for number, text in enumerate(session.lines, 1):
+            result = session.results[text]
+            print(f"{number}. {text}  [{result.meter}]")
+        print_session_status(session)
+    elif name == ':d' and len(parts) >= 2:
+        index = _line_index(session, parts[1])
+        if index is None:
+            print(f"Нет строки с номером {parts[1]}")
+            return
+        session.remove(index)
+        print(f"Строка {index + 1} удалена.")
+        print_session_status(session)
+    elif name == ':e' and len(parts) == 3:
+        index = _line_index(session, parts[1])
+        if index is None:
+            print(f"Нет строки с номером {parts[1]}")
+            return
+        print_line_result(index + 1, session.edit(index, parts[2]))
+        print_session_status(session)
+    else:
+        print(f"Неизвестная команда: {command}")
+        print(SESSION_HELP)
+
 def interactive_mode():
     
     print("Выберите язык стихотворения:")
@@ -83,49 +193,45 @@ def interactive_mode():
     is_russian = language_choice.startswith("1")
     
     if is_russian:
-        accentizer = load_ruaccent_model()
+        accentizer = get_ruaccent_model()
         if accentizer is None:
             print("Предупреждение: не удалось загрузить модель")
     
+    session = InteractiveSession('ru' if is_russian else 'en',
+                                 accentizer=accentizer if is_russian else None)
+    
     print_separator()
-    print("Введите стихотворение построчно. Для завершения введите пустую строку или 'exit'.")
+    print("Введите стихотворение построчно. Каждая строка анализируется сразу.")
+    print(SESSION_HELP)
     
-    lines = []
     while True:
         line = input("> ")
         if line.strip() == "" or line.lower() == "exit":
             break
-        lines.append(line)
+        if line.startswith(':'):
+            run_session_command(session, line.strip())
+            continue
+        if not clean_text(line).strip():
+            continue
+        print_line_result(len(session.lines) + 1, session.add(line))
+        print_session_status(session)
+        print("---")
     
-    if not lines:
+    if not session.lines:
         print("Стихотворение не введено. Выход из программы.")
         return
     
     print_separator()
+    print("Итоговый результат:")
     
-    print("Результаты анализа метрики стихотворения:")
-    
+    summary = session.summary()
+    meter, count = session.dominant()
     if is_russian:
-        results = analyze_with_ruaccent(lines, accentizer=accentizer if 'accentizer' in locals() else None)
-        
-        print_separator()
-        print("Итоговый результат:")
-        
-        if results:
-            meter_count = {}
-            for r in results:
-                meter = r['meter']
-                if meter in meter_count:
-                    meter_count[meter] += 1
-                else:
-                    meter_count[meter] = 1
-            
-            most_common_meter = max(meter_count.items(), key=lambda x: x[1])
-            print(f"Наиболее вероятный размер: {most_common_meter[0]} ({most_common_meter[1]}/{len(results)} строк)")
-        else:
-            print("Не удалось проанализировать ни одной строки.")
+        print(f"Наиболее вероятный размер: {meter} ({count}/{summary['lines']} строк)")
     else:
-        results = analyze_english_text(lines)
+        print(f"Общий размер стихотворения: {summary['overall_meter']}")
+        print_scores(summary['overall_scores'], "Оценки для каждого размера:")
+    print(f"Строк проанализировано за сессию: {summary['analysed']}")
 
 if __name__ == "__main__":
     interactive_mode() 
\ No newline at end of file
@@ -1,34 +1,60 @@
+import argparse
 import json
 import re
 
+from utils.stress_index import build_compact_stress_dict
+
 input_path = "poetry_meter_detector/cmudict-0.7b"
 output_path = "poetry_meter_detector/data/dictionaries/stress_dict_en.json"
+compact_output_path = "poetry_meter_detector/data/dictionaries/stress_dict_en.bin"
+
+def parse_cmudict(path):
+    stress_dict = {}
+
+    with open(path, "r", encoding="latin-1") as f:
+        for line in f:
+            if line.startswith(";;;"):
+                continue
+
+            parts = line.strip().split()
+            if not parts:
+                continue
+
+            word = parts[0]
+            phonemes = parts[1:]
+
+            word = re.sub(r"\(\d+\)", "", word).lower()
 
-stress_dict = {}
+            stress_pattern = []
+            for phoneme in phonemes:
+                match = re.search(r"[012]", phoneme)
+                if match:
+                    stress = int(match.group())
+                    stress_pattern.append(0 if stress == 2 else stress)
 
-with open(input_path, "r", encoding="latin-1") as f:
-    for line in f:
-        if line.startswith(";;;"):
-            continue
+            if word not in stress_dict:
+                stress_dict[word] = stress_pattern
 
-        parts = line.strip().split()
-        if not parts:
-            continue
+    return stress_dict
 
-        word = parts[0]
-        phonemes = parts[1:]
+def main():
+    parser = argparse.ArgumentParser(description='Сборка английского словаря ударений из cmudict')
+    parser.add_argument('--input', type=str, default=input_path, help='Путь к cmudict-0.7b')
+    parser.add_argument('--output', type=str, default=output_path, help='Путь для JSON-словаря')
+    parser.add_argument('--compact-output', type=str, default=compact_output_path, help='Путь для компактного бинарного словаря')
+    parser.add_argument('--format', choices=['json', 'binary', 'all'], default='all', help='Какие форматы собрать')
+    args = parser.parse_args()
 
-        word = re.sub(r"\(\d+\)", "", word).lower()
+    stress_dict = parse_cmudict(args.input)
 
-        stress_pattern = []
-        for phoneme in phonemes:
-            match = re.search(r"[012]", phoneme)
-            if match:
-                stress = int(match.group())
-                stress_pattern.append(0 if stress == 2 else stress)
+    if args.format in ('json', 'all'):
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(stress_dict, f, indent=2, ensure_ascii=False)
+        print(f"JSON-словарь сохранен в {args.output} ({len(stress_dict)} слов)")
 
-        if word not in stress_dict:
-            stress_dict[word] = stress_pattern
+    if args.format in ('binary', 'all'):
+        count = build_compact_stress_dict(stress_dict, args.compact_output)
+        print(f"Компактный словарь сохранен в {args.compact_output} ({count} слов)")
 
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(stress_dict, f, indent=2, ensure_ascii=False)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import metrics, profiling
+from utils.preprocess import METER_ENGINES, _current_rss, get_meter_engine, set_meter_engine
+from utils.streaming import MeterStatistics, iter_analyze
+
+def open_input(path):
+    if path == '-':
+        return contextlib.nullcontext(io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8'))
+    return open(path, 'r', encoding='utf-8')
+
+def open_output(path):
+    if path is None:
+        return contextlib.nullcontext(None)
+    if path == '-':
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, 'w', encoding='utf-8')
+
+def main():
+    parser = argparse.ArgumentParser(description='Потоковый анализ размера и ритма для больших текстов')
+    parser.add_argument('--input', type=str, required=True, help="Файл с текстом ('-' - стандартный ввод)")
+    parser.add_argument('--language', choices=['ru', 'en'], default='ru', help='Язык текста')
+    parser.add_argument('--split', choices=['lines', 'sentences'], default='lines',
+                        help='Анализировать строки файла или предложения, как split_into_lines')
+    parser.add_argument('--output', type=str, default=None, help="JSONL-файл с результатами по строкам ('-' - стандартный вывод)")
+    parser.add_argument('--batch-size', type=int, default=64, help='Количество строк в одном вызове модели ударений')
+    parser.add_argument('--meter-engine', choices=METER_ENGINES, default=get_meter_engine(),
+                        help='Способ определения размера: эвристика по шаблонам или скандирование')
+    parser.add_argument('--progress', type=int, default=100000, help='Печатать прогресс каждые N строк (0 - не печатать)')
+    parser.add_argument('--metrics-file', type=str, default=None, help='Файл для метрик по этапам в формате Prometheus')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='WARNING',
+                        help='Уровень логов анализатора')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    set_meter_engine(args.meter_engine)
+    stats = MeterStatistics(args.language)
+    start = time.perf_counter()
+    with open_input(args.input) as stream, open_output(args.output) as output, profiling('analyze_stream'):
+        with contextlib.redirect_stdout(sys.stderr):
+            for result in iter_analyze(stream, args.language, split=args.split, batch_size=args.batch_size, stats=stats):
+                if output is not None:
+                    output.write(json.dumps(result, ensure_ascii=False) + '\n')
+                if args.progress and result['line_number'] % args.progress == 0:
+                    print(f"Обработано строк: {result['line_number']}")
+
+    elapsed = time.perf_counter() - start
+    summary = stats.summary()
+    rss = _current_rss()
+    memory = f"{rss / 1024 / 1024:.0f} МБ" if rss is not None else "неизвестно"
+    print(f"Строк: {summary['lines']}, общий размер: {summary['overall_meter']}", file=sys.stderr)
+    print("Размеры по строкам: " + ", ".join(
+        f"{meter} {count}" for meter, count in sorted(summary['meter_counts'].items(), key=lambda item: -item[1])
+    ), file=sys.stderr)
+    print(f"Время: {elapsed:.2f} с, {summary['lines'] / max(elapsed, 1e-9):.0f} строк/с, память процесса: {memory}",
+          file=sys.stderr)
+    print(metrics.report(), file=sys.stderr)
+    if args.metrics_file:
+        metrics.write(args.metrics_file)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    METER_ENGINES, NUMPY_AVAILABLE, VECTOR_BATCH_MIN_SIZE, get_meter_engine, identify_meter, identify_meters_batch, set_meter_engine
+)
+
+DEFAULT_DATASET = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'processed' / 'dataset.json'
+
+def load_patterns(path, repeat):
+    with open(path, 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+    patterns = [
+        line_analysis['stress_pattern']
+        for record in dataset
+        for line_analysis in record.get('line_analyses', [])
+    ]
+    return patterns * repeat
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение построчного и векторного определения размера')
+    parser.add_argument('--dataset', type=str, default=str(DEFAULT_DATASET), help='Путь к dataset.json')
+    parser.add_argument('--repeat', type=int, default=10, help='Сколько раз повторить набор строк')
+    parser.add_argument('--meter-engine', choices=METER_ENGINES, default=get_meter_engine(),
+                        help='Способ определения размера: эвристика по шаблонам или скандирование')
+    args = parser.parse_args()
+
+    set_meter_engine(args.meter_engine)
+
+    if not NUMPY_AVAILABLE:
+        print("NumPy не установлен, будет использован построчный анализ.")
+
+    patterns = load_patterns(args.dataset, args.repeat)
+    print(f"Строк для анализа: {len(patterns)}, способ определения размера: {args.meter_engine}")
+
+    identify_meters_batch(patterns[:VECTOR_BATCH_MIN_SIZE])
+
+    start = time.perf_counter()
+    per_line = [identify_meter(pattern) for pattern in patterns]
+    per_line_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = identify_meters_batch(patterns)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(per_line, batched) if a != b)
+
+    print(f"Построчно: {per_line_time:.3f} с, {len(patterns) / per_line_time:.0f} строк/с")
+    print(f"Пакетно: {batch_time:.3f} с, {len(patterns) / batch_time:.0f} строк/с")
+    print(f"Ускорение: {per_line_time / batch_time:.2f}x")
+    print(f"Расхождений: {mismatches}")
+
+if __name__ == '__main__':
+    main()
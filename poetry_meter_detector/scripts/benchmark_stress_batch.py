@@ -0,0 +1,68 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    clean_text, detect_stress_pattern, detect_stress_patterns_batch, get_ruaccent_model
+)
+
+DEFAULT_INPUT = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'raw' / 'source_poems.txt'
+
+def read_lines(path, limit):
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = clean_text(line.strip())
+            if line:
+                lines.append(line)
+            if limit and len(lines) >= limit:
+                break
+    return lines
+
+def run_per_line(lines, accentizer):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [detect_stress_pattern(line, language='ru', accentizer=accentizer) for line in lines]
+
+def run_batch(lines, accentizer, batch_size):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return detect_stress_patterns_batch(lines, accentizer=accentizer, batch_size=batch_size)
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение построчного и пакетного определения ударений')
+    parser.add_argument('--input', type=str, default=str(DEFAULT_INPUT), help='Файл со стихами')
+    parser.add_argument('--limit', type=int, default=500, help='Максимальное количество строк')
+    parser.add_argument('--batch-size', type=int, default=64, help='Количество строк в одном вызове RuAccent')
+    args = parser.parse_args()
+
+    accentizer = get_ruaccent_model()
+    if accentizer is None:
+        print("Модель RuAccent не загружена, бенчмарк невозможен.")
+        return
+
+    lines = read_lines(args.input, args.limit)
+    print(f"Строк для анализа: {len(lines)}")
+
+    run_batch(lines[:8], accentizer, args.batch_size)
+
+    start = time.perf_counter()
+    per_line = run_per_line(lines, accentizer)
+    per_line_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = run_batch(lines, accentizer, args.batch_size)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(per_line, batched) if a != b)
+
+    print(f"Построчно: {per_line_time:.2f} с, {len(lines) / per_line_time:.1f} строк/с")
+    print(f"Пакетно (batch_size={args.batch_size}): {batch_time:.2f} с, {len(lines) / batch_time:.1f} строк/с")
+    print(f"Ускорение: {per_line_time / batch_time:.2f}x")
+    print(f"Строк с отличающейся схемой ударений: {mismatches}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.tokenizer import clean_text, count_vowels, iter_tokens, normalize_word, split_into_lines
+
+DEFAULT_INPUT = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'raw' / 'source_poems.txt'
+
+def legacy_clean_text(text):
+    text = text.replace('\r\n', ' ').replace('\n', ' ')
+    while '  ' in text:
+        text = text.replace('  ', ' ')
+    return text
+
+def legacy_split_into_lines(text):
+    lines = re.split(r'[.!?]+', text)
+    return [line.strip() for line in lines if line.strip()]
+
+def legacy_clean_word(word):
+    if not word:
+        return ""
+    word = word.lower()
+    return re.sub(r'[^\w\s]', '', word)
+
+def legacy_words(text):
+    result = []
+    for word in text.split():
+        cleaned = legacy_clean_word(word)
+        result.append((cleaned, max(1, sum(1 for char in word.lower() if char in 'аеёиоуыэюя'))))
+    return result
+
+def tokenizer_words(text):
+    return [(token.word, max(1, token.vowels)) for token in iter_tokens(text)]
+
+def measure(function, argument, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def compare(name, legacy, current, argument, repeat):
+    legacy_result, legacy_time = measure(legacy, argument, repeat)
+    current_result, current_time = measure(current, argument, repeat)
+    status = "совпадает" if legacy_result == current_result else "РАСХОДИТСЯ"
+    print(f"{name:<28}{legacy_time * 1000:>12.2f}{current_time * 1000:>12.2f}{legacy_time / current_time:>10.1f}x  {status}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение старых функций нормализации текста с токенизатором')
+    parser.add_argument('--input', type=str, default=str(DEFAULT_INPUT), help='Файл со стихами')
+    parser.add_argument('--repeat', type=int, default=20, help='Количество повторов каждого замера (берется лучшее время)')
+    parser.add_argument('--spaces', type=int, default=20000, help='Длина пробельного блока в синтетическом тексте')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        text = f.read()
+    words = text.lower().split()
+    whitespace_heavy = ('слово' + ' ' * args.spaces) * 20
+
+    print(f"Корпус: {len(text)} символов, {len(words)} слов")
+    print(f"{'Функция':<28}{'старая, мс':>12}{'новая, мс':>12}{'ускорение':>11}")
+    compare('clean_text (корпус)', legacy_clean_text, clean_text, text, args.repeat)
+    compare('clean_text (пробелы)', legacy_clean_text, clean_text, whitespace_heavy, args.repeat)
+    compare('split_into_lines', legacy_split_into_lines, split_into_lines, text, args.repeat)
+    compare('clean_word (все слова)', lambda items: [legacy_clean_word(w) for w in items],
+            lambda items: [normalize_word(w) for w in items], words, args.repeat)
+    compare('слова + слоги', legacy_words, tokenizer_words, clean_text(text), args.repeat)
+    print(f"Гласных в корпусе: {count_vowels(text.lower())}")
+
+if __name__ == '__main__':
+    main()
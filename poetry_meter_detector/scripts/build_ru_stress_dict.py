@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    DICTIONARIES_DIR, HOMOGRAPHS_PATH, STRESS_MODELS, clean_text, clean_word, get_stress_model
+)
+from utils.ru_stress import UNSTRESSED_MONOSYLLABLES, VOWELS_RU
+from utils.stress_index import build_compact_stress_dict
+
+DEFAULT_INPUT = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'raw' / 'source_poems.txt'
+DEFAULT_OUTPUT = Path(DICTIONARIES_DIR) / 'stress_dict_ru.json'
+DEFAULT_COMPACT_OUTPUT = Path(DICTIONARIES_DIR) / 'stress_dict_ru.bin'
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = clean_text(line.strip().lower())
+            if line:
+                yield line
+
+def word_pattern(stressed_word):
+    plus_pos = stressed_word.find('+')
+    word = clean_word(stressed_word.replace('+', ''))
+    vowel_count = sum(1 for char in word if char in VOWELS_RU)
+    if not vowel_count or 'ё' in word:
+        return word, None
+    if vowel_count == 1:
+        if word in UNSTRESSED_MONOSYLLABLES:
+            return word, None
+        return word, (1 if plus_pos >= 0 else 0,)
+    if plus_pos < 0:
+        return word, None
+
+    stressed_vowel = sum(1 for char in stressed_word[:plus_pos] if char in VOWELS_RU)
+    if stressed_vowel >= vowel_count:
+        return word, None
+    pattern = [0] * vowel_count
+    pattern[stressed_vowel] = 1
+    return word, tuple(pattern)
+
+def collect_stresses(lines, accentizer):
+    observed = defaultdict(Counter)
+    for line in lines:
+        stressed_line = accentizer.process_all(line)
+        if isinstance(stressed_line, list) and stressed_line:
+            stressed_line = stressed_line[0]
+        for stressed_word in stressed_line.split():
+            word, pattern = word_pattern(stressed_word)
+            if word and pattern:
+                observed[word][pattern] += 1
+    return observed
+
+def remove_homographs(stress_dict, homographs):
+    removed = [word for word in homographs if word in stress_dict]
+    for word in removed:
+        del stress_dict[word]
+    return len(removed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Сборка русского словаря ударений по корпусу с помощью модели ударений')
+    parser.add_argument('--model', choices=STRESS_MODELS, default='ruaccent',
+                        help='Модель ударений для разметки корпуса (silero - пакет silero-stress)')
+    parser.add_argument('--input', type=str, default=str(DEFAULT_INPUT), help='Файл со стихами')
+    parser.add_argument('--output', type=str, default=str(DEFAULT_OUTPUT), help='Путь для JSON-словаря')
+    parser.add_argument('--compact-output', type=str, default=str(DEFAULT_COMPACT_OUTPUT), help='Путь для компактного бинарного словаря')
+    parser.add_argument('--homographs-output', type=str, default=HOMOGRAPHS_PATH, help='Путь для списка омографов')
+    parser.add_argument('--format', choices=['json', 'binary', 'all'], default='all', help='Какие форматы собрать')
+    parser.add_argument('--min-count', type=int, default=1, help='Минимальное число вхождений слова в корпусе')
+    parser.add_argument('--replace', action='store_true', help='Не объединять с существующим словарем')
+    parser.add_argument('--clean', action='store_true',
+                        help='Не вызывать модель, только удалить омографы из существующего словаря')
+    args = parser.parse_args()
+
+    observed = {}
+    if not args.clean:
+        accentizer = get_stress_model(args.model)
+        if accentizer is None:
+            print(f"Модель {args.model} не загружена, словарь собрать невозможно.")
+            return
+        observed = collect_stresses(read_lines(args.input), accentizer)
+
+    stress_dict = {}
+    if not args.replace and Path(args.output).exists():
+        with open(args.output, 'r', encoding='utf-8') as f:
+            stress_dict = json.load(f)
+    existing = len(stress_dict)
+
+    homographs = set()
+    if not args.replace and Path(args.homographs_output).exists():
+        with open(args.homographs_output, 'r', encoding='utf-8') as f:
+            homographs = set(json.load(f))
+
+    added = 0
+    ambiguous = 0
+    for word, patterns in observed.items():
+        if sum(patterns.values()) < args.min_count:
+            continue
+        if len(patterns) > 1:
+            ambiguous += 1
+            homographs.add(word)
+            continue
+        if word not in stress_dict:
+            added += 1
+        stress_dict[word] = list(next(iter(patterns)))
+
+    removed = remove_homographs(stress_dict, homographs)
+    stress_dict = dict(sorted(stress_dict.items()))
+    print(f"Слов в корпусе: {len(observed)}, добавлено: {added}, "
+          f"найдено омографов: {ambiguous}, было в словаре: {existing}, удалено омографов из словаря: {removed}")
+
+    if args.format in ('json', 'all'):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(stress_dict, f, indent=2, ensure_ascii=False)
+        print(f"JSON-словарь сохранен в {args.output} ({len(stress_dict)} слов)")
+
+    with open(args.homographs_output, 'w', encoding='utf-8') as f:
+        json.dump(sorted(homographs), f, indent=2, ensure_ascii=False)
+    print(f"Список омографов сохранен в {args.homographs_output} ({len(homographs)} слов)")
+
+    if args.format in ('binary', 'all'):
+        count = build_compact_stress_dict(stress_dict, args.compact_output)
+        print(f"Компактный словарь сохранен в {args.compact_output} ({count} слов)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+METER_DETECTOR_DIR = Path(__file__).parent.parent
+TRANSLATOR_SCRIPT = METER_DETECTOR_DIR.parent / 'poetry_translator' / 'translate_poem.py'
+
+HEAVY_MODULES = ['numpy', 'ruaccent', 'onnxruntime', 'google.generativeai', 'dotenv']
+
+SCENARIOS = {
+    'английский анализ': [
+        '-c',
+        "from utils.preprocess import analyze_english_poem\n"
+        "analyze_english_poem(\"Shall I compare thee to a summer's day?\\nThou art more lovely and more temperate\")"
+    ],
+    'русский анализ': [
+        '-c',
+        "from utils.preprocess import detect_stress_patterns_batch, identify_meters_batch\n"
+        "identify_meters_batch(detect_stress_patterns_batch(['мой дядя самых честных правил', 'когда не в шутку занемог']))"
+    ],
+    'translate_poem.py --help': [str(TRANSLATOR_SCRIPT), '--help']
+}
+
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+def run_scenario(arguments, repeat):
+    wall_times = []
+    modules = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=METER_DETECTOR_DIR,
+                                   capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - start)
+        modules = parse_importtime(completed.stderr)
+    return wall_times, modules
+
+def main():
+    parser = argparse.ArgumentParser(description='Время холодного старта (python -X importtime) для основных сценариев')
+    parser.add_argument('--repeat', type=int, default=5, help='Количество запусков каждого сценария')
+    parser.add_argument('--top', type=int, default=5, help='Сколько самых тяжелых импортов показать')
+    args = parser.parse_args()
+
+    for title, arguments in SCENARIOS.items():
+        wall_times, modules = run_scenario(arguments, args.repeat)
+        names = {name.strip() for name, _, _ in modules}
+        imports_total = sum(self_us for _, self_us, _ in modules) / 1000
+        heavy = [module for module in HEAVY_MODULES if module in names]
+        print(f"\n{title}")
+        print(f"  время процесса: медиана {statistics.median(wall_times) * 1000:.0f} мс, "
+              f"мин. {min(wall_times) * 1000:.0f} мс ({args.repeat} запусков)")
+        print(f"  импорты: {imports_total:.0f} мс, модулей: {len(modules)}")
+        print(f"  тяжелые импорты при старте (включая неудачные попытки): {', '.join(heavy) if heavy else 'нет'}")
+        top_level = [(name, cumulative_us) for name, _, cumulative_us in modules if not name.startswith(' ')]
+        for name, cumulative_us in sorted(top_level, key=lambda item: -item[1])[:args.top]:
+            print(f"    {name:<40}{cumulative_us / 1000:>8.1f} мс")
+
+if __name__ == '__main__':
+    main()
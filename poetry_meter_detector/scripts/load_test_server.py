@@ -0,0 +1,93 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.analysis_client import DEFAULT_SERVER_URL, AnalysisClient, AnalysisServerError
+
+SERVER_SCRIPT = Path(__file__).parent.parent / 'server.py'
+DEFAULT_DATASET = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'processed' / 'dataset.json'
+
+def load_requests(path, count, lines_per_request):
+    with open(path, 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+    lines = [line.strip() for record in dataset for line in record['source_text'].split('\n') if line.strip()]
+    source = cycle(lines)
+    return [list(islice(source, lines_per_request)) for _ in range(count)]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def wait_for_server(client, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return client.health()
+        except AnalysisServerError:
+            time.sleep(0.1)
+    raise AnalysisServerError(f"Сервер не ответил за {timeout:.0f} с")
+
+def send(client, endpoint, lines):
+    start = time.perf_counter()
+    if endpoint == 'process_all':
+        client.process_all('\n'.join(lines))
+    elif endpoint == 'stress':
+        client.stress_patterns(lines)
+    else:
+        client.analyze(lines)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочный тест сервера анализа: задержки p50/p99 и пропускная способность')
+    parser.add_argument('--url', type=str, default=DEFAULT_SERVER_URL, help='Адрес сервера')
+    parser.add_argument('--spawn', action='store_true', help='Запустить server.py на время теста')
+    parser.add_argument('--server-args', type=str, default='', help='Дополнительные аргументы для server.py при --spawn')
+    parser.add_argument('--endpoint', choices=['analyze', 'stress', 'process_all'], default='analyze', help='Какой метод вызывать')
+    parser.add_argument('--requests', type=int, default=1000, help='Количество запросов')
+    parser.add_argument('--concurrency', type=int, default=16, help='Количество одновременных клиентов')
+    parser.add_argument('--lines-per-request', type=int, default=4, help='Строк в одном запросе')
+    parser.add_argument('--dataset', type=str, default=str(DEFAULT_DATASET), help='Путь к dataset.json')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        port = args.url.rsplit(':', 1)[-1].rstrip('/')
+        command = [sys.executable, str(SERVER_SCRIPT), '--port', port] + args.server_args.split()
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    client = AnalysisClient(args.url)
+    try:
+        health = wait_for_server(client, timeout=120 if args.spawn else 5)
+        before = health['batching']
+        print(f"Сервер: {args.url}, ударения: {health['accentizer']}")
+
+        payloads = load_requests(args.dataset, args.requests, args.lines_per_request)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            latencies = list(executor.map(lambda lines: send(client, args.endpoint, lines), payloads))
+        elapsed = time.perf_counter() - start
+        after = client.health()['batching']
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    batches = after['batches'] - before['batches']
+    texts = after['requests'] - before['requests']
+    print(f"Запросов: {len(latencies)} по {args.lines_per_request} строк, клиентов: {args.concurrency}, метод: /{args.endpoint}")
+    print(f"Задержка: p50 {percentile(latencies, 0.5) * 1000:.1f} мс, p99 {percentile(latencies, 0.99) * 1000:.1f} мс, "
+          f"макс. {max(latencies) * 1000:.1f} мс")
+    print(f"Пропускная способность: {len(latencies) / elapsed:.0f} запросов/с, "
+          f"{len(latencies) * args.lines_per_request / elapsed:.0f} строк/с")
+    print(f"Вызовов модели: {batches}, текстов в среднем на вызов: {texts / max(batches, 1):.1f}, "
+          f"время модели: {after['model_time'] - before['model_time']:.2f} с")
+
+if __name__ == '__main__':
+    main()
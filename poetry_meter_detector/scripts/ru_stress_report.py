@@ -0,0 +1,113 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    clean_text, detect_stress_patterns_batch, get_ruaccent_model, identify_meters_batch, load_stress_dict
+)
+from utils.ru_stress import RuStressEngine
+
+DEFAULT_INPUT = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'raw' / 'source_poems.txt'
+
+def read_lines(path, limit):
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = clean_text(line.strip())
+            if line:
+                lines.append(line)
+            if limit and len(lines) >= limit:
+                break
+    return lines
+
+def timed_patterns(lines, accentizer):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        patterns = detect_stress_patterns_batch(lines, accentizer=accentizer)
+    return patterns, time.perf_counter() - start
+
+def stressed_words(accentizer, line):
+    stressed_line = accentizer.process_all(line.lower())
+    if isinstance(stressed_line, list) and stressed_line:
+        stressed_line = stressed_line[0]
+    return stressed_line.split()
+
+def word_accuracy(lines, engine, accentizer):
+    correct = Counter()
+    total = Counter()
+    for line in lines:
+        reference = stressed_words(accentizer, line)
+        predicted = stressed_words(engine, line)
+        if len(reference) != len(predicted):
+            continue
+        for word, expected, actual in zip(line.lower().split(), reference, predicted):
+            if '+' not in expected:
+                continue
+            _, source = engine.stress_word(word.strip('.,!?;:()«»"\'-—'))
+            total[source] += 1
+            if expected.find('+') == actual.find('+'):
+                correct[source] += 1
+    return correct, total
+
+def main():
+    parser = argparse.ArgumentParser(description='Точность и скорость встроенного определения ударений в сравнении с RuAccent')
+    parser.add_argument('--input', type=str, default=str(DEFAULT_INPUT), help='Файл со стихами')
+    parser.add_argument('--limit', type=int, default=0, help='Максимальное количество строк (0 - все)')
+    args = parser.parse_args()
+
+    lines = read_lines(args.input, args.limit)
+    engine = RuStressEngine(load_stress_dict(language='ru'))
+    print(f"Строк для анализа: {len(lines)}, правил по суффиксам: {engine.rules.size}")
+
+    engine_patterns, engine_time = timed_patterns(lines, engine)
+    print(f"Встроенный движок: {engine_time:.3f} с, {len(lines) / engine_time:.0f} строк/с")
+
+    sources = Counter()
+    for line in lines:
+        for word in line.lower().split():
+            sources[engine.stress_word(word.strip('.,!?;:()«»"\'-—'))[1]] += 1
+    total_words = sum(sources.values())
+    print("Источник ударения по словам (покрытие, не точность): " + ", ".join(
+        f"{source} {count / total_words * 100:.1f}%" for source, count in sources.most_common()
+    ))
+
+    accentizer = get_ruaccent_model()
+    if accentizer is None:
+        print("Модель RuAccent не загружена, сравнение точности невозможно.")
+        return
+
+    detect_stress_patterns_batch(lines[:8], accentizer=accentizer)
+    reference_patterns, reference_time = timed_patterns(lines, accentizer)
+    print(f"RuAccent: {reference_time:.3f} с, {len(lines) / reference_time:.0f} строк/с")
+    print(f"Ускорение: {reference_time / engine_time:.1f}x")
+
+    print(f"Эталон: {type(accentizer).__name__}. Словарь заполнен вручную или по выводу RuAccent "
+          f"(build_ru_stress_dict), поэтому для слов из словаря это самосогласованность, а не точность.")
+    correct, total = word_accuracy(lines, engine, accentizer)
+    all_total = sum(total.values())
+    if all_total:
+        print(f"Совпадение с RuAccent по словам: {sum(correct.values()) / all_total * 100:.1f}% ({all_total} слов)")
+        for source, count in total.most_common():
+            note = " (самосогласованность)" if source == 'dictionary' else ""
+            print(f"  {source}: {correct[source] / count * 100:.1f}% ({count} слов){note}")
+        outside_total = all_total - total['dictionary']
+        if outside_total:
+            outside_correct = sum(correct.values()) - correct['dictionary']
+            print(f"Точность на словах вне словаря: {outside_correct / outside_total * 100:.1f}% ({outside_total} слов)")
+
+    same_lines = sum(1 for a, b in zip(engine_patterns, reference_patterns) if a == b)
+    print(f"Совпадение схемы ударений по строкам с RuAccent: {same_lines / len(lines) * 100:.1f}%")
+
+    engine_meters = identify_meters_batch(engine_patterns)
+    reference_meters = identify_meters_batch(reference_patterns)
+    same_meters = sum(1 for a, b in zip(engine_meters, reference_meters) if a == b)
+    print(f"Совпадение размера по строкам с RuAccent: {same_meters / len(lines) * 100:.1f}%")
+
+if __name__ == '__main__':
+    main()
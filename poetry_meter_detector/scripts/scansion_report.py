@@ -0,0 +1,136 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    VECTOR_BATCH_MIN_SIZE, clean_text, detect_stress_pattern_en, identify_meter, identify_meter_en,
+    identify_meters_batch, load_stress_dict, set_meter_engine
+)
+from utils.scansion import METER_PATTERNS, clear_scan_cache, normalize_pattern, scan_meter
+
+DEFAULT_DATASET = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'processed' / 'dataset.json'
+
+def load_dataset(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+    ru_lines = [line_analysis['stress_pattern'] for record in dataset for line_analysis in record.get('line_analyses', [])]
+    ru_poems = [record['rhythm'] for record in dataset if record.get('rhythm')]
+    stress_dict = load_stress_dict(language='en')
+    en_lines = [
+        detect_stress_pattern_en(clean_text(line), stress_dict)
+        for record in dataset
+        for line in record.get('target_text', '').split('\n')
+        if clean_text(line).strip()
+    ]
+    return ru_lines, ru_poems, en_lines
+
+def synthetic_lines(count, pyrrhic_rate, seed=0):
+    generator = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        meter, pattern = generator.choice(list(METER_PATTERNS.items()))
+        feet = generator.randint(2, 6)
+        ictus = [foot * len(pattern) + pattern.index(1) for foot in range(feet)]
+        kept = [ictus[0]] + [pos for pos in ictus[1:-1] if generator.random() >= pyrrhic_rate] + [ictus[-1]]
+        lines.append((meter, kept))
+    return lines
+
+def report_synthetic(count, pyrrhic_rate):
+    lines = synthetic_lines(count, pyrrhic_rate)
+    heuristic = sum(1 for meter, pattern in lines if identify_meter(pattern) == meter)
+    scanned = sum(1 for meter, pattern in lines if scan_meter(pattern)[0] == meter)
+    print(f"\nСинтетические строки известного размера ({count}, пропуск ударения {pyrrhic_rate:.0%}): "
+          f"эвристика {heuristic / count * 100:.1f}%, скандирование {scanned / count * 100:.1f}%")
+
+def timed(function, patterns, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function(patterns)
+    return result, (time.perf_counter() - start) / repeat
+
+def scan_cold(patterns):
+    clear_scan_cache()
+    return [scan_meter(pattern) for pattern in patterns]
+
+def scan_warm(patterns):
+    return [scan_meter(pattern) for pattern in patterns]
+
+def report_agreement(title, heuristic, scanned):
+    valid = [(old, new) for old, (new, _, _) in zip(heuristic, scanned) if new != "неопределенный размер"]
+    agreed = [confidence for old, (new, confidence, _) in zip(heuristic, scanned)
+              if new != "неопределенный размер" and old == new]
+    disagreed = [confidence for old, (new, confidence, _) in zip(heuristic, scanned)
+                 if new != "неопределенный размер" and old != new]
+    print(f"\n{title}: {len(valid)} строк с размером, совпадает {len(agreed)} ({len(agreed) / max(len(valid), 1) * 100:.1f}%)")
+    if agreed:
+        print(f"  средняя уверенность при совпадении: {sum(agreed) / len(agreed):.2f}")
+    if disagreed:
+        print(f"  средняя уверенность при расхождении: {sum(disagreed) / len(disagreed):.2f}")
+    confusion = Counter((old, new) for old, new in valid if old != new)
+    for (old, new), count in confusion.most_common(5):
+        print(f"  эвристика {old} -> скандирование {new}: {count}")
+
+def report_speed(title, rows, lines):
+    print(f"\n{title}")
+    baseline = rows[0][1]
+    for name, elapsed in rows:
+        print(f"  {name:<38}{elapsed * 1000:>9.1f} мс {lines / elapsed:>10.0f} строк/с {baseline / elapsed:>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение скандирования с эвристическим определением размера на dataset.json')
+    parser.add_argument('--dataset', type=str, default=str(DEFAULT_DATASET), help='Путь к dataset.json')
+    parser.add_argument('--synthetic', type=int, default=5000, help='Количество синтетических строк для проверки точности')
+    parser.add_argument('--repeat', type=int, default=5, help='Количество повторов каждого замера')
+    args = parser.parse_args()
+
+    set_meter_engine('heuristic')
+    ru_lines, ru_poems, en_lines = load_dataset(args.dataset)
+    print(f"Строк: русских {len(ru_lines)}, английских {len(en_lines)}; стихотворений: {len(ru_poems)}")
+
+    identify_meters_batch(ru_lines[:VECTOR_BATCH_MIN_SIZE])
+    ru_heuristic, ru_line_time = timed(lambda patterns: [identify_meter(p) for p in patterns], ru_lines, args.repeat)
+    _, ru_batch_time = timed(identify_meters_batch, ru_lines, args.repeat)
+    ru_scanned, ru_cold_time = timed(scan_cold, ru_lines, args.repeat)
+    _, ru_warm_time = timed(scan_warm, ru_lines, args.repeat)
+
+    en_heuristic, en_line_time = timed(lambda patterns: [identify_meter_en(p)[0] for p in patterns], en_lines, args.repeat)
+    en_normalized = [normalize_pattern(pattern) for pattern in en_lines]
+    en_scanned, en_cold_time = timed(scan_cold, en_normalized, args.repeat)
+    _, en_warm_time = timed(scan_warm, en_normalized, args.repeat)
+
+    poem_heuristic = [identify_meter(rhythm) for rhythm in ru_poems]
+    poem_scanned = [scan_meter(rhythm) for rhythm in ru_poems]
+
+    set_meter_engine('scansion')
+    ru_scan_batch, ru_scan_batch_time = timed(identify_meters_batch, ru_lines, args.repeat)
+    set_meter_engine('heuristic')
+    mismatches = sum(1 for batched, (scanned, _, _) in zip(ru_scan_batch, ru_scanned) if batched != scanned)
+
+    report_agreement("Русские строки (identify_meter)", ru_heuristic, ru_scanned)
+    report_agreement("Русские стихотворения целиком", poem_heuristic, poem_scanned)
+    report_agreement("Английские строки (identify_meter_en)", en_heuristic, en_scanned)
+    report_synthetic(args.synthetic, 0.0)
+    report_synthetic(args.synthetic, 0.3)
+
+    report_speed("Скорость, русские строки", [
+        ("identify_meter построчно", ru_line_time),
+        ("identify_meters_batch, эвристика", ru_batch_time),
+        ("identify_meters_batch, скандирование", ru_scan_batch_time),
+        ("scan_meter, пустой кэш", ru_cold_time),
+        ("scan_meter, прогретый кэш", ru_warm_time)
+    ], len(ru_lines))
+    print(f"  расхождений пакетного скандирования с scan_meter: {mismatches}")
+    report_speed("Скорость, английские строки", [
+        ("identify_meter_en построчно", en_line_time),
+        ("scan_meter, пустой кэш", en_cold_time),
+        ("scan_meter, прогретый кэш", en_warm_time)
+    ], len(en_lines))
+
+if __name__ == '__main__':
+    main()
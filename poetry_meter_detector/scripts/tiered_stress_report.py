@@ -0,0 +1,81 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.preprocess import (
+    STRESS_MODELS, clean_text, detect_stress_pattern, get_stress_model, load_homographs, load_stress_dict
+)
+from utils.ru_stress import TieredAccentizer
+
+DEFAULT_INPUT = Path(__file__).parent.parent.parent / 'poetry_translator' / 'data' / 'raw' / 'source_poems.txt'
+
+def read_lines(path, limit):
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = clean_text(line.strip())
+            if line:
+                lines.append(line)
+            if limit and len(lines) >= limit:
+                break
+    return lines
+
+def run_per_line(lines, accentizer):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        patterns = [detect_stress_pattern(line, language='ru', accentizer=accentizer) for line in lines]
+    return patterns, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Статистика многоуровневого определения ударений: словарь, затем модель ударений')
+    parser.add_argument('--input', type=str, default=str(DEFAULT_INPUT), help='Файл со стихами')
+    parser.add_argument('--limit', type=int, default=500, help='Максимальное количество строк (0 - все)')
+    parser.add_argument('--skip', type=int, default=0,
+                        help='Пропустить первые N строк (например, строки, по которым собран словарь)')
+    parser.add_argument('--model', choices=STRESS_MODELS, default='ruaccent',
+                        help='Модель ударений, к которой обращается многоуровневый режим')
+    args = parser.parse_args()
+
+    accentizer = get_stress_model(args.model)
+    if accentizer is None:
+        print(f"Модель {args.model} не загружена, сравнение невозможно.")
+        return
+
+    lines = read_lines(args.input, args.skip + args.limit if args.limit else 0)[args.skip:]
+    tiered = TieredAccentizer(accentizer, load_stress_dict(language='ru'), load_homographs())
+    print(f"Строк для анализа: {len(lines)}, слов в словаре: {len(tiered.stress_dict)}, омографов: {len(tiered.homographs)}")
+
+    run_per_line(lines[:8], accentizer)
+    baseline, baseline_time = run_per_line(lines, accentizer)
+    tiered.reset_stats()
+    resolved, tiered_time = run_per_line(lines, tiered)
+    stats = tiered.report()
+
+    print("Уровни по словам: " + ", ".join(f"{tier} {rate * 100:.1f}%" for tier, rate in stats['word_rates'].items()))
+    print("Уровни по строкам: " + ", ".join(f"{tier} {rate * 100:.1f}%" for tier, rate in stats['line_rates'].items()))
+    print(f"Вызовов модели: {stats['model_calls']}, слов через модель: {stats['model_words']} из {stats['words']}")
+
+    baseline_ms = baseline_time / len(lines) * 1000
+    tiered_ms = tiered_time / len(lines) * 1000
+    print(f"{args.model}: {baseline_ms:.2f} мс/строка, многоуровнево: {tiered_ms:.2f} мс/строка "
+          f"(в модели {stats['model_time'] / len(lines) * 1000:.2f} мс/строка)")
+    print(f"Экономия: {baseline_ms - tiered_ms:.2f} мс/строка ({baseline_time / tiered_time:.1f}x)")
+
+    same = sum(1 for a, b in zip(baseline, resolved) if a == b)
+    print(f"Совпадение схемы ударений по строкам с моделью {args.model} ({type(accentizer).__name__}): "
+          f"{same} из {len(lines)} ({same / len(lines) * 100:.1f}%)")
+
+    # Модель сама ставит ударения на предлоги и союзы, поэтому сверяем еще и с моделью,
+    # которая видит строки целиком, но с теми же правилами для односложных слов
+    whole_lines = TieredAccentizer(accentizer, {}, set(), context_words=max(len(line.split()) for line in lines))
+    reference, _ = run_per_line(lines, whole_lines)
+    same = sum(1 for a, b in zip(reference, resolved) if a == b)
+    print(f"Совпадение с моделью на целых строках без словаря: {same} из {len(lines)} ({same / len(lines) * 100:.1f}%)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from utils.preprocess import (
+    analyze_rhythms, clean_text, detect_stress_patterns_batch, detect_stress_patterns_en, get_ru_stress_engine,
+    get_ruaccent_model, get_tiered_accentizer, identify_meters_batch, identify_meters_en, load_stress_dict
+)
+from utils.metrics import metrics, profiling
+from utils.records import LineAnalysis
+from utils.streaming import MeterStatistics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+BATCH_WINDOW_MS = 5.0
+MAX_BATCH_WORDS = 4096
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+class _PendingText:
+    __slots__ = ('text', 'line_words', 'words', 'done', 'result', 'error')
+
+    def __init__(self, text):
+        self.text = text
+        self.line_words = [len(line.split()) for line in text.split('\n')]
+        self.words = sum(self.line_words)
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class MicroBatcher:
+    def __init__(self, accentizer, window=BATCH_WINDOW_MS / 1000, max_words=MAX_BATCH_WORDS):
+        self.accentizer = accentizer
+        self.window = window
+        self.max_words = max_words
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.fallbacks = 0
+        self.model_time = 0.0
+        self.thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self.thread.start()
+
+    def collect_metrics(self):
+        stats = self.stats()
+        return [
+            ('server_texts', 'counter', "Тексты, прошедшие через пакетный вызов модели", [({}, stats["requests"])]),
+            ('server_batches', 'counter', "Пакетные вызовы модели", [({}, stats["batches"])]),
+            ('server_model_seconds', 'counter', "Время модели в пакетных вызовах, с", [({}, stats["model_time"])])
+        ]
+
+    def process_all(self, text):
+        pending = _PendingText(text)
+        self.queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "fallbacks": self.fallbacks,
+                "model_time": self.model_time
+            }
+
+    def _collect(self, first):
+        batch = [first]
+        words = first.words
+        deadline = time.monotonic() + self.window
+        while words < self.max_words:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if pending is None:
+                self.queue.put(None)
+                break
+            batch.append(pending)
+            words += pending.words
+        return batch
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+            self._process(self._collect(first))
+
+    def _process(self, batch):
+        start = time.perf_counter()
+        words = None
+        try:
+            stressed = self.accentizer.process_all('\n'.join(pending.text for pending in batch))
+            if isinstance(stressed, list) and stressed:
+                stressed = stressed[0]
+            words = stressed.split()
+        except Exception as e:
+            metrics.inc('model_failures', model=type(self.accentizer).__name__, stage='call')
+            logger.warning(f"Ошибка пакетной обработки ({len(batch)} запросов): {e}")
+
+        fallback = words is None or len(words) != sum(pending.words for pending in batch)
+        if not fallback:
+            offset = 0
+            for pending in batch:
+                lines = []
+                for count in pending.line_words:
+                    lines.append(' '.join(words[offset:offset + count]))
+                    offset += count
+                pending.result = '\n'.join(lines)
+        else:
+            metrics.inc('model_failures', model=type(self.accentizer).__name__, stage='batch')
+            for pending in batch:
+                try:
+                    pending.result = self.accentizer.process_all(pending.text)
+                except Exception as e:
+                    metrics.inc('model_failures', model=type(self.accentizer).__name__, stage='call')
+                    pending.error = e
+
+        with self.lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.fallbacks += fallback
+            self.model_time += time.perf_counter() - start
+        for pending in batch:
+            pending.done.set()
+
+def load_server_accentizer(tiered=False):
+    accentizer = get_tiered_accentizer() if tiered else get_ruaccent_model()
+    if accentizer is None:
+        print("Предупреждение: модель RuAccent не загружена. Будет использован словарь ударений с правилами по суффиксам.")
+        accentizer = get_ru_stress_engine()
+    return accentizer
+
+def analyze_lines(lines, language, batcher, stress_dict_en):
+    lines = [line for line in lines if clean_text(line).strip()]
+    stats = MeterStatistics(language)
+    results = []
+    if language == 'en':
+        patterns = detect_stress_patterns_en([clean_text(line) for line in lines], stress_dict_en)
+        for line, stress_pattern, (meter, scores), rhythm_info in zip(lines, patterns, identify_meters_en(patterns),
+                                                                    analyze_rhythms(patterns)):
+            results.append(LineAnalysis(line, stress_pattern, meter, rhythm_info, scores))
+    else:
+        patterns = detect_stress_patterns_batch([clean_text(line) for line in lines], accentizer=batcher)
+        for line, stress_pattern, meter, rhythm_info in zip(lines, patterns, identify_meters_batch(patterns),
+                                                            analyze_rhythms(patterns)):
+            results.append(LineAnalysis(line, stress_pattern, meter, rhythm_info))
+    for result in results:
+        stats.add(result.stress_pattern, result.meter)
+    return {
+        "lines": [result.to_dict() for result in results],
+        "meter": stats.overall_meter(),
+        "meter_counts": dict(stats.line_meters)
+    }
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_REQUEST_BYTES:
+            raise ValueError(f"Некорректная длина запроса: {length}")
+        payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        if not isinstance(payload, dict):
+            raise ValueError("Ожидался JSON-объект")
+        return payload
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != '/health':
+            self._send_json(404, {"error": f"Неизвестный путь: {self.path}"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "accentizer": type(self.server.batcher.accentizer).__name__,
+            "uptime": time.monotonic() - self.server.started,
+            "batching": self.server.batcher.stats()
+        })
+
+    def do_POST(self):
+        handlers = {
+            '/process_all': self._process_all,
+            '/stress': self._stress,
+            '/analyze': self._analyze
+        }
+        handler = handlers.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": f"Неизвестный путь: {self.path}"})
+            return
+        try:
+            payload = self._read_json()
+            response = handler(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.exception("Ошибка обработки запроса")
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, response)
+
+    def _lines(self, payload):
+        lines = payload['lines']
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            raise ValueError("Поле 'lines' должно быть списком строк")
+        return lines
+
+    def _process_all(self, payload):
+        text = payload['text']
+        if not isinstance(text, str):
+            raise ValueError("Поле 'text' должно быть строкой")
+        return {"result": self.server.batcher.process_all(text)}
+
+    def _stress(self, payload):
+        return {"patterns": detect_stress_patterns_batch(self._lines(payload), accentizer=self.server.batcher)}
+
+    def _analyze(self, payload):
+        language = payload.get('language', 'ru')
+        if language not in ('ru', 'en'):
+            raise ValueError(f"Неподдерживаемый язык: {language}")
+        return analyze_lines(self._lines(payload), language, self.server.batcher, self.server.stress_dict_en)
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, batcher, stress_dict_en=None):
+        super().__init__(address, AnalysisRequestHandler)
+        self.batcher = batcher
+        self.stress_dict_en = stress_dict_en
+        self.started = time.monotonic()
+
+def main():
+    parser = argparse.ArgumentParser(description='Сервер анализа размера: модель ударений загружается один раз')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='Адрес для прослушивания')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Порт')
+    parser.add_argument('--tiered', action='store_true',
+                        help='Сначала искать ударения в словаре, а RuAccent вызывать только для неизвестных слов и омографов')
+    parser.add_argument('--batch-window-ms', type=float, default=BATCH_WINDOW_MS,
+                        help='Сколько миллисекунд ждать другие запросы перед вызовом модели')
+    parser.add_argument('--max-batch-words', type=int, default=MAX_BATCH_WORDS,
+                        help='Максимальное количество слов в одном вызове модели')
+    parser.add_argument('--verbose', action='store_true', help='Писать в лог каждый запрос')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    start = time.perf_counter()
+    batcher = MicroBatcher(load_server_accentizer(args.tiered), window=args.batch_window_ms / 1000,
+                           max_words=args.max_batch_words)
+    stress_dict_en = load_stress_dict(language='en')
+    server = AnalysisServer((args.host, args.port), batcher, stress_dict_en)
+    metrics.register_collector(batcher.collect_metrics)
+    print(f"Сервер анализа запущен на http://{args.host}:{server.server_port} "
+          f"(загрузка {time.perf_counter() - start:.2f} с, окно пакета {args.batch_window_ms:.1f} мс)", flush=True)
+    try:
+        with profiling('server'):
+            server.serve_forever()
+    except KeyboardInterrupt:
+        print("Остановка сервера...")
+    finally:
+        server.server_close()
+        batcher.close()
+
+if __name__ == '__main__':
+    main()
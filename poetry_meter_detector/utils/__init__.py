@@ -1,15 +1,60 @@
 from .preprocess import (
     clean_text,
     detect_stress_pattern,
+    detect_stress_patterns_batch,
     identify_meter,
+    identify_meters_batch,
+    detect_stress_patterns_en,
+    identify_meters_en,
     load_ruaccent_model,
-    analyze_rhythm
+    get_ruaccent_model,
+    get_ruaccent_model_stats,
+    get_ru_stress_engine,
+    get_tiered_accentizer,
+    get_stress_model,
+    model_registry,
+    word_memo_stats,
+    clear_word_memo,
+    set_meter_engine,
+    analyze_rhythm,
+    analyze_rhythms
 )
+from .scansion import scan_meter, scan_meters_batch
+from .metrics import metrics, profiling
+from .records import LineAnalysis, PoemAnalysis, json_default
+from .ru_stress import RuStressEngine, SileroAccentizer, TieredAccentizer
+from .streaming import MeterStatistics, iter_analyze
 
 __all__ = [
     'clean_text',
     'detect_stress_pattern',
+    'detect_stress_patterns_batch',
     'identify_meter',
+    'identify_meters_batch',
+    'detect_stress_patterns_en',
+    'identify_meters_en',
     'load_ruaccent_model',
-    'analyze_rhythm'
+    'get_ruaccent_model',
+    'get_ruaccent_model_stats',
+    'get_ru_stress_engine',
+    'get_tiered_accentizer',
+    'get_stress_model',
+    'RuStressEngine',
+    'SileroAccentizer',
+    'TieredAccentizer',
+    'LineAnalysis',
+    'PoemAnalysis',
+    'json_default',
+    'metrics',
+    'profiling',
+    'MeterStatistics',
+    'iter_analyze',
+    'model_registry',
+    'word_memo_stats',
+    'clear_word_memo',
+    'set_meter_engine',
+    'scan_meter',
+    'scan_meters_batch',
+    'analyze_rhythm',
+    'analyze_rhythms'
 ]
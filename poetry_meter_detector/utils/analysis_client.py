@@ -0,0 +1,56 @@
+import json
+import os
+import urllib.error
+
+DEFAULT_SERVER_URL = 'http://127.0.0.1:8765'
+SERVER_URL_ENV = 'POETRY_ANALYSIS_SERVER'
+
+class AnalysisServerError(RuntimeError):
+    pass
+
+class AnalysisClient:
+    def __init__(self, url=DEFAULT_SERVER_URL, timeout=30.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, payload=None):
+        import urllib.request
+
+        data = None
+        headers = {}
+        if payload is not None:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json; charset=utf-8'
+        request = urllib.request.Request(self.url + path, data=data, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error', e.reason)
+            except (ValueError, AttributeError):
+                message = e.reason
+            raise AnalysisServerError(f"Сервер анализа вернул ошибку {e.code}: {message}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise AnalysisServerError(f"Сервер анализа недоступен по адресу {self.url}: {e}") from e
+
+    def health(self):
+        return self._request('/health')
+
+    def process_all(self, text):
+        return self._request('/process_all', {'text': text})['result']
+
+    def stress_patterns(self, lines):
+        return self._request('/stress', {'lines': list(lines)})['patterns']
+
+    def analyze(self, lines, language='ru'):
+        return self._request('/analyze', {'lines': list(lines), 'language': language})
+
+    def __repr__(self):
+        return f"AnalysisClient({self.url!r})"
+
+def client_from_env(timeout=30.0):
+    url = os.environ.get(SERVER_URL_ENV)
+    if not url:
+        return None
+    return AnalysisClient(url, timeout=timeout)
@@ -0,0 +1,90 @@
+import importlib
+import importlib.util
+import threading
+import time
+
+class Backend:
+    def __init__(self, name, module, missing_message=None):
+        self.name = name
+        self.module = module
+        self.missing_message = missing_message
+        self.load_time = None
+        self._available = None
+        self._loaded = None
+        self._failed = False
+
+    @property
+    def available(self):
+        if self._available is None:
+            try:
+                self._available = importlib.util.find_spec(self.module) is not None
+            except (ImportError, ValueError):
+                self._available = False
+        return self._available
+
+    @property
+    def loaded(self):
+        return self._loaded is not None
+
+    def load(self):
+        if self._loaded is not None or self._failed:
+            return self._loaded
+        if not self.available:
+            self._failed = True
+            return None
+        start = time.perf_counter()
+        try:
+            self._loaded = importlib.import_module(self.module)
+        except ImportError as e:
+            self._failed = True
+            print(f"Не удалось импортировать {self.module}: {e}")
+            return None
+        self.load_time = time.perf_counter() - start
+        return self._loaded
+
+class BackendRegistry:
+    def __init__(self):
+        self._backends = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, module, missing_message=None):
+        with self._lock:
+            self._backends[name] = Backend(name, module, missing_message)
+
+    def backend(self, name):
+        return self._backends[name]
+
+    def available(self, name):
+        return self._backends[name].available
+
+    def get(self, name):
+        backend = self._backends[name]
+        if backend.loaded:
+            return backend._loaded
+        with self._lock:
+            return backend.load()
+
+    def missing_message(self, name):
+        return self._backends[name].missing_message
+
+    def stats(self):
+        return {
+            name: {
+                "module": backend.module,
+                "available": backend.available,
+                "loaded": backend.loaded,
+                "load_time": backend.load_time
+            }
+            for name, backend in self._backends.items()
+        }
+
+backends = BackendRegistry()
+backends.register('ruaccent', 'ruaccent',
+                  "Библиотека ruaccent не установлена. Программа не сможет работать корректно.")
+backends.register('numpy', 'numpy')
+backends.register('silero_stress', 'silero_stress',
+                  "Библиотека silero-stress не установлена. Модель ударений silero будет недоступна.")
+backends.register('genai', 'google.generativeai',
+                  "Библиотека google-generativeai не установлена. Автоматический перевод через Gemini API будет недоступен.")
+backends.register('dotenv', 'dotenv',
+                  "Библиотека python-dotenv не установлена. API ключ нужно будет передавать иным способом или он не будет загружен.")
@@ -0,0 +1,253 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+METRICS_PREFIX = 'poetry'
+METRICS_ENV = 'POETRY_METRICS'
+PROFILE_ENV = 'POETRY_PROFILE'
+PROFILE_DIR_ENV = 'POETRY_PROFILE_DIR'
+PROFILE_MODES = ('cpu', 'memory')
+
+STAGES = ('normalise', 'accent', 'meter', 'rhythm', 'prompt', 'api')
+
+COUNTER_HELP = {
+    'dictionary_lookups': "Поиск слов в словаре ударений (result=hit - слово найдено)",
+    'model_failures': "Ошибки модели ударений или API (stage=load/call/batch)",
+    'unaligned_lines': "Строки, для которых модель вернула другое количество слов",
+    'api_requests': "Запросы к API перевода по результату"
+}
+
+class StageTimer:
+    __slots__ = ('metrics', 'stage', 'items', 'start')
+
+    def __init__(self, metrics, stage, items=1):
+        self.metrics = metrics
+        self.stage = stage
+        self.items = items
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, self.items)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())) + '}'
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+class Metrics:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = Counter()
+        self._collectors = []
+
+    def observe(self, stage, seconds, items=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += seconds
+            if seconds > entry[3]:
+                entry[3] = seconds
+
+    def timer(self, stage, items=1):
+        if not self.enabled:
+            return _NULL_TIMER
+        return StageTimer(self, stage, items)
+
+    @staticmethod
+    def key(name, **labels):
+        return name, tuple(sorted(labels.items()))
+
+    def add(self, key, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[key] += value
+
+    def inc(self, name, value=1, **labels):
+        self.add(self.key(name, **labels), value)
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def stages(self):
+        with self._lock:
+            entries = {stage: list(entry) for stage, entry in self._stages.items()}
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return {
+            stage: {
+                "calls": calls,
+                "items": items,
+                "seconds": seconds,
+                "max_seconds": max_seconds,
+                "ms_per_item": seconds / items * 1000 if items else 0.0
+            }
+            for stage, (calls, items, seconds, max_seconds) in sorted(
+                entries.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+        }
+
+    def counters(self):
+        with self._lock:
+            return {(name, labels): value for (name, labels), value in self._counters.items()}
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get(self.key(name, **labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def _families(self):
+        families = {}
+
+        def family(name, kind, help_text):
+            return families.setdefault(name, (kind, help_text, []))[2]
+
+        stages = self.stages()
+        for suffix, key, kind, help_text in (
+            ('stage_seconds', 'seconds', 'counter', "Суммарное время этапа, с"),
+            ('stage_calls', 'calls', 'counter', "Количество вызовов этапа"),
+            ('stage_items', 'items', 'counter', "Количество строк или промптов, прошедших этап"),
+            ('stage_max_seconds', 'max_seconds', 'gauge', "Самый долгий вызов этапа, с")
+        ):
+            samples = family(suffix, kind, help_text)
+            for stage, stats in stages.items():
+                samples.append(({"stage": stage}, stats[key]))
+
+        for (name, labels), value in sorted(self.counters().items()):
+            family(name, 'counter', COUNTER_HELP.get(name, name)).append((dict(labels), value))
+
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            for name, kind, help_text, samples in collector():
+                family(name, kind, help_text or COUNTER_HELP.get(name, name)).extend(samples)
+        return families
+
+    def to_prometheus(self, prefix=METRICS_PREFIX):
+        lines = []
+        for name, (kind, help_text, samples) in self._families().items():
+            full_name = f"{prefix}_{name}"
+            if kind == 'counter' and not full_name.endswith('_total'):
+                full_name += '_total'
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+
+    def report(self):
+        lines = ["Время по этапам:"]
+        stages = self.stages()
+        if not stages:
+            lines.append("  нет данных")
+        for stage, stats in stages.items():
+            lines.append(f"  {stage}: {stats['seconds'] * 1000:.1f} мс, вызовов {stats['calls']}, "
+                         f"элементов {stats['items']}, {stats['ms_per_item']:.3f} мс/элемент, "
+                         f"макс. {stats['max_seconds'] * 1000:.2f} мс")
+        counters = self.counters()
+        if counters:
+            lines.append("Счетчики:")
+            for (name, labels), value in sorted(counters.items()):
+                label_text = ', '.join(f"{key}={label}" for key, label in labels)
+                lines.append(f"  {name}" + (f" ({label_text})" if label_text else '') + f": {value}")
+        return '\n'.join(lines)
+
+metrics = Metrics(enabled=os.environ.get(METRICS_ENV, '1') != '0')
+
+def profile_modes(value=None):
+    value = os.environ.get(PROFILE_ENV, '') if value is None else value
+    modes = {mode.strip().lower() for mode in value.split(',') if mode.strip()}
+    if 'all' in modes or '1' in modes:
+        modes = set(PROFILE_MODES)
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        print(f"Неизвестные режимы профилирования в {PROFILE_ENV}: {', '.join(sorted(unknown))}. "
+              f"Доступны: {', '.join(PROFILE_MODES)}", file=sys.stderr)
+    return modes & set(PROFILE_MODES)
+
+@contextmanager
+def profiling(name, modes=None, output_dir=None, top=20):
+    modes = profile_modes() if modes is None else set(modes)
+    if not modes:
+        yield
+        return
+
+    output_dir = Path(output_dir or os.environ.get(PROFILE_DIR_ENV) or '.')
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler = None
+    if 'memory' in modes:
+        import tracemalloc
+        tracemalloc.start(10)
+    if 'cpu' in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            import io
+            import pstats
+
+            profiler.disable()
+            path = output_dir / f"{name}.prof"
+            profiler.dump_stats(str(path))
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+            (output_dir / f"{name}.prof.txt").write_text(stream.getvalue(), encoding='utf-8')
+            print(f"Профиль CPU сохранен в {path} (сводка: {path}.txt)", file=sys.stderr)
+        if 'memory' in modes:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            path = output_dir / f"{name}.memory.txt"
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"current {current} bytes, peak {peak} bytes\n")
+                for stat in snapshot.statistics('lineno')[:top]:
+                    f.write(f"{stat}\n")
+            print(f"Профиль памяти сохранен в {path} (пик {peak / 1024 / 1024:.1f} МБ)", file=sys.stderr)
@@ -1,107 +1,189 @@
-import re
 import os
 import json
+import hashlib
+import logging
 import sys
+import threading
+import time
+from itertools import count
+from functools import lru_cache
 import warnings
 
+from .backends import backends
+from .metrics import metrics
+from .stress_index import CompactStressDict
+from .records import LineAnalysis, PoemAnalysis
+from .ru_stress import RuStressEngine, SileroAccentizer, TieredAccentizer
+from .scansion import (
+    FEET, METER_PATTERNS, normalize_pattern, scan_costs, scan_lines, scan_lines_costs, scan_meter, scan_scores
+)
+from .tokenizer import (
+    VOWELS_EN, clean_text, count_vowel_groups_en, count_vowels, iter_tokens, normalize_word, split_into_lines
+)
+
 site_packages = os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming', 'Python', 'Python313', 'site-packages')
 if os.path.exists(site_packages) and site_packages not in sys.path:
     sys.path.append(site_packages)
     print(f"Добавлен путь к site-packages в preprocess.py: {site_packages}")
 
-try:
-    from ruaccent import RUAccent
-    RUACCENT_AVAILABLE = True
-except ImportError as e:
-    RUACCENT_AVAILABLE = False
-    warnings.warn(f"Библиотека не установлена: {e}. Программа не сможет работать корректно.")
+logger = logging.getLogger(__name__)
 
-def clean_text(text):
-    text = text.replace('\r\n', ' ').replace('\n', ' ')
-    
-    while '  ' in text:
-        text = text.replace('  ', ' ')
-    
-    return text
+RUACCENT_AVAILABLE = backends.available('ruaccent')
+if not RUACCENT_AVAILABLE:
+    warnings.warn(backends.missing_message('ruaccent'))
 
-def split_into_lines(text):
-    lines = re.split(r'[.!?]+', text)
-    
-    lines = [line.strip() for line in lines if line.strip()]
-    
-    return lines
+NUMPY_AVAILABLE = backends.available('numpy')
+
+WORD_MEMO_SIZE = int(os.environ.get('POETRY_WORD_MEMO_SIZE', 65536))
 
+METER_ENGINES = ('heuristic', 'scansion')
+METER_ENGINE = os.environ.get('POETRY_METER_ENGINE', 'heuristic')
+
+def set_meter_engine(engine):
+    global METER_ENGINE
+    if engine not in METER_ENGINES:
+        raise ValueError(f"Неизвестный способ определения размера: {engine}. Доступны: {', '.join(METER_ENGINES)}")
+    METER_ENGINE = engine
+
+def get_meter_engine():
+    return METER_ENGINE
+
+@lru_cache(maxsize=WORD_MEMO_SIZE)
 def count_syllables_ru(word):
-    vowels = 'аеёиоуыэюя'
-    
-    count = sum(1 for char in word.lower() if char in vowels)
-    
-    return max(1, count)
+    return max(1, count_vowels(word.lower()))
 
+@lru_cache(maxsize=WORD_MEMO_SIZE)
 def clean_word(word):
-    if not word:
-        return ""
-        
-    word = word.lower()
+    return normalize_word(word)
+
+@lru_cache(maxsize=WORD_MEMO_SIZE)
+def _stressed_vowel_offset(stressed_word):
+    plus_pos = stressed_word.find('+')
+    if plus_pos < 0:
+        return -1
+    return count_vowels(stressed_word[:plus_pos])
+
+def _stress_positions(tokens, stressed_words):
+    pattern = []
+    syllable_count = 0
     
-    word = re.sub(r'[^\w\s]', '', word)
+    for token, stressed_word in zip(tokens, stressed_words):
+        stressed_vowel_idx = _stressed_vowel_offset(stressed_word)
+            
+        if stressed_vowel_idx >= 0:
+            pattern.append(syllable_count + stressed_vowel_idx)
+            
+        syllable_count += max(1, token.vowels)
     
-    return word
+    return pattern
+
+def _accent_text(accentizer, text):
+    stressed_text = accentizer.process_all(text)
+    if isinstance(stressed_text, list) and len(stressed_text) > 0:
+        stressed_text = stressed_text[0]
+    return stressed_text
 
 def detect_stress_pattern(line, language='ru', use_ruaccent=True, accentizer=None):
     if not line.strip() or language != 'ru':
         return []
     
-    line = line.lower()
-    line = clean_text(line)
-    words = line.split()
+    with metrics.timer('normalise'):
+        line = line.lower()
+        line = clean_text(line)
     
+    if accentizer is None and use_ruaccent:
+        accentizer = get_ruaccent_model()
     if accentizer is None:
-        accentizer = load_ruaccent_model()
+        accentizer = get_ru_stress_engine()
     
     if accentizer:
         try:
-            stressed_line = accentizer.process_all(line)
-            if isinstance(stressed_line, list) and len(stressed_line) > 0:
-                stressed_line = stressed_line[0]
-            print(f"Проакцентированная строка: {stressed_line}")
+            with metrics.timer('accent'):
+                stressed_line = _accent_text(accentizer, line)
+            logger.debug(f"Проакцентированная строка: {stressed_line}")
             
             stressed_words = stressed_line.split()
-            original_words = line.split()
+            tokens = list(iter_tokens(line))
             
-            if len(stressed_words) == len(original_words):
-                pattern = []
-                syllable_count = 0
-                vowels_ru = 'аеёиоуыэюя'
-                
-                for i, (word, stressed_word) in enumerate(zip(original_words, stressed_words)):
-                    syllables_in_word = count_syllables_ru(word)
-                    stressed_vowel_idx = -1
-                    
-                    plus_pos = stressed_word.find('+')
-                    if plus_pos >= 0 and plus_pos < len(stressed_word):
-                        vowel_count = 0
-                        for j in range(plus_pos):
-                            if stressed_word[j] in vowels_ru:
-                                vowel_count += 1
-                        
-                        stressed_vowel_idx = vowel_count
-                        
-                    if stressed_vowel_idx >= 0:
-                        pattern.append(syllable_count + stressed_vowel_idx)
-                        
-                    syllable_count += syllables_in_word
-                
-                return pattern
+            if len(stressed_words) == len(tokens):
+                return _stress_positions(tokens, stressed_words)
+            metrics.inc('unaligned_lines')
         except Exception as e:
-            print(f"Ошибка при использовании RuAccent: {e}")
+            metrics.inc('model_failures', model=type(accentizer).__name__, stage='call')
+            logger.warning(f"Ошибка при использовании RuAccent: {e}")
     
-    print("Не удалось определить ударения с помощью RuAccent.")
+    logger.debug("Не удалось определить ударения с помощью RuAccent.")
     return []
 
+def _accent_chunk(accentizer, chunk):
+    total_words = sum(len(words) for _, _, words in chunk)
+    try:
+        stressed_words = _accent_text(accentizer, '\n'.join(line for _, line, _ in chunk)).split()
+    except Exception as e:
+        metrics.inc('model_failures', model=type(accentizer).__name__, stage='call')
+        logger.warning(f"Ошибка при пакетной обработке RuAccent: {e}")
+        stressed_words = []
+    
+    if len(stressed_words) == total_words:
+        results = []
+        offset = 0
+        for _, _, words in chunk:
+            results.append(stressed_words[offset:offset + len(words)])
+            offset += len(words)
+        return results
+    
+    metrics.inc('model_failures', model=type(accentizer).__name__, stage='batch')
+    results = []
+    for _, line, _ in chunk:
+        try:
+            results.append(_accent_text(accentizer, line).split())
+        except Exception as e:
+            metrics.inc('model_failures', model=type(accentizer).__name__, stage='call')
+            logger.warning(f"Ошибка при использовании RuAccent: {e}")
+            results.append(None)
+    return results
+
+def detect_stress_patterns_batch(lines, accentizer=None, batch_size=64, use_ruaccent=True):
+    patterns = [[] for _ in lines]
+    
+    prepared = []
+    with metrics.timer('normalise', len(lines)):
+        for i, line in enumerate(lines):
+            if not line.strip():
+                continue
+            normalized = clean_text(line.lower())
+            prepared.append((i, normalized, list(iter_tokens(normalized))))
+    
+    if not prepared:
+        return patterns
+    
+    if accentizer is None and use_ruaccent:
+        accentizer = get_ruaccent_model()
+    if accentizer is None:
+        accentizer = get_ru_stress_engine()
+    
+    if not accentizer:
+        logger.warning("Не удалось определить ударения с помощью RuAccent.")
+        return patterns
+    
+    for start in range(0, len(prepared), batch_size):
+        chunk = prepared[start:start + batch_size]
+        with metrics.timer('accent', len(chunk)):
+            stressed_chunk = _accent_chunk(accentizer, chunk)
+        for (i, _, words), stressed_words in zip(chunk, stressed_chunk):
+            if stressed_words is not None and len(stressed_words) == len(words):
+                patterns[i] = _stress_positions(words, stressed_words)
+            else:
+                metrics.inc('unaligned_lines')
+    
+    return patterns
+
 def identify_meter(stress_pattern):
     if not stress_pattern or len(stress_pattern) < 2:
         return "неопределенный размер"
+    
+    if METER_ENGINE == 'scansion':
+        return scan_meter(stress_pattern)[0]
 
 
     max_pos = max(stress_pattern) if stress_pattern else 0
@@ -110,13 +192,7 @@ def identify_meter(stress_pattern):
         binary_pattern[pos] = 1
     
 
-    meters = {
-        'ямб': [0, 1],
-        'хорей': [1, 0],
-        'дактиль': [1, 0, 0],
-        'амфибрахий': [0, 1, 0],
-        'анапест': [0, 0, 1]
-    }
+    meters = METER_PATTERNS
     
     line_length = len(binary_pattern)
     
@@ -142,14 +218,6 @@ def identify_meter(stress_pattern):
     for i in range(1, len(stress_pattern)):
         intervals.append(stress_pattern[i] - stress_pattern[i-1])
     
-    interval_patterns = {
-        'ямб': 2,
-        'хорей': 2,
-        'дактиль': 3,
-        'амфибрахий': 3,
-        'анапест': 3
-    }
-    
     if intervals:
         avg_interval = sum(intervals) / len(intervals)
         
@@ -171,6 +239,126 @@ def identify_meter(stress_pattern):
     
     return best_meter[0]
 
+VECTOR_BATCH_MIN_SIZE = 32
+VECTOR_CHUNK_SIZE = 4096
+
+def _meter_templates(width):
+    np = backends.get('numpy')
+    return np.array(
+        [[pattern[i % len(pattern)] for i in range(width)] for pattern in METER_PATTERNS.values()],
+        dtype=np.int8
+    )
+
+def _identify_meters_chunk(patterns):
+    np = backends.get('numpy')
+    lengths = np.fromiter((len(p) for p in patterns), dtype=np.int64, count=len(patterns))
+    starts = np.zeros(len(patterns), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    flat = np.fromiter((pos for p in patterns for pos in p), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(patterns)), lengths)
+    
+    line_lengths = np.maximum.reduceat(flat, starts) + 1
+    width = int(line_lengths.max())
+    
+    binary = np.zeros((len(patterns), width), dtype=np.int8)
+    binary[rows, flat] = 1
+    mask = np.arange(width) < line_lengths[:, None]
+    
+    matches = ((binary[:, None, :] == _meter_templates(width)[None, :, :]) & mask[:, None, :]).sum(axis=2)
+    scores = (matches / line_lengths[:, None]) * 100
+    
+    first = flat[starts]
+    last = flat[starts + lengths - 1]
+    avg_interval = (last - first) / (lengths - 1)
+    
+    meter_index = {name: i for i, name in enumerate(METER_PATTERNS)}
+    ternary = (avg_interval >= 2.6) & (avg_interval <= 3.4)
+    for remainder, name in ((0, 'дактиль'), (1, 'амфибрахий'), (2, 'анапест')):
+        selected = ternary & (first % 3 == remainder)
+        scores[selected, meter_index[name]] += 20
+    
+    parity = flat % 2
+    same_parity = np.minimum.reduceat(parity, starts) == np.maximum.reduceat(parity, starts)
+    binary_meter = ~ternary & (avg_interval >= 1.6) & (avg_interval <= 2.4) & same_parity
+    scores[binary_meter & (first % 2 == 1), meter_index['хорей']] += 15
+    scores[binary_meter & (first % 2 == 0), meter_index['ямб']] += 15
+    
+    names = list(METER_PATTERNS)
+    return [names[i] for i in np.argmax(scores, axis=1)]
+
+def _scan_tables(feet, max_position, max_gap):
+    np = backends.get('numpy')
+    period = feet[0].period
+    first = np.array([[foot.first(position) for foot in feet] for position in range(max_position + 1)])
+    steps = np.full((max_gap + 1, len(feet), period, period), np.inf)
+    for gap in range(1, max_gap + 1):
+        steps[gap] = np.array([foot.gap(gap) for foot in feet]).transpose(0, 2, 1)
+    return first, steps
+
+def _scan_meters_chunk(patterns):
+    np = backends.get('numpy')
+    lengths = np.fromiter((len(p) for p in patterns), dtype=np.int64, count=len(patterns))
+    order = np.argsort(-lengths, kind='stable')
+    lengths = lengths[order]
+    width = int(lengths[0])
+    mask = np.arange(width) < lengths[:, None]
+    positions = np.zeros((len(patterns), width), dtype=np.int64)
+    positions[mask] = np.fromiter((pos for i in order for pos in patterns[i]), dtype=np.int64, count=int(lengths.sum()))
+    active = mask.sum(axis=0)
+    
+    gaps = np.diff(positions, axis=1)
+    max_gap = max(int(gaps.max()), 1)
+    max_position = int(positions.max())
+    
+    costs = {}
+    for period in sorted({foot.period for foot in FEET.values()}):
+        feet = [foot for foot in FEET.values() if foot.period == period]
+        first, steps = _scan_tables(feet, max_position, max_gap)
+        vector = first[positions[:, 0]]
+        total = np.zeros((len(patterns), len(feet)))
+        for k in range(1, width):
+            rows = int(active[k])
+            gap = gaps[:rows, k - 1]
+            step = steps[np.clip(gap, 0, max_gap)]
+            current = vector[:rows]
+            stepped = current[:, :, 0, None] + step[:, :, 0, :]
+            for phase in range(1, period):
+                np.minimum(stepped, current[:, :, phase, None] + step[:, :, phase, :], out=stepped)
+            restart = gap <= 0
+            if restart.any():
+                total[:rows][restart] += current[restart].min(axis=2)
+                stepped[restart] = first[positions[:rows][restart, k]]
+            vector[:rows] = stepped
+        total += vector.min(axis=2)
+        for foot, foot_costs in zip(feet, total.T):
+            costs[foot.name] = foot_costs
+    
+    names = list(FEET)
+    best = np.argmin(np.stack([costs[name] for name in names], axis=1), axis=1)
+    meters = [None] * len(patterns)
+    for i, index in zip(order, best):
+        meters[i] = names[index]
+    return meters
+
+def identify_meters_batch(patterns):
+    with metrics.timer('meter', len(patterns)):
+        return _identify_meters_batch(patterns)
+
+def _identify_meters_batch(patterns):
+    if not NUMPY_AVAILABLE or len(patterns) < VECTOR_BATCH_MIN_SIZE:
+        return [identify_meter(pattern) for pattern in patterns]
+    
+    identify_chunk = _scan_meters_chunk if METER_ENGINE == 'scansion' else _identify_meters_chunk
+    meters = ["неопределенный размер"] * len(patterns)
+    valid = [i for i, pattern in enumerate(patterns) if pattern and len(pattern) >= 2]
+    
+    for start in range(0, len(valid), VECTOR_CHUNK_SIZE):
+        chunk = valid[start:start + VECTOR_CHUNK_SIZE]
+        for i, meter in zip(chunk, identify_chunk([patterns[i] for i in chunk])):
+            meters[i] = meter
+    
+    return meters
+
 def analyze_rhythm(stress_pattern):
     if not stress_pattern:
         return {
@@ -202,42 +390,185 @@ def analyze_rhythm(stress_pattern):
         "stress_intervals": stress_intervals
     }
 
+def analyze_rhythms(patterns):
+    with metrics.timer('rhythm', len(patterns)):
+        return [analyze_rhythm(pattern) for pattern in patterns]
+
 def load_ruaccent_model():
+    ruaccent = backends.get('ruaccent')
+    if ruaccent is None:
+        print("Библиотека не установлена. Для работы программы необходимо установить библиотеку:")
+        return None
+    
     try:
-        from ruaccent import RUAccent
-        
+        accentizer = ruaccent.RUAccent(
+            omograph_model_size='tiny',
+            use_dictionary=True,
+            tiny_mode=True
+        )
+       
+        return accentizer
+    except TypeError as e:
         try:
-            accentizer = RUAccent(
-                omograph_model_size='tiny',
-                use_dictionary=True,
-                tiny_mode=True
-            )
-           
+            accentizer = ruaccent.RUAccent()
+            accentizer.load(omograph_model_size='tiny', use_dictionary=True, tiny_mode=True)
             return accentizer
-        except TypeError as e:
-            try:
-                accentizer = RUAccent()
-                accentizer.load(omograph_model_size='tiny', use_dictionary=True, tiny_mode=True)
-                return accentizer
-            except Exception as e2:
-                print(f"Ошибка при загрузке модели вторым способом: {e2}")
-                return None
-        except Exception as e:
-            print(f"Ошибка при загрузке модели RUAccent: {e}")
-            print(f"Тип ошибки: {type(e).__name__}")
-            print("Проверьте версию библиотеки RUAccent и Python")
+        except Exception as e2:
+            print(f"Ошибка при загрузке модели вторым способом: {e2}")
             return None
+    except Exception as e:
+        print(f"Ошибка при загрузке модели RUAccent: {e}")
+        print(f"Тип ошибки: {type(e).__name__}")
+        print("Проверьте версию библиотеки RUAccent и Python")
+        return None
+
+def _current_rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
     except ImportError:
-        print("Библиотека не установлена. Для работы программы необходимо установить библиотеку:")
+        pass
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
         return None
 
+MODEL_RETRY_INTERVAL = float(os.environ.get('POETRY_MODEL_RETRY_INTERVAL', 60))
+
+class ModelRegistry:
+    def __init__(self, retry_interval=MODEL_RETRY_INTERVAL):
+        self.retry_interval = retry_interval
+        self._loaders = {}
+        self._models = {}
+        self._failures = {}
+        self._stats = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"Модель не зарегистрирована: {name}")
+            lock = self._locks[name]
+
+        with lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            failed_at = self._failures.get(name)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_interval:
+                return None
+
+            rss_before = _current_rss()
+            start = time.perf_counter()
+            model = self._loaders[name]()
+            load_time = time.perf_counter() - start
+            rss_after = _current_rss()
+
+            memory_delta = None
+            if rss_before is not None and rss_after is not None:
+                memory_delta = rss_after - rss_before
+
+            self._stats[name] = {
+                "loaded": model is not None,
+                "load_time": load_time,
+                "rss_before": rss_before,
+                "rss_after": rss_after,
+                "memory_delta": memory_delta,
+                "thread": threading.current_thread().name
+            }
+
+            if model is None:
+                self._failures[name] = time.monotonic()
+                metrics.inc('model_failures', model=name, stage='load')
+                logger.error(f"Ошибка загрузки модели '{name}' ({load_time:.2f} с), "
+                             f"повторная попытка не раньше чем через {self.retry_interval:.0f} с")
+                return None
+
+            self._failures.pop(name, None)
+            self._models[name] = model
+            memory_info = f"{memory_delta / 1024 / 1024:+.1f} МБ" if memory_delta is not None else "неизвестно"
+            print(f"Модель '{name}' загружена за {load_time:.2f} с (память: {memory_info})")
+
+        return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get_loaded(self, name):
+        return self._models.get(name)
+
+    def stats(self, name=None):
+        if name is not None:
+            return dict(self._stats.get(name, {"loaded": False}))
+        return {key: dict(value) for key, value in self._stats.items()}
+
+    def reset(self, name=None):
+        with self._lock:
+            names = [name] if name is not None else list(self._models) + list(self._failures)
+            for key in names:
+                self._models.pop(key, None)
+                self._failures.pop(key, None)
+                self._stats.pop(key, None)
+
+def load_ru_stress_engine():
+    return RuStressEngine(load_stress_dict(language='ru'))
+
+def load_silero_accentizer():
+    silero_stress = backends.get('silero_stress')
+    if silero_stress is None:
+        print(backends.missing_message('silero_stress'))
+        return None
+    return SileroAccentizer(silero_stress.load_accentor('ru'))
+
+def load_tiered_accentizer():
+    accentizer = get_ruaccent_model()
+    if accentizer is None:
+        return None
+    return TieredAccentizer(accentizer, load_stress_dict(language='ru'), load_homographs())
+
+model_registry = ModelRegistry()
+model_registry.register('ruaccent', load_ruaccent_model)
+model_registry.register('ru_stress', load_ru_stress_engine)
+model_registry.register('ru_tiered', load_tiered_accentizer)
+model_registry.register('silero', load_silero_accentizer)
+
+STRESS_MODELS = ('ruaccent', 'silero')
+
+def get_stress_model(name='ruaccent'):
+    return model_registry.get(name)
+
+def get_ruaccent_model():
+    return model_registry.get('ruaccent')
+
+def get_ru_stress_engine():
+    return model_registry.get('ru_stress')
+
+def get_tiered_accentizer():
+    if get_ruaccent_model() is None:
+        return None
+    return model_registry.get('ru_tiered')
+
+def get_ruaccent_model_stats():
+    return model_registry.stats('ruaccent')
+
+@lru_cache(maxsize=WORD_MEMO_SIZE)
 def count_syllables_en(word):
 
     word = clean_word(word)
     if not word:
         return 0
-        
-    vowels = 'aeiouy'
     
     exceptions = {
         'e': 1, 'a': 1, 'i': 1, 'o': 1, 'u': 1, 'y': 1,
@@ -248,18 +579,11 @@ def count_syllables_en(word):
     if word.lower() in exceptions:
         return exceptions[word.lower()]
     
-    count = 0
-    prev_is_vowel = False
-    
     word_for_count = word.lower()
     if word_for_count.endswith('e') and len(word_for_count) > 2:
         word_for_count = word_for_count[:-1]
     
-    for char in word_for_count:
-        is_vowel = char.lower() in vowels
-        if is_vowel and not prev_is_vowel:
-            count += 1
-        prev_is_vowel = is_vowel
+    count = count_vowel_groups_en(word_for_count)
     
     if count == 0:
         count = 1
@@ -284,47 +608,76 @@ def detect_stress_pattern_en(line, stress_dict=None):
     
     line = line.lower()
     line = clean_text(line)
-    words = line.split()
     
+    lookups = [0, 0]
+    pattern = _stress_pattern_en(line, stress_dict, _memo_generation('en', stress_dict), lookups)
+    _count_lookups_en(lookups)
+    return pattern
+
+EN_LOOKUP_KEYS = (
+    metrics.key('dictionary_lookups', language='en', engine='dictionary', result='hit'),
+    metrics.key('dictionary_lookups', language='en', engine='dictionary', result='miss')
+)
+
+def _count_lookups_en(lookups):
+    for key, value in zip(EN_LOOKUP_KEYS, lookups):
+        if value:
+            metrics.add(key, value)
+
+def _stress_pattern_en(line, stress_dict, generation, lookups):
     pattern = []
     syllable_count = 0
     
-    for word in words:
-        clean_w = clean_word(word)
-        if not clean_w:
+    for token in iter_tokens(line, VOWELS_EN):
+        if not token.word:
+            continue
+        if generation is not None:
+            profile = _en_word_profile(token.word, generation)
+        else:
+            profile = _en_word_profile_uncached(token.word, stress_dict)
+        if profile is None:
             continue
             
-        word_stress = find_word_stress_pattern(clean_w, language='en', stress_dict=stress_dict)
-        
+        word_stress, syllables, in_dict = profile
+        lookups[not in_dict] += 1
         for stress_pos in word_stress:
             pattern.append(syllable_count + stress_pos)
             
-        syllable_count += count_syllables_en(clean_w)
+        syllable_count += syllables
     
     return pattern
 
-def identify_meter_en(stress_pattern):
-    if not stress_pattern or len(stress_pattern) < 2:
-        return "undefined meter", {}
-    
-    stresses = stress_pattern
-    
-    if not stresses:
-        return "undefined meter", {}
-    
-    patterns = {
-        'iamb': lambda x: x % 2 == 1,
-        'trochee': lambda x: x % 2 == 0,
-        'dactyl': lambda x: x % 3 == 0,
-        'amphibrach': lambda x: x % 3 == 1,
-        'anapest': lambda x: x % 3 == 2
-    }
+def detect_stress_patterns_en(lines, stress_dict=None):
+    if stress_dict is None:
+        stress_dict = load_stress_dict(language='en')
     
-    scores = {}
-    for name, check in patterns.items():
-        matches = sum(1 for pos in stresses if check(pos))
-        scores[name] = matches / len(stresses) * 100
+    with metrics.timer('normalise', len(lines)):
+        normalized = [clean_text(line.lower()) if line.strip() else '' for line in lines]
     
+    lookups = [0, 0]
+    generation = _memo_generation('en', stress_dict)
+    with metrics.timer('accent', len(lines)):
+        patterns = [_stress_pattern_en(line, stress_dict, generation, lookups) if line else [] for line in normalized]
+    _count_lookups_en(lookups)
+    return patterns
+
+EN_METER_CHECKS = {
+    'iamb': lambda x: x % 2 == 1,
+    'trochee': lambda x: x % 2 == 0,
+    'dactyl': lambda x: x % 3 == 0,
+    'amphibrach': lambda x: x % 3 == 1,
+    'anapest': lambda x: x % 3 == 2
+}
+
+EN_METER_TRANSLATION = {
+    'iamb': 'ямб',
+    'trochee': 'хорей',
+    'dactyl': 'дактиль',
+    'amphibrach': 'амфибрахий',
+    'anapest': 'анапест'
+}
+
+def best_meter_en(scores):
     two_syllable_score = max(scores['iamb'], scores['trochee'])
     three_syllable_score = max(scores['dactyl'], scores['amphibrach'], scores['anapest'])
     
@@ -333,16 +686,32 @@ def identify_meter_en(stress_pattern):
     else:
         best = max(['dactyl', 'amphibrach', 'anapest'], key=lambda x: scores[x])
     
-    meter_translation = {
-        'iamb': 'ямб',
-        'trochee': 'хорей',
-        'dactyl': 'дактиль',
-        'amphibrach': 'амфибрахий',
-        'anapest': 'анапест'
-    }
+    return EN_METER_TRANSLATION[best]
+
+def meter_scores_en(stress_pattern):
+    stresses = stress_pattern
     
+    scores = {}
+    for name, check in EN_METER_CHECKS.items():
+        matches = sum(1 for pos in stresses if check(pos))
+        scores[name] = matches / len(stresses) * 100
     
-    return meter_translation[best], scores
+    return scores
+
+def identify_meter_en(stress_pattern):
+    if not stress_pattern or len(stress_pattern) < 2:
+        return "undefined meter", {}
+    
+    if METER_ENGINE == 'scansion':
+        stress_pattern = normalize_pattern(stress_pattern)
+        return scan_meter(stress_pattern)[0], scan_scores(scan_costs(stress_pattern))
+    
+    scores = meter_scores_en(stress_pattern)
+    return best_meter_en(scores), scores
+
+def identify_meters_en(patterns):
+    with metrics.timer('meter', len(patterns)):
+        return [identify_meter_en(pattern) for pattern in patterns]
 
 def analyze_english_poem(text):
     stress_dict = load_stress_dict(language='en')
@@ -352,33 +721,38 @@ def analyze_english_poem(text):
     results = []
     all_stress_patterns = []
     
-    for i, line in enumerate(lines):
-        clean_line = clean_text(line)
-        if not clean_line.strip():
-            continue
-            
-        stress_pattern = detect_stress_pattern_en(clean_line, stress_dict)
+    pairs = [(line, clean_text(line)) for line in lines]
+    pairs = [(line, clean_line) for line, clean_line in pairs if clean_line.strip()]
+    
+    stress_patterns = detect_stress_patterns_en([clean_line for _, clean_line in pairs], stress_dict)
+    meters = identify_meters_en(stress_patterns)
+    rhythms = analyze_rhythms(stress_patterns)
+    
+    for (line, _), stress_pattern, (meter, scores), rhythm_info in zip(pairs, stress_patterns, meters, rhythms):
         all_stress_patterns.extend(stress_pattern)
-        
-        meter, scores = identify_meter_en(stress_pattern)
-        
-        rhythm_info = analyze_rhythm(stress_pattern)
-        
-        results.append({
-            'line': line,
-            'stress_pattern': stress_pattern,
-            'meter': meter,
-            'rhythm_info': rhythm_info,
-            'scores': scores
-        })
+        results.append(LineAnalysis(line, stress_pattern, meter, rhythm_info, scores))
     
-    overall_meter, overall_scores = identify_meter_en(all_stress_patterns)
+    if METER_ENGINE == 'scansion' and len(all_stress_patterns) >= 2:
+        line_patterns = [normalize_pattern(line.stress_pattern) for line in results]
+        overall_meter = scan_lines(line_patterns)[0]
+        overall_scores = scan_scores(scan_lines_costs(line_patterns))
+    else:
+        overall_meter, overall_scores = identify_meter_en(all_stress_patterns)
     
-    return {
-        'lines_analysis': results,
-        'overall_meter': overall_meter,
-        'overall_scores': overall_scores
-    }
+    return PoemAnalysis(results, overall_meter, scores=overall_scores)
+
+OOV_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=OOV_CACHE_SIZE)
+def _guess_word_stress_en(word):
+    syllables = count_syllables_en(word)
+    
+    if syllables == 1:
+        return (0,)
+    elif syllables == 2:
+        return (0,)
+    else:
+        return (0 if len(word) < 7 else 1,)
 
 def find_word_stress_pattern(word, language='ru', stress_dict=None):
     word = clean_word(word)
@@ -388,36 +762,53 @@ def find_word_stress_pattern(word, language='ru', stress_dict=None):
     if stress_dict is None:
         stress_dict = load_stress_dict(language=language)
     
-    if word.lower() in stress_dict:
-        return stress_dict[word.lower()]
+    pattern = stress_dict.get(word.lower())
+    if pattern is not None:
+        return pattern
     
     if language == 'en':
-        syllables = count_syllables_en(word)
-        
-        if syllables == 1:
-            return [0]
-        elif syllables == 2:
-            return [0]
-        else:
-            return [0 if len(word) < 7 else 1]
+        return list(_guess_word_stress_en(word))
     
     return [] 
 
-def load_stress_dict(language='ru'):
+DICTIONARIES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'dictionaries')
 
+HOMOGRAPHS_PATH = os.path.join(DICTIONARIES_DIR, 'stress_homographs_ru.json')
+
+_stress_dict_cache = {}
+_stress_dict_lock = threading.Lock()
+_stress_dict_generations = count(1)
+
+def _stress_dict_path(language):
+    if language == 'ru':
+        compact_path = os.path.join(DICTIONARIES_DIR, 'stress_dict_ru.bin')
+        if os.path.exists(compact_path):
+            return compact_path
+        return os.path.join(DICTIONARIES_DIR, 'stress_dict_ru.json')
+    if language == 'en':
+        compact_path = os.path.join(DICTIONARIES_DIR, 'stress_dict_en.bin')
+        if os.path.exists(compact_path):
+            return compact_path
+        return os.path.join(DICTIONARIES_DIR, 'stress_dict_en.json')
+    return None
+
+def _file_version(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def _read_stress_dict(language, dict_path):
     try:
-        dict_path = ""
-        if language == 'ru':
-            dict_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'dictionaries', 'stress_dict_ru.json')
-        elif language == 'en':
-            dict_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'dictionaries', 'stress_dict_en.json')
-        else:
-            print(f"Неподдерживаемый язык: {language}")
-            return {}
-            
         if not os.path.exists(dict_path):
             print(f"Словарь ударений для языка {language} не найден по пути: {dict_path}")
             return {}
+        
+        if dict_path.endswith('.bin'):
+            stress_dict = CompactStressDict(dict_path)
+            print(f"Словарь ударений для языка {language} открыт в компактном формате ({len(stress_dict)} слов)")
+            return stress_dict
             
         with open(dict_path, 'r', encoding='utf-8') as f:
             stress_dict = json.load(f)
@@ -428,4 +819,174 @@ def load_stress_dict(language='ru'):
         print(f"Ошибка при загрузке словаря ударений: {e}")
         return {}
 
- 
\ No newline at end of file
+def load_stress_dict(language='ru', use_cache=True):
+    dict_path = _stress_dict_path(language)
+    if dict_path is None:
+        print(f"Неподдерживаемый язык: {language}")
+        return {}
+    
+    if not use_cache:
+        return _read_stress_dict(language, dict_path)
+    
+    version = _file_version(dict_path)
+    cached = _stress_dict_cache.get(language)
+    if cached is not None and cached[0] == dict_path and cached[1] == version:
+        return cached[2]
+    
+    with _stress_dict_lock:
+        cached = _stress_dict_cache.get(language)
+        if cached is not None and cached[0] == dict_path and cached[1] == version:
+            return cached[2]
+        
+        stress_dict = _read_stress_dict(language, dict_path)
+        _stress_dict_cache[language] = (dict_path, version, stress_dict, next(_stress_dict_generations))
+        if cached is not None and isinstance(cached[2], CompactStressDict):
+            cached[2].close()
+        return stress_dict
+
+def _memo_generation(language, stress_dict):
+    cached = _stress_dict_cache.get(language)
+    if cached is not None and cached[2] is stress_dict:
+        return cached[3]
+    return None
+
+def _en_word_profile_uncached(word, stress_dict):
+    clean_w = clean_word(word)
+    if not clean_w:
+        return None
+    word_stress = stress_dict.get(clean_w.lower())
+    if word_stress is None:
+        return _guess_word_stress_en(clean_w), count_syllables_en(clean_w), False
+    return tuple(word_stress), count_syllables_en(clean_w), True
+
+@lru_cache(maxsize=WORD_MEMO_SIZE)
+def _en_word_profile(word, generation):
+    cached = _stress_dict_cache.get('en')
+    if cached is None or cached[3] != generation:
+        return _en_word_profile_uncached(word, load_stress_dict(language='en'))
+    return _en_word_profile_uncached(word, cached[2])
+
+def load_homographs(path=HOMOGRAPHS_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            homographs = set(json.load(f))
+        print(f"Список омографов загружен ({len(homographs)} слов)")
+        return homographs
+    except FileNotFoundError:
+        print(f"Список омографов не найден по пути: {path}")
+        return set()
+    except Exception as e:
+        print(f"Ошибка при загрузке списка омографов: {e}")
+        return set()
+
+ANALYZER_VERSION = '1'
+
+_dictionary_hashes = {}
+
+def _package_version(name):
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return 'unknown'
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return 'none'
+
+def _file_digest(path):
+    file_version = _file_version(path)
+    cached = _dictionary_hashes.get(path)
+    if cached is None or cached[0] != file_version:
+        digest = 'missing'
+        if file_version is not None:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        cached = (file_version, digest)
+        _dictionary_hashes[path] = cached
+    return cached[1]
+
+def dictionary_version(language='ru'):
+    dict_path = _stress_dict_path(language)
+    if dict_path is None:
+        return 'none'
+    
+    digest = _file_digest(dict_path)
+    if language == 'ru':
+        return f"ruaccent-{_package_version('ruaccent')}+{digest}"
+    return digest
+
+def analysis_version(language='ru', tiered=False):
+    version = f"{ANALYZER_VERSION}:{dictionary_version(language)}"
+    if tiered and language == 'ru':
+        version += f":tiered-{_file_digest(HOMOGRAPHS_PATH)}"
+    if METER_ENGINE != 'heuristic':
+        version += f":{METER_ENGINE}"
+    return version
+
+def clear_stress_dict_cache():
+    with _stress_dict_lock:
+        _stress_dict_cache.clear()
+    _guess_word_stress_en.cache_clear()
+    _en_word_profile.cache_clear()
+    model_registry.reset('ru_stress')
+    model_registry.reset('ru_tiered')
+
+WORD_MEMOS = {
+    'clean_word': clean_word,
+    'count_syllables_ru': count_syllables_ru,
+    'count_syllables_en': count_syllables_en,
+    'ru_stress_offset': _stressed_vowel_offset,
+    'en_word_profile': _en_word_profile,
+    'en_oov_stress': _guess_word_stress_en
+}
+
+def word_memo_stats():
+    stats = {}
+    for name, memo in WORD_MEMOS.items():
+        info = memo.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_ratio": info.hits / lookups if lookups else 0.0
+        }
+    return stats
+
+def clear_word_memo():
+    for memo in WORD_MEMOS.values():
+        memo.cache_clear()
+
+def _collect_metrics():
+    families = []
+    memo_stats = word_memo_stats()
+    families.append(('word_memo_hits', 'counter', "Попадания в кэши слов",
+                     [({"memo": name}, stats["hits"]) for name, stats in memo_stats.items()]))
+    families.append(('word_memo_misses', 'counter', "Промахи кэшей слов",
+                     [({"memo": name}, stats["misses"]) for name, stats in memo_stats.items()]))
+    
+    load_stats = model_registry.stats()
+    families.append(('model_loaded', 'gauge', "Модель загружена (1) или загрузка не удалась (0)",
+                     [({"model": name}, stats["loaded"]) for name, stats in load_stats.items()]))
+    families.append(('model_load_seconds', 'gauge', "Время загрузки модели, с",
+                     [({"model": name}, stats["load_time"]) for name, stats in load_stats.items()]))
+    
+    lookups = []
+    engine = model_registry.get_loaded('ru_stress')
+    if engine is not None:
+        lookups.append(({"language": "ru", "engine": "ru_stress", "result": "hit"}, engine.stats['dictionary']))
+        lookups.append(({"language": "ru", "engine": "ru_stress", "result": "miss"},
+                        engine.stats['rule'] + engine.stats['default']))
+    tiered = model_registry.get_loaded('ru_tiered')
+    if tiered is not None:
+        lookups.append(({"language": "ru", "engine": "tiered", "result": "hit"}, tiered.stats['dictionary']))
+        lookups.append(({"language": "ru", "engine": "tiered", "result": "miss"},
+                        tiered.stats['unknown'] + tiered.stats['homograph']))
+        families.append(('tiered_model_calls', 'counter', "Вызовы модели из многоуровневого определения ударений",
+                         [({}, tiered.stats['model_calls'])]))
+    if lookups:
+        families.append(('dictionary_lookups', 'counter', None, lookups))
+    return families
+
+metrics.register_collector(_collect_metrics)
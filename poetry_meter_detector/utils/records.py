@@ -0,0 +1,178 @@
+import json
+import sys
+from array import array
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class LineAnalysis:
+    __slots__ = ('line', 'stress_pattern', 'meter', 'rhythm_type', 'stress_density', 'stress_intervals',
+                 'scores', 'line_number')
+
+    def __init__(self, line, stress_pattern, meter, rhythm_info=None, scores=None, line_number=None):
+        self.line = line
+        self.stress_pattern = array('H', stress_pattern)
+        self.meter = _intern(meter)
+        self.scores = scores
+        self.line_number = line_number
+        if rhythm_info is None:
+            self.rhythm_type = None
+            self.stress_density = None
+            self.stress_intervals = None
+        else:
+            self.rhythm_type = _intern(rhythm_info['rhythm_type'])
+            self.stress_density = rhythm_info['stress_density']
+            self.stress_intervals = array('h', rhythm_info['stress_intervals'])
+
+    @property
+    def rhythm_info(self):
+        if self.rhythm_type is None:
+            return None
+        return {
+            "rhythm_type": self.rhythm_type,
+            "stress_density": self.stress_density,
+            "stress_intervals": list(self.stress_intervals)
+        }
+
+    def _field(self, key):
+        if key in ('line', 'text'):
+            return self.line
+        if key == 'stress_pattern':
+            return list(self.stress_pattern)
+        if key == 'meter':
+            return self.meter
+        if key == 'rhythm_info':
+            return self.rhythm_info
+        if key in ('rhythm_type', 'stress_density'):
+            return getattr(self, key)
+        if key == 'stress_intervals':
+            return None if self.stress_intervals is None else list(self.stress_intervals)
+        if key in ('scores', 'line_number'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        value = self._field(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        result = {
+            'line': self.line,
+            'stress_pattern': list(self.stress_pattern),
+            'meter': self.meter
+        }
+        if self.rhythm_type is not None:
+            result['rhythm_info'] = self.rhythm_info
+        if self.scores is not None:
+            result['scores'] = self.scores
+        return result
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['line'], data['stress_pattern'], data['meter'],
+                   data.get('rhythm_info'), data.get('scores'), data.get('line_number'))
+
+    def __eq__(self, other):
+        if isinstance(other, LineAnalysis):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"LineAnalysis({self.line!r}, {list(self.stress_pattern)}, {self.meter!r})"
+
+class PoemAnalysis:
+    __slots__ = ('lines', 'meter', 'rhythm', 'scores')
+
+    def __init__(self, lines, meter, rhythm=(), scores=None):
+        self.lines = lines
+        self.meter = _intern(meter)
+        self.rhythm = array('H', rhythm)
+        self.scores = scores
+
+    def _field(self, key):
+        if key in ('line_analyses', 'lines_analysis'):
+            return self.lines
+        if key in ('meter', 'overall_meter'):
+            return self.meter
+        if key == 'rhythm':
+            return list(self.rhythm)
+        if key in ('scores', 'overall_scores'):
+            return self.scores
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        value = self._field(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        lines = [line.to_dict() for line in self.lines]
+        if self.scores is not None:
+            return {
+                'lines_analysis': lines,
+                'overall_meter': self.meter,
+                'overall_scores': self.scores
+            }
+        return {
+            'meter': self.meter,
+            'rhythm': list(self.rhythm),
+            'line_analyses': lines
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        lines = data.get('line_analyses', data.get('lines_analysis', []))
+        return cls(
+            [line if isinstance(line, LineAnalysis) else LineAnalysis.from_dict(line) for line in lines],
+            data.get('meter', data.get('overall_meter')),
+            data.get('rhythm', ()),
+            data.get('overall_scores')
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, PoemAnalysis):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PoemAnalysis({len(self.lines)} строк, {self.meter!r})"
+
+def json_default(value):
+    if isinstance(value, (LineAnalysis, PoemAnalysis)):
+        return value.to_dict()
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value, **kwargs):
+    kwargs.setdefault('ensure_ascii', False)
+    return json.dumps(value, default=json_default, **kwargs)
+
+def dump(value, fp, **kwargs):
+    kwargs.setdefault('ensure_ascii', False)
+    json.dump(value, fp, default=json_default, **kwargs)
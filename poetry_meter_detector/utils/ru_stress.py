@@ -0,0 +1,288 @@
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+VOWELS_RU = 'аеёиоуыэюя'
+WORD_CACHE_SIZE = 65536
+
+WORD_RE = re.compile(r"[а-яё]+(?:-[а-яё]+)*", re.IGNORECASE)
+
+UNSTRESSED_MONOSYLLABLES = frozenset((
+    'в', 'во', 'на', 'с', 'со', 'к', 'ко', 'о', 'об', 'обо', 'у', 'от', 'ото', 'до', 'из', 'изо', 'за', 'по',
+    'под', 'подо', 'над', 'надо', 'при', 'про', 'без', 'для', 'сквозь', 'меж',
+    'и', 'а', 'но', 'да', 'же', 'ж', 'ли', 'ль', 'бы', 'б', 'не', 'ни', 'уж', 'ведь', 'вот', 'лишь'
+))
+
+SUFFIX_RULES = {
+    'ирование': 5,
+    'ировать': 3,
+    'ического': 4,
+    'ической': 3,
+    'ический': 3,
+    'ическое': 4,
+    'ические': 4,
+    'ическая': 4,
+    'ающими': 4,
+    'яющими': 4,
+    'ающий': 3,
+    'яющий': 3,
+    'ающая': 4,
+    'яющая': 4,
+    'ающие': 4,
+    'яющие': 4,
+    'ение': 3,
+    'ения': 3,
+    'ением': 3,
+    'ание': 3,
+    'ания': 3,
+    'анием': 3,
+    'ция': 3,
+    'ции': 3,
+    'цию': 3,
+    'тели': 3,
+    'теля': 3,
+    'телей': 3,
+    'ости': 3,
+    'остью': 3,
+    'ать': 1,
+    'ять': 1,
+    'еть': 1,
+    'ить': 1,
+    'ал': 1
+}
+
+class SuffixTrie:
+    def __init__(self, rules=None):
+        self._root = {}
+        self.size = 0
+        for suffix, stress in (rules or {}).items():
+            self.insert(suffix, stress)
+
+    def insert(self, suffix, stress):
+        node = self._root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        if None not in node:
+            self.size += 1
+        node[None] = stress
+
+    def longest_match(self, word):
+        node = self._root
+        match = None
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                match = node[None]
+        return match
+
+class RuStressEngine:
+    def __init__(self, stress_dict=None, rules=None, cache_size=WORD_CACHE_SIZE):
+        self.stress_dict = stress_dict if stress_dict is not None else {}
+        self.rules = SuffixTrie(SUFFIX_RULES if rules is None else rules)
+        self.stress_word = lru_cache(maxsize=cache_size)(self._stress_word)
+        self.stats = Counter()
+
+    def _stress_word(self, word):
+        vowel_positions = [i for i, char in enumerate(word) if char in VOWELS_RU]
+        if not vowel_positions:
+            return None, 'monosyllable'
+
+        if 'ё' in word:
+            return word.index('ё'), 'yo'
+
+        pattern = self.stress_dict.get(word)
+        if pattern and len(pattern) == len(vowel_positions):
+            if 1 in pattern:
+                return vowel_positions[list(pattern).index(1)], 'dictionary'
+            if len(vowel_positions) == 1:
+                return None, 'dictionary'
+
+        if len(vowel_positions) == 1:
+            if word in UNSTRESSED_MONOSYLLABLES:
+                return None, 'monosyllable'
+            return vowel_positions[0], 'monosyllable'
+
+        from_end = self.rules.longest_match(word)
+        if from_end is not None and from_end <= len(vowel_positions):
+            return vowel_positions[-from_end], 'rule'
+
+        return vowel_positions[-2], 'default'
+
+    def _mark_token(self, match):
+        token = match.group(0)
+        offset = 0
+        for part in token.split('-'):
+            index, tier = self.stress_word(part.lower())
+            self.stats[tier] += 1
+            if index is not None:
+                position = offset + index
+                return token[:position] + '+' + token[position:]
+            offset += len(part) + 1
+        return token
+
+    def process_all(self, text):
+        return WORD_RE.sub(self._mark_token, text)
+
+    def cache_info(self):
+        return self.stress_word.cache_info()
+
+WORD_PUNCTUATION = '.,!?;:()[]«»"\'…—–-'
+WORD_TIERS = ('monosyllable', 'yo', 'dictionary', 'unknown', 'homograph')
+LINE_TIERS = ('dictionary_lines', 'partial_lines', 'model_lines')
+MODEL_CONTEXT_WORDS = 1
+
+def _vowel_positions(token):
+    return [i for i, char in enumerate(token.lower()) if char in VOWELS_RU]
+
+def _stressed_vowel(stressed_token):
+    plus_pos = stressed_token.find('+')
+    if plus_pos < 0:
+        return None
+    return sum(1 for char in stressed_token[:plus_pos].lower() if char in VOWELS_RU)
+
+def _mark_vowel(token, vowel_index):
+    positions = _vowel_positions(token)
+    if vowel_index is None or vowel_index >= len(positions):
+        return token
+    position = positions[vowel_index]
+    return token[:position] + '+' + token[position:]
+
+class SileroAccentizer:
+    def __init__(self, accentor):
+        self.accentor = accentor
+
+    def process_all(self, text):
+        return self.accentor(text)
+
+class TieredAccentizer:
+    def __init__(self, accentizer, stress_dict=None, homographs=None, cache_size=WORD_CACHE_SIZE,
+                 context_words=MODEL_CONTEXT_WORDS):
+        self.accentizer = accentizer
+        self.stress_dict = stress_dict if stress_dict is not None else {}
+        self.homographs = set(homographs or ())
+        self.context_words = context_words
+        self.word_stress = lru_cache(maxsize=cache_size)(self._word_stress)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = dict.fromkeys(WORD_TIERS + LINE_TIERS + ('lines', 'words', 'model_calls', 'model_words'), 0)
+        self.total_time = 0.0
+        self.model_time = 0.0
+
+    def _word_stress(self, word):
+        vowel_count = sum(1 for char in word if char in VOWELS_RU)
+        if not vowel_count:
+            return None, 'monosyllable'
+        if 'ё' in word:
+            return _vowel_positions(word).index(word.index('ё')), 'yo'
+        if not word.isalpha():
+            return None, 'unknown'
+        if word in self.homographs:
+            return None, 'homograph'
+
+        pattern = self.stress_dict.get(word)
+        if pattern and len(pattern) == vowel_count:
+            tier = 'monosyllable' if vowel_count == 1 else 'dictionary'
+            if 1 in pattern:
+                return list(pattern).index(1), tier
+            if vowel_count == 1:
+                return None, tier
+        if vowel_count == 1 and word in UNSTRESSED_MONOSYLLABLES:
+            return None, 'monosyllable'
+        return None, 'unknown'
+
+    def _spans(self, positions, length):
+        spans = []
+        for position in positions:
+            start = max(0, position - self.context_words)
+            end = min(length, position + self.context_words + 1)
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+                spans[-1][2].append(position)
+            else:
+                spans.append([start, end, [position]])
+        return spans
+
+    def _process(self, text):
+        start = time.perf_counter()
+        try:
+            stressed_text = self.accentizer.process_all(text)
+        finally:
+            self.model_time += time.perf_counter() - start
+            self.stats['model_calls'] += 1
+        if isinstance(stressed_text, list) and stressed_text:
+            stressed_text = stressed_text[0]
+        return stressed_text.split()
+
+    def _process_groups(self, groups):
+        stressed = self._process('\n'.join(' '.join(group) for group in groups))
+        if len(stressed) == sum(len(group) for group in groups):
+            results = []
+            offset = 0
+            for group in groups:
+                results.append(stressed[offset:offset + len(group)])
+                offset += len(group)
+            return results
+        return [self._process(' '.join(group)) for group in groups]
+
+    def process_all(self, text):
+        start = time.perf_counter()
+        lines = [line.split() for line in text.split('\n')]
+        marks = []
+        pending = []
+
+        for index, tokens in enumerate(lines):
+            line_marks = []
+            unresolved = []
+            homograph = False
+            for position, token in enumerate(tokens):
+                vowel_index, tier = self.word_stress(token.strip(WORD_PUNCTUATION).lower())
+                self.stats[tier] += 1
+                if tier == 'homograph':
+                    homograph = True
+                    unresolved.append(position)
+                elif tier == 'unknown':
+                    unresolved.append(position)
+                line_marks.append(vowel_index)
+            marks.append(line_marks)
+
+            self.stats['lines'] += 1
+            self.stats['words'] += len(tokens)
+            if homograph:
+                self.stats['model_lines'] += 1
+            elif unresolved:
+                self.stats['partial_lines'] += 1
+            else:
+                self.stats['dictionary_lines'] += 1
+            for start, end, positions in self._spans(unresolved, len(tokens)):
+                pending.append((index, start, positions, tokens[start:end]))
+
+        if pending:
+            groups = [group for _, _, _, group in pending]
+            self.stats['model_words'] += sum(len(group) for group in groups)
+            for (index, start, positions, group), stressed in zip(pending, self._process_groups(groups)):
+                if len(stressed) != len(group):
+                    continue
+                for position in positions:
+                    marks[index][position] = _stressed_vowel(stressed[position - start])
+
+        result = '\n'.join(
+            ' '.join(_mark_vowel(token, vowel_index) for token, vowel_index in zip(tokens, line_marks))
+            for tokens, line_marks in zip(lines, marks)
+        )
+        self.total_time += time.perf_counter() - start
+        return result
+
+    def report(self):
+        stats = dict(self.stats)
+        words = stats['words'] or 1
+        lines = stats['lines'] or 1
+        stats['word_rates'] = {tier: stats[tier] / words for tier in WORD_TIERS}
+        stats['line_rates'] = {tier: stats[tier] / lines for tier in LINE_TIERS}
+        stats['total_time'] = self.total_time
+        stats['model_time'] = self.model_time
+        stats['ms_per_line'] = self.total_time / lines * 1000
+        return stats
@@ -0,0 +1,152 @@
+import math
+from functools import lru_cache
+
+METER_PATTERNS = {
+    'ямб': [0, 1],
+    'хорей': [1, 0],
+    'дактиль': [1, 0, 0],
+    'амфибрахий': [0, 1, 0],
+    'анапест': [0, 0, 1]
+}
+
+PYRRHIC_COST = 0.5
+SPONDEE_COST = 1.0
+ANACRUSIS_COST = 1.5
+SYLLABLE_SHIFT_COST = 2.0
+PRECOMPUTED_GAPS = 12
+SCAN_CACHE_SIZE = 65536
+
+INF = math.inf
+
+def _min_plus(vector, columns):
+    return tuple(min(value + cost for value, cost in zip(vector, column)) for column in columns)
+
+def _min_plus_2(vector, columns):
+    a, b = vector
+    (a0, b0), (a1, b1) = columns
+    x, y = a + a0, b + b0
+    z, w = a + a1, b + b1
+    return (x if x < y else y, z if z < w else w)
+
+def _min3(x, y, z):
+    if y < x:
+        x = y
+    return z if z < x else x
+
+def _min_plus_3(vector, columns):
+    a, b, c = vector
+    (a0, b0, c0), (a1, b1, c1), (a2, b2, c2) = columns
+    return (_min3(a + a0, b + b0, c + c0), _min3(a + a1, b + b1, c + c1), _min3(a + a2, b + b2, c + c2))
+
+STEP_FUNCTIONS = {2: _min_plus_2, 3: _min_plus_3}
+
+def _matrix_product(left, right_columns):
+    return [_min_plus(row, right_columns) for row in left]
+
+def _columns(matrix):
+    return [tuple(column) for column in zip(*matrix)]
+
+class Foot:
+    def __init__(self, name, pattern):
+        self.name = name
+        self.period = period = len(pattern)
+        self._step = STEP_FUNCTIONS.get(period, _min_plus)
+        emission = [(PYRRHIC_COST, 0.0) if stressed else (0.0, SPONDEE_COST) for stressed in pattern]
+
+        step = [[INF] * period for _ in range(period)]
+        for phase in range(period):
+            step[phase][(phase + 1) % period] = 0.0
+            for shift in (0, 2):
+                target = (phase + shift) % period
+                step[phase][target] = min(step[phase][target], SYLLABLE_SHIFT_COST)
+
+        self.start = tuple((0.0 if phase == 0 else ANACRUSIS_COST) + emission[phase][0] for phase in range(period))
+        self.start_stressed = tuple((0.0 if phase == 0 else ANACRUSIS_COST) + emission[phase][1]
+                                    for phase in range(period))
+        self.unstressed = [[step[i][j] + emission[j][0] for j in range(period)] for i in range(period)]
+        stressed = [[step[i][j] + emission[j][1] for j in range(period)] for i in range(period)]
+
+        self._gaps = [None, _columns(stressed)]
+        self._first = {0: self.start_stressed}
+        for gap in range(2, PRECOMPUTED_GAPS + 1):
+            self.gap(gap)
+
+    def gap(self, gap):
+        while len(self._gaps) <= gap:
+            self._gaps.append(_columns(_matrix_product(self.unstressed, self._gaps[-1])))
+        return self._gaps[gap]
+
+    def first(self, position):
+        vector = self._first.get(position)
+        if vector is None:
+            vector = self._first[position] = _min_plus(self.start, self.gap(position))
+        return vector
+
+    def align(self, stress_pattern):
+        step = self._step
+        gaps = self._gaps
+        total = 0.0
+        vector = None
+        previous = 0
+        for position in stress_pattern:
+            gap = position - previous
+            if vector is None or gap <= 0:
+                if vector is not None:
+                    total += min(vector)
+                vector = self.first(position)
+            elif gap < len(gaps):
+                vector = step(vector, gaps[gap])
+            else:
+                vector = step(vector, self.gap(gap))
+            previous = position
+        if vector is None:
+            return total
+        return total + min(vector)
+
+FEET = {name: Foot(name, pattern) for name, pattern in METER_PATTERNS.items()}
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def _scan(stress_pattern):
+    return {name: foot.align(stress_pattern) for name, foot in FEET.items()}
+
+def scan_costs(stress_pattern):
+    return dict(_scan(tuple(stress_pattern)))
+
+def normalize_pattern(stress_pattern):
+    return tuple(sorted(set(stress_pattern)))
+
+def _best_meter(costs):
+    best = min(costs, key=costs.get)
+    best_cost = costs[best]
+    weight = sum(math.exp(best_cost - cost) for cost in costs.values())
+    return best, 1 / weight, best_cost
+
+def scan_meter(stress_pattern):
+    if not stress_pattern or len(stress_pattern) < 2:
+        return "неопределенный размер", 0.0, 0.0
+    return _best_meter(_scan(tuple(stress_pattern)))
+
+def scan_scores(costs):
+    return {'confidence': _best_meter(costs)[1], 'costs': dict(costs)}
+
+def scan_lines_costs(stress_patterns):
+    totals = dict.fromkeys(FEET, 0.0)
+    for stress_pattern in stress_patterns:
+        for name, cost in _scan(tuple(stress_pattern)).items():
+            totals[name] += cost
+    return totals
+
+def scan_lines(stress_patterns):
+    stress_patterns = list(stress_patterns)
+    if sum(len(stress_pattern) for stress_pattern in stress_patterns) < 2:
+        return "неопределенный размер", 0.0, 0.0
+    return _best_meter(scan_lines_costs(stress_patterns))
+
+def scan_meters_batch(stress_patterns):
+    return [scan_meter(stress_pattern) for stress_pattern in stress_patterns]
+
+def scan_cache_info():
+    return _scan.cache_info()
+
+def clear_scan_cache():
+    _scan.cache_clear()
@@ -0,0 +1,141 @@
+from collections import Counter
+from itertools import islice
+
+from .preprocess import (
+    EN_METER_CHECKS, analyze_rhythms, best_meter_en, clean_text, detect_stress_patterns_batch,
+    detect_stress_patterns_en, get_meter_engine, identify_meters_batch, identify_meters_en, load_stress_dict
+)
+from .scansion import normalize_pattern, scan_costs, scan_scores
+from .tokenizer import SENTENCE_END_RE
+
+MAX_SENTENCE_CHARS = 4096
+
+class MeterStatistics:
+    def __init__(self, language='ru'):
+        self.language = language
+        self.lines = 0
+        self.line_meters = Counter()
+        self.stress_total = 0
+        self.stress_matches = Counter()
+        self.meter_costs = Counter()
+
+    def add(self, stress_pattern, meter):
+        self._update(stress_pattern, meter, 1)
+
+    def remove(self, stress_pattern, meter):
+        self._update(stress_pattern, meter, -1)
+
+    def _update(self, stress_pattern, meter, sign):
+        self.lines += sign
+        self.line_meters[meter] += sign
+        if self.line_meters[meter] <= 0:
+            del self.line_meters[meter]
+        if self.language != 'en':
+            return
+        self.stress_total += sign * len(stress_pattern)
+        for name, check in EN_METER_CHECKS.items():
+            self.stress_matches[name] += sign * sum(1 for pos in stress_pattern if check(pos))
+        if get_meter_engine() == 'scansion':
+            for name, cost in scan_costs(normalize_pattern(stress_pattern)).items():
+                self.meter_costs[name] += sign * cost
+
+    def dominant_meter(self):
+        meters = Counter({meter: count for meter, count in self.line_meters.items()
+                          if meter not in ("неопределенный размер", "undefined meter")})
+        if not meters:
+            return None
+        return meters.most_common(1)[0][0]
+
+    def overall_scores(self):
+        if self.stress_total < 2:
+            return {}
+        if self.meter_costs:
+            return scan_scores(self.meter_costs)
+        return {name: self.stress_matches[name] / self.stress_total * 100 for name in EN_METER_CHECKS}
+
+    def overall_meter(self):
+        if self.language != 'en':
+            return self.dominant_meter() or "неопределенный размер"
+        if self.stress_total < 2:
+            return "undefined meter"
+        if self.meter_costs:
+            return min(self.meter_costs, key=self.meter_costs.get)
+        return best_meter_en(self.overall_scores())
+
+    def summary(self):
+        return {
+            "lines": self.lines,
+            "overall_meter": self.overall_meter(),
+            "overall_scores": self.overall_scores() if self.language == 'en' else {},
+            "meter_counts": dict(self.line_meters)
+        }
+
+def iter_text_lines(stream):
+    for line in stream:
+        line = line.rstrip('\r\n')
+        if line.strip():
+            yield line
+
+def iter_sentences(stream, max_chars=MAX_SENTENCE_CHARS):
+    buffer = ''
+    for line in stream:
+        buffer += line
+        parts = SENTENCE_END_RE.split(buffer)
+        buffer = parts.pop()
+        for part in parts:
+            if part.strip():
+                yield part.strip()
+        if len(buffer) > max_chars:
+            if buffer.strip():
+                yield buffer.strip()
+            buffer = ''
+    if buffer.strip():
+        yield buffer.strip()
+
+def _analyze_ru(lines, accentizer, batch_size):
+    while True:
+        chunk = list(islice(lines, batch_size))
+        if not chunk:
+            return
+        clean_lines = [clean_text(line) for line in chunk]
+        patterns = detect_stress_patterns_batch(clean_lines, accentizer=accentizer, batch_size=batch_size)
+        meters = identify_meters_batch(patterns)
+        for line, stress_pattern, meter, rhythm_info in zip(chunk, patterns, meters, analyze_rhythms(patterns)):
+            yield {
+                'line': line,
+                'stress_pattern': stress_pattern,
+                'meter': meter,
+                'rhythm_info': rhythm_info
+            }
+
+def _analyze_en(lines, batch_size):
+    stress_dict = load_stress_dict(language='en')
+    while True:
+        chunk = list(islice(lines, batch_size))
+        if not chunk:
+            return
+        pairs = [(line, clean_text(line)) for line in chunk]
+        pairs = [(line, clean_line) for line, clean_line in pairs if clean_line.strip()]
+        patterns = detect_stress_patterns_en([clean_line for _, clean_line in pairs], stress_dict)
+        meters = identify_meters_en(patterns)
+        for (line, _), stress_pattern, (meter, scores), rhythm_info in zip(pairs, patterns, meters, analyze_rhythms(patterns)):
+            yield {
+                'line': line,
+                'stress_pattern': stress_pattern,
+                'meter': meter,
+                'rhythm_info': rhythm_info,
+                'scores': scores
+            }
+
+def iter_analyze(stream, language='ru', split='lines', accentizer=None, batch_size=64, stats=None):
+    lines = iter_sentences(stream) if split == 'sentences' else iter_text_lines(stream)
+    if language == 'en':
+        results = _analyze_en(lines, batch_size)
+    else:
+        results = _analyze_ru(lines, accentizer, batch_size)
+
+    for line_number, result in enumerate(results, 1):
+        result['line_number'] = line_number
+        if stats is not None:
+            stats.add(result['stress_pattern'], result['meter'])
+        yield result
@@ -0,0 +1,126 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+MAGIC = b'PSD1'
+VERSION = 1
+MAX_SYLLABLES = 16
+
+_HEADER = struct.Struct('<4sHHI')
+_OFFSET = struct.Struct('<I')
+_BITS = struct.Struct('<H')
+
+def _pack_pattern(word, pattern):
+    if len(pattern) > MAX_SYLLABLES:
+        raise ValueError(f"Слишком много слогов в слове '{word}': {len(pattern)}")
+    bits = 0
+    for i, stress in enumerate(pattern):
+        if stress not in (0, 1):
+            raise ValueError(f"Недопустимое значение ударения в слове '{word}': {stress}")
+        if stress:
+            bits |= 1 << i
+    return bits
+
+def build_compact_stress_dict(stress_dict, output_path):
+    entries = sorted((word.encode('utf-8'), word, pattern) for word, pattern in stress_dict.items())
+
+    offsets = []
+    blob = bytearray()
+    for key, _, _ in entries:
+        offsets.append(len(blob))
+        blob.extend(key)
+    offsets.append(len(blob))
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(entries)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(struct.pack(f'<{len(entries)}H', *(_pack_pattern(word, pattern) for _, word, pattern in entries)))
+        f.write(bytes(len(pattern) for _, _, pattern in entries))
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+
+    return len(entries)
+
+class CompactStressDict(Mapping):
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Пустой файл словаря: {path}")
+
+        magic, version, _, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Неизвестный формат словаря: {path}")
+
+        self._count = count
+        self._offsets_pos = _HEADER.size
+        self._bits_pos = self._offsets_pos + _OFFSET.size * (count + 1)
+        self._lengths_pos = self._bits_pos + _BITS.size * count
+        self._words_pos = self._lengths_pos + count
+
+    def _word_bytes(self, index):
+        start = _OFFSET.unpack_from(self._mm, self._offsets_pos + _OFFSET.size * index)[0]
+        end = _OFFSET.unpack_from(self._mm, self._offsets_pos + _OFFSET.size * (index + 1))[0]
+        return self._mm[self._words_pos + start:self._words_pos + end]
+
+    def _find(self, word):
+        if not isinstance(word, str):
+            return -1
+        key = word.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            current = self._word_bytes(middle)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def _pattern(self, index):
+        bits = _BITS.unpack_from(self._mm, self._bits_pos + _BITS.size * index)[0]
+        length = self._mm[self._lengths_pos + index]
+        return [(bits >> i) & 1 for i in range(length)]
+
+    def __getitem__(self, word):
+        index = self._find(word)
+        if index < 0:
+            raise KeyError(word)
+        return self._pattern(index)
+
+    def get(self, word, default=None):
+        index = self._find(word)
+        if index < 0:
+            return default
+        return self._pattern(index)
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._word_bytes(index).decode('utf-8')
+
+    def close(self):
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,50 @@
+import re
+from collections import namedtuple
+
+VOWELS_RU = 'аеёиоуыэюя'
+VOWELS_EN = 'aeiouy'
+
+TOKEN_RE = re.compile(r'\S+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+SPACES_RE = re.compile(' {2,}')
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+VOWEL_GROUP_EN_RE = re.compile(f'[{VOWELS_EN}]+')
+
+_vowel_patterns = {}
+
+def _vowel_pattern(vowels):
+    pattern = _vowel_patterns.get(vowels)
+    if pattern is None:
+        pattern = _vowel_patterns[vowels] = re.compile(f'[{re.escape(vowels)}]')
+    return pattern
+
+Token = namedtuple('Token', ['text', 'word', 'start', 'end', 'vowels'])
+
+def clean_text(text):
+    text = text.replace('\r\n', ' ').replace('\n', ' ')
+    return SPACES_RE.sub(' ', text)
+
+def split_into_lines(text):
+    return [line for line in map(str.strip, SENTENCE_END_RE.split(text)) if line]
+
+def normalize_word(word):
+    if not word:
+        return ""
+    return PUNCTUATION_RE.sub('', word.lower())
+
+def count_vowels(word, vowels=VOWELS_RU):
+    return len(_vowel_pattern(vowels).findall(word))
+
+def count_vowel_groups_en(word):
+    return len(VOWEL_GROUP_EN_RE.findall(word))
+
+def iter_tokens(text, vowels=VOWELS_RU):
+    substitute = PUNCTUATION_RE.sub
+    find_vowels = _vowel_pattern(vowels).findall
+    for match in TOKEN_RE.finditer(text):
+        token = match.group()
+        word = substitute('', token.lower())
+        yield Token(token, word, match.start(), match.end(), len(find_vowels(word)))
+
+def tokenize(text, vowels=VOWELS_RU):
+    return list(iter_tokens(text, vowels))
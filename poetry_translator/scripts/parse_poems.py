@@ -1,10 +1,24 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import argparse
+import hashlib
+import json
 import re
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urljoin, urlparse
 import time
 
+BASE_URL = 'https://sites.google.com/site/poetryandtranslations/'
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+SERVICE_WORDS = ['home', 'manifesto', 'biography', 'books', 'contact']
+
 def clean_poem_text(text):
     text = re.sub(r'\s+', ' ', text)
     text = text.strip()
@@ -12,20 +26,12 @@ def clean_poem_text(text):
     lines = [line.strip() for line in lines if line.strip()]
     return '\n'.join(lines)
 
-def get_soup(url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers, timeout=15)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, 'html.parser')
-
-def is_author_link(a):
+def is_author_link(a, site_path='/site/poetryandtranslations/'):
     href = a.get('href', '')
-    return href and not href.startswith('http') and not href.startswith('#') and '/site/poetryandtranslations/' in href and 'homepage1' not in href
+    return href and not href.startswith('http') and not href.startswith('#') and site_path in href and 'homepage1' not in href
 
-def is_poem_link(href, author_slug):
-    if not href.startswith('/site/poetryandtranslations/'):
+def is_poem_link(href, author_slug, site_path='/site/poetryandtranslations/'):
+    if not href.startswith(site_path):
         return False
     if href.rstrip('/').endswith(author_slug):
         return False
@@ -36,131 +42,368 @@ def is_poem_link(href, author_slug):
         return False
     return True
 
-def extract_russian_poem_from_page(url):
-    soup = get_soup(url)
-    
+def extract_poem_variants(soup):
     ru_paragraphs = []
-    for p in soup.find_all('p'):
-        text = p.get_text(strip=True)
-        if text and re.search(r'[а-яА-ЯёЁ]', text):
-            if not any(x in text.lower() for x in ['home', 'manifesto', 'biography', 'books', 'contact']):
-                ru_paragraphs.append(text)
-    
-    if not ru_paragraphs:
-        return ''
-    
-    poem = '\n'.join(ru_paragraphs)
-    return clean_poem_text(poem)
-
-def extract_english_poem_from_page(url):
-    soup = get_soup(url)
-    
     en_paragraphs = []
     for p in soup.find_all('p'):
         text = p.get_text(strip=True)
-        if text and not re.search(r'[а-яА-ЯёЁ]', text):
-            if not any(x in text.lower() for x in ['home', 'manifesto', 'biography', 'books', 'contact']):
-                en_paragraphs.append(text)
-    
-    if not en_paragraphs:
-        return ''
-    
-    poem = '\n'.join(en_paragraphs)
-    return clean_poem_text(poem)
-
-def get_poem_links_from_author_page(url):
-    soup = get_soup(url)
-    poem_links = []
-    author_slug = url.rstrip('/').split('/')[-1]
-    
-    for a in soup.find_all('a'):
-        href = a.get('href', '')
-        text = a.get_text(strip=True)
-        if is_poem_link(href, author_slug):
-            if href.startswith('/site/poetryandtranslations/'):
-                href = href.replace('/site/poetryandtranslations/', '')
-            full_url = 'https://sites.google.com/site/poetryandtranslations/' + href
-            poem_links.append(full_url)
-            print(f'Добавлена ссылка на стихотворение: {text} -> {full_url}')
-    return list(set(poem_links))
+        if not text or any(x in text.lower() for x in SERVICE_WORDS):
+            continue
+        if re.search(r'[а-яА-ЯёЁ]', text):
+            ru_paragraphs.append(text)
+        else:
+            en_paragraphs.append(text)
 
-def main():
-    base = 'https://sites.google.com/site/poetryandtranslations/'
-    homepage = 'https://sites.google.com/site/poetryandtranslations/homepage1'
-    data_dir = Path('poetry_translator/data/raw')
-    data_dir.mkdir(parents=True, exist_ok=True)
-    
-    print('Парсим главную страницу...')
-    soup = get_soup(homepage)
-    author_links = []
-    for a in soup.find_all('a'):
-        if is_author_link(a):
-            href = a['href']
-            if href.startswith('/site/poetryandtranslations/'):
-                href = href.replace('/site/poetryandtranslations/', '')
-            if not href.startswith('http'):
-                href = base + href
-            author_links.append(href)
-    author_links = list(set(author_links))
-    print(f'Найдено авторов: {len(author_links)}')
-    
-    poem_links = set()
-    for author_url in author_links:
+    ru_poem = clean_poem_text('\n'.join(ru_paragraphs)) if ru_paragraphs else ''
+    en_poem = clean_poem_text('\n'.join(en_paragraphs)) if en_paragraphs else ''
+    return ru_poem, en_poem
+
+class RateLimiter:
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_time = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time.get(host, now))
+            self._next_time[host] = scheduled + self.min_interval
+        delay = scheduled - now
+        if delay > 0:
+            time.sleep(delay)
+
+class HttpCache:
+    def __init__(self, cache_dir, max_age=86400):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.body', self.cache_dir / f'{key}.json'
+
+    def load(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta):
+        return time.time() - meta.get('fetched_at', 0) < self.max_age
+
+    def store(self, url, response):
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }
+        tmp_body = body_path.with_suffix('.body.tmp')
+        with open(tmp_body, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_suffix('.json.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    def touch(self, url, meta):
+        _, meta_path = self._paths(url)
+        meta = dict(meta, fetched_at=time.time())
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def count(self, kind):
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    def report(self):
+        return (f'HTTP-кэш: из кэша {self.fresh_hits}, подтверждено сервером (304) {self.revalidated}, '
+                f'загружено заново {self.misses}')
+
+class Checkpoint:
+    def __init__(self, path, fresh=False):
+        self.path = Path(path)
+        self.done = {}
+        self._pending = []
+        self._file = None
+        if not fresh and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    url, _, status = line.rstrip('\n').partition('\t')
+                    if url:
+                        self.done[url] = status
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def __contains__(self, url):
+        return url in self.done
+
+    def pair_count(self):
+        return sum(1 for status in self.done.values() if status == 'pair')
+
+    def mark(self, url, status):
+        self.done[url] = status
+        if self._file is None:
+            self._pending.append((url, status))
+            if status != 'pair':
+                return
+            self._file = open(self.path, 'w', encoding='utf-8')
+            entries, self._pending = self._pending, []
+        else:
+            entries = [(url, status)]
+        self._file.write(''.join(f'{entry_url}\t{entry_status}\n' for entry_url, entry_status in entries))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def read_poems(path):
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [p.strip() for p in f.read().split('\n\n') if p.strip()]
+
+class PairWriter:
+    def __init__(self, source_path, target_path, expected_pairs=None, staged=False):
+        self.source_path = Path(source_path)
+        self.target_path = Path(target_path)
+        self._staging = None
+        if staged:
+            self._staging = tuple(path.with_name(path.name + '.partial') for path in (self.source_path, self.target_path))
+            for path in self._staging:
+                path.write_text('', encoding='utf-8')
+        if expected_pairs is not None:
+            self._repair(expected_pairs)
+
+    def _repair(self, expected_pairs):
+        for path in (self.source_path, self.target_path):
+            poems = read_poems(path)
+            if len(poems) != expected_pairs:
+                print(f'В {path.name} {len(poems)} стихов вместо {expected_pairs}, лишние записи удалены')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write('\n\n'.join(poems[:expected_pairs]))
+
+    def _append(self, path, poem):
+        separator = '\n\n' if path.exists() and path.stat().st_size > 0 else ''
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(separator + poem)
+            f.flush()
+
+    def write(self, ru_poem, en_poem):
+        source_path, target_path = self._staging or (self.source_path, self.target_path)
+        self._append(source_path, ru_poem)
+        self._append(target_path, en_poem)
+        if self._staging:
+            os.replace(source_path, self.source_path)
+            os.replace(target_path, self.target_path)
+            self._staging = None
+
+    def close(self):
+        if self._staging:
+            for path in self._staging:
+                path.unlink(missing_ok=True)
+            self._staging = None
+
+def make_session(pool_size):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class PoemCrawler:
+    def __init__(self, base_url=BASE_URL, max_workers=8, min_interval=1.0, timeout=15, session=None, http_cache=None):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.site_path = urlparse(self.base_url).path
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or make_session(max_workers)
+        self.rate_limiter = RateLimiter(min_interval)
+        self.http_cache = http_cache
+
+    def fetch(self, url):
+        cached = self.http_cache.load(url) if self.http_cache else None
+        headers = {}
+        if cached:
+            meta, body = cached
+            if self.http_cache.is_fresh(meta):
+                self.http_cache.count('fresh_hits')
+                return body
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        self.rate_limiter.wait(urlparse(url).netloc)
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if cached and response.status_code == 304:
+            self.http_cache.count('revalidated')
+            self.http_cache.touch(url, cached[0])
+            return cached[1]
+        response.raise_for_status()
+        if self.http_cache:
+            self.http_cache.count('misses')
+            self.http_cache.store(url, response)
+        return response.content
+
+    def get_soup(self, url):
+        return BeautifulSoup(self.fetch(url), 'html.parser')
+
+    def to_absolute(self, href):
+        if href.startswith(self.site_path):
+            href = href[len(self.site_path):]
+        return urljoin(self.base_url, href)
+
+    def get_author_links(self):
+        soup = self.get_soup(urljoin(self.base_url, 'homepage1'))
+        author_links = set()
+        for a in soup.find_all('a'):
+            if is_author_link(a, self.site_path):
+                author_links.add(self.to_absolute(a['href']))
+        return sorted(author_links)
+
+    def get_poem_links_from_author_page(self, url):
+        soup = self.get_soup(url)
+        poem_links = set()
+        author_slug = url.rstrip('/').split('/')[-1]
+
+        for a in soup.find_all('a'):
+            href = a.get('href', '')
+            text = a.get_text(strip=True)
+            if is_poem_link(href, author_slug, self.site_path):
+                full_url = self.to_absolute(href)
+                poem_links.add(full_url)
+                print(f'Добавлена ссылка на стихотворение: {text} -> {full_url}')
+        return sorted(poem_links)
+
+    def get_poem_pair(self, url):
+        return extract_poem_variants(self.get_soup(url))
+
+    def _safe_author_links(self, author_url):
         try:
             print(f'Парсим страницу автора: {author_url}')
-            author_poem_links = get_poem_links_from_author_page(author_url)
-            print(f'Найдено стихотворений у автора: {len(author_poem_links)}')
-            poem_links.update(author_poem_links)
-            time.sleep(1)
+            links = self.get_poem_links_from_author_page(author_url)
+            print(f'Найдено стихотворений у автора {author_url}: {len(links)}')
+            return links
         except Exception as e:
-            print(f'Ошибка при парсинге автора: {e}')
-    
-    poem_links = list(poem_links)
-    print(f'Всего найдено стихотворений: {len(poem_links)}')
-    
-    ru_poems = []
-    en_poems = []
-    for i, poem_url in enumerate(poem_links):
+            print(f'Ошибка при парсинге автора {author_url}: {e}')
+            return []
+
+    def _safe_poem_pair(self, poem_url):
         try:
-            print(f'[{i+1}/{len(poem_links)}] Парсим стихотворение: {poem_url}')
-            
-            ru_poem = extract_russian_poem_from_page(poem_url)
-            en_poem = extract_english_poem_from_page(poem_url)
-            
+            return self.get_poem_pair(poem_url)
+        except Exception as e:
+            print(f'Ошибка при парсинге стихотворения {poem_url}: {e}')
+            return None
+
+    def collect_poem_links(self):
+        print('Парсим главную страницу...')
+        author_links = self.get_author_links()
+        print(f'Найдено авторов: {len(author_links)}')
+
+        poem_links = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for links in executor.map(self._safe_author_links, author_links):
+                poem_links.update(links)
+        return sorted(poem_links)
+
+    def iter_poem_pairs(self, poem_links):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for i, (poem_url, pair) in enumerate(zip(poem_links, executor.map(self._safe_poem_pair, poem_links))):
+                print(f'[{i+1}/{len(poem_links)}] Стихотворение: {poem_url}')
+                yield poem_url, pair
+
+def main():
+    parser = argparse.ArgumentParser(description='Сбор параллельного корпуса стихов')
+    parser.add_argument('--base-url', type=str, default=BASE_URL, help='Адрес сайта с переводами')
+    parser.add_argument('--output-dir', type=str, default='poetry_translator/data/raw', help='Папка для сохранения стихов')
+    parser.add_argument('--workers', type=int, default=8, help='Количество одновременных запросов')
+    parser.add_argument('--min-interval', type=float, default=1.0, help='Минимальный интервал между запросами к одному хосту, с')
+    parser.add_argument('--cache-dir', type=str, default=None, help='Папка HTTP-кэша (по умолчанию <output-dir>/.http_cache)')
+    parser.add_argument('--cache-max-age', type=float, default=86400, help='Сколько секунд ответ считается свежим без перепроверки')
+    parser.add_argument('--no-cache', action='store_true', help='Не использовать HTTP-кэш')
+    parser.add_argument('--fresh', action='store_true', help='Начать сбор заново, игнорируя контрольную точку (файлы корпуса заменяются после первой собранной пары)')
+    args = parser.parse_args()
+
+    data_dir = Path(args.output_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    source_path = data_dir / 'source_poems.txt'
+    target_path = data_dir / 'target_poems.txt'
+    checkpoint_path = data_dir / 'crawl_checkpoint.txt'
+
+    resuming = checkpoint_path.exists() and not args.fresh
+
+    http_cache = None
+    if not args.no_cache:
+        http_cache = HttpCache(args.cache_dir or data_dir / '.http_cache', max_age=args.cache_max_age)
+
+    checkpoint = Checkpoint(checkpoint_path, fresh=not resuming)
+
+    crawler = PoemCrawler(args.base_url, max_workers=args.workers, min_interval=args.min_interval, http_cache=http_cache)
+    poem_links = crawler.collect_poem_links()
+    print(f'Всего найдено стихотворений: {len(poem_links)}')
+
+    pending_links = [url for url in poem_links if url not in checkpoint]
+    if resuming:
+        print(f'Продолжение сбора: уже обработано {len(poem_links) - len(pending_links)}, осталось {len(pending_links)}')
+
+    writer = PairWriter(source_path, target_path, expected_pairs=checkpoint.pair_count() if resuming else None,
+                        staged=not resuming)
+
+    collected = 0
+    try:
+        for poem_url, pair in crawler.iter_poem_pairs(pending_links):
+            if pair is None:
+                continue
+            ru_poem, en_poem = pair
             if ru_poem and en_poem:
-                ru_poems.append(ru_poem)
-                en_poems.append(en_poem)
+                if not resuming and not collected:
+                    checkpoint_path.unlink(missing_ok=True)
+                writer.write(ru_poem, en_poem)
+                checkpoint.mark(poem_url, 'pair')
+                collected += 1
                 print(f'Успешно извлечены русский и английский варианты')
                 print(f'Русский текст: {ru_poem[:100]}...')
                 print(f'Английский текст: {en_poem[:100]}...')
             else:
+                checkpoint.mark(poem_url, 'skip')
                 print(f'Не удалось извлечь оба варианта текста')
-            time.sleep(1)
-        except Exception as e:
-            print(f'Ошибка при парсинге стихотворения: {e}')
-    
-    print(f'Всего собрано пар стихотворений: {len(ru_poems)}')
-    
-    if not ru_poems or not en_poems:
-        print('Внимание: один из списков стихов пуст!')
+    finally:
+        checkpoint.close()
+        writer.close()
+        if http_cache:
+            print(http_cache.report())
+
+    total_pairs = checkpoint.pair_count()
+    print(f'Собрано пар стихотворений за этот запуск: {collected}, всего: {total_pairs}')
+
+    if not total_pairs:
+        print('Внимание: один из списков стихов пуст! Существующие файлы корпуса не изменены.')
     else:
-        print(f'Сохранение результатов...')
-        with open(data_dir / 'source_poems.txt', 'w', encoding='utf-8') as f:
-            f.write('\n\n'.join(ru_poems))
-        with open(data_dir / 'target_poems.txt', 'w', encoding='utf-8') as f:
-            f.write('\n\n'.join(en_poems))
-        print(f'Сохранено пар стихотворений: {len(ru_poems)}')
-        
         print('\nПроверка содержимого файлов:')
-        with open(data_dir / 'source_poems.txt', 'r', encoding='utf-8') as f:
+        with open(source_path, 'r', encoding='utf-8') as f:
             source_content = f.read()
             print(f'Размер source_poems.txt: {len(source_content)} байт')
             print(f'Первые 200 символов: {source_content[:200]}')
-        
-        with open(data_dir / 'target_poems.txt', 'r', encoding='utf-8') as f:
+
+        with open(target_path, 'r', encoding='utf-8') as f:
             target_content = f.read()
             print(f'Размер target_poems.txt: {len(target_content)} байт')
             print(f'Первые 200 символов: {target_content[:200]}')
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
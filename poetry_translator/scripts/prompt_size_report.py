@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from poetry_translator.utils.prompt_builder import ANALYSIS_BUILDERS, build_analysis, build_translation_prompt
+from poetry_translator.utils.translation_service import estimate_tokens
+
+DEFAULT_DATASET = project_root / 'poetry_translator' / 'data' / 'processed' / 'dataset.json'
+
+def record_details(record):
+    details = []
+    meters = []
+    for index, line_analysis in enumerate(record.get('line_analyses', [])):
+        rhythm_info = line_analysis.get('rhythm_info', {})
+        details.append({
+            'line_number': index + 1,
+            'text': line_analysis['line'],
+            'stress_pattern': line_analysis['stress_pattern'],
+            'meter': line_analysis['meter'],
+            'rhythm_type': rhythm_info.get('rhythm_type', 'неопределенный'),
+            'stress_density': rhythm_info.get('stress_density', 0),
+            'stress_intervals': rhythm_info.get('stress_intervals', [])
+        })
+        if line_analysis['meter'] != 'неопределенный размер':
+            meters.append(line_analysis['meter'])
+    dominant_meter = Counter(meters).most_common(1)[0][0] if meters else 'Не удалось определить'
+    return details, dominant_meter
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение размера промптов с подробным и компактным анализом')
+    parser.add_argument('--dataset', type=str, default=str(DEFAULT_DATASET), help='Путь к dataset.json')
+    parser.add_argument('--top', type=int, default=5, help='Сколько самых длинных промптов показать')
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+
+    formats = sorted(ANALYSIS_BUILDERS)
+    totals = {name: {'analysis_chars': 0, 'prompt_chars': 0, 'prompt_tokens': 0} for name in formats}
+    per_poem = []
+
+    for index, record in enumerate(dataset):
+        details, dominant_meter = record_details(record)
+        sizes = {}
+        for name in formats:
+            analysis_text = build_analysis(details, dominant_meter, name)
+            prompt_text = build_translation_prompt(record['source_text'], analysis_text)
+            sizes[name] = estimate_tokens(prompt_text)
+            totals[name]['analysis_chars'] += len(analysis_text)
+            totals[name]['prompt_chars'] += len(prompt_text)
+            totals[name]['prompt_tokens'] += sizes[name]
+        per_poem.append((index, len(details), sizes))
+
+    print(f"Стихотворений: {len(dataset)}")
+    print(f"{'Формат':<10}{'Анализ, симв.':>16}{'Промпт, симв.':>16}{'Промпт, ~токенов':>19}{'~токенов/стих':>16}")
+    for name in formats:
+        total = totals[name]
+        print(f"{name:<10}{total['analysis_chars']:>16}{total['prompt_chars']:>16}{total['prompt_tokens']:>19}"
+              f"{total['prompt_tokens'] / max(len(dataset), 1):>16.1f}")
+
+    if 'full' in totals and 'compact' in totals and totals['full']['prompt_tokens']:
+        full, compact = totals['full'], totals['compact']
+        print(f"Сокращение анализа: {(1 - compact['analysis_chars'] / full['analysis_chars']) * 100:.1f}%")
+        print(f"Сокращение промпта: {(1 - compact['prompt_tokens'] / full['prompt_tokens']) * 100:.1f}%")
+
+        print("Самые длинные промпты (~токенов, full -> compact):")
+        for index, line_count, sizes in sorted(per_poem, key=lambda item: -item[2]['full'])[:args.top]:
+            print(f"  #{index}: {line_count} строк, {sizes['full']} -> {sizes['compact']}")
+
+if __name__ == '__main__':
+    main()
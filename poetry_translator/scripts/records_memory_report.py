@@ -0,0 +1,71 @@
+import argparse
+import copy
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from poetry_meter_detector.utils.records import PoemAnalysis
+
+DEFAULT_DATASET = project_root / 'poetry_translator' / 'data' / 'processed' / 'dataset.json'
+
+def analysis_part(record):
+    return {
+        'meter': record['meter'],
+        'rhythm': record['rhythm'],
+        'line_analyses': record.get('line_analyses', [])
+    }
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение памяти: словари анализа и компактные записи LineAnalysis/PoemAnalysis')
+    parser.add_argument('--dataset', type=str, default=str(DEFAULT_DATASET), help='Путь к dataset.json')
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        raw = f.read()
+    records = json.loads(raw)
+    lines = sum(len(record.get('line_analyses', [])) for record in records)
+    print(f"Стихотворений: {len(records)}, строк: {lines}")
+
+    dicts, dicts_size = measure(lambda: [copy.deepcopy(analysis_part(record)) for record in records])
+    compact, compact_size = measure(lambda: [PoemAnalysis.from_dict(record) for record in records])
+
+    mismatches = sum(1 for analysis, record in zip(compact, records) if analysis.to_dict() != analysis_part(record))
+    print(f"Расхождений to_dict() с исходными данными: {mismatches}")
+
+    print(f"{'Анализ (без текстов строк)':<32}{'словари, КБ':>14}{'записи, КБ':>14}{'экономия':>10}")
+    print(f"{'всего':<32}{dicts_size / 1024:>14.1f}{compact_size / 1024:>14.1f}"
+          f"{(1 - compact_size / dicts_size) * 100:>9.1f}%")
+    print(f"{'на строку, байт':<32}{dicts_size / max(lines, 1):>14.0f}{compact_size / max(lines, 1):>14.0f}")
+    del dicts, compact, records
+
+    full_dicts, full_dicts_size = measure(lambda: json.loads(raw))
+
+    def load_compact():
+        data = json.loads(raw)
+        for record in data:
+            analysis = PoemAnalysis.from_dict(record)
+            record['rhythm'] = analysis.rhythm
+            record['line_analyses'] = analysis.lines
+        return data
+
+    full_compact, full_compact_size = measure(load_compact)
+    print(f"{'Датасет целиком в памяти':<32}{full_dicts_size / 1024:>14.1f}{full_compact_size / 1024:>14.1f}"
+          f"{(1 - full_compact_size / full_dicts_size) * 100:>9.1f}%")
+
+if __name__ == '__main__':
+    main()
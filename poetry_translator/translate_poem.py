@@ -1,3 +1,4 @@
+import argparse
 import logging
 from pathlib import Path
 import json 
@@ -6,41 +7,46 @@ import sys
 import os
 import time
 
-try:
-    from dotenv import load_dotenv
-    DOTENV_AVAILABLE = True
-except ImportError:
-    DOTENV_AVAILABLE = False
-    print("Библиотека python-dotenv не установлена. API ключ нужно будет передавать иным способом или он не будет загружен.")
-
-try:
-    import google.generativeai as genai
-    GEMINI_API_AVAILABLE = True
-except ImportError:
-    GEMINI_API_AVAILABLE = False
-    print("Библиотека google-generativeai не установлена. Автоматический перевод через Gemini API будет недоступен.")
-
-
 script_dir = Path(__file__).parent.absolute()
 project_root = script_dir.parent
 meter_detector_path = project_root / "poetry_meter_detector"
 if str(meter_detector_path) not in sys.path:
     sys.path.append(str(meter_detector_path))
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from poetry_translator.utils.translation_cache import TranslationCache
+from poetry_translator.utils.prompt_builder import ANALYSIS_BUILDERS, build_analysis, build_translation_prompt
 
 try:
     from utils import preprocess
+    from utils.analysis_client import AnalysisClient, AnalysisServerError, client_from_env
+    from utils.backends import backends
+    from utils.metrics import metrics, profiling
 except ImportError as e:
     print(f"Ошибка импорта preprocess: {e}")
     print(f"Sys.path: {sys.path}")
 
     try:
         import poetry_meter_detector.utils.preprocess as preprocess
+        from poetry_meter_detector.utils.analysis_client import AnalysisClient, AnalysisServerError, client_from_env
+        from poetry_meter_detector.utils.backends import backends
+        from poetry_meter_detector.utils.metrics import metrics, profiling
         print("Успешно импортирован poetry_meter_detector.utils.preprocess")
     except ImportError:
         print("Не удалось импортировать preprocess. Убедитесь, что poetry_meter_detector доступен.")
         sys.exit(1)
 
 
+DOTENV_AVAILABLE = backends.available('dotenv')
+if not DOTENV_AVAILABLE:
+    print(backends.missing_message('dotenv'))
+
+GEMINI_API_AVAILABLE = backends.available('genai')
+if not GEMINI_API_AVAILABLE:
+    print(backends.missing_message('genai'))
+
+
 def setup_logger():
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
@@ -55,70 +61,144 @@ def setup_logger():
     console_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
+    logger.propagate = False
     return logger
 
-logger = setup_logger()
-
-
-def get_translation_via_gemini_api(prompt_text: str, api_key: str) -> str | None:
-    if not GEMINI_API_AVAILABLE:
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_PATH = (Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+                      / "poetry_translator" / "translation_cache.sqlite")
+
+_translation_services = {}
+_translation_cache = None
+_cache_only = False
+_analysis_client = client_from_env()
+
+def configure_analysis_server(url: str | None):
+    global _analysis_client
+    _analysis_client = AnalysisClient(url) if url else client_from_env()
+
+def configure_translation_cache(cache_path: str | None, ttl_days: float | None = 30,
+                                max_mb: float | None = 100, cache_only: bool = False):
+    global _translation_cache, _cache_only
+    _cache_only = cache_only
+    _translation_cache = None
+    if cache_path:
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else None
+        _translation_cache = TranslationCache(cache_path, ttl_days=ttl_days, max_bytes=max_bytes)
+        logger.info(f"Кэш переводов: {cache_path}" + (" (только кэш, без обращений к API)" if cache_only else ""))
+    elif cache_only:
+        logger.warning("Режим --cache-only без кэша: переводы получены не будут.")
+    close_translation_services()
+
+def close_translation_services():
+    for service in _translation_services.values():
+        service.close()
+    _translation_services.clear()
+
+def close_translation_cache():
+    if _translation_cache is not None:
+        logger.info(_translation_cache.report())
+        _translation_cache.close()
+
+def report_metrics(metrics_file: str | None = None):
+    logger.info(metrics.report())
+    if metrics_file:
+        metrics.write(metrics_file)
+        logger.info(f"Метрики в формате Prometheus сохранены в: {metrics_file}")
+
+def can_translate(api_key: str | None) -> bool:
+    return _cache_only or bool(api_key and GEMINI_API_AVAILABLE)
+
+def get_translation_service(api_key: str | None, **options) -> "TranslationService":
+    from poetry_translator.utils.translation_service import TranslationService
+
+    if options:
+        return TranslationService(api_key=api_key, logger=logger, cache=_translation_cache, cache_only=_cache_only,
+                                  metrics=metrics, **options)
+    service = _translation_services.get(api_key)
+    if service is None:
+        service = TranslationService(api_key=api_key, logger=logger, cache=_translation_cache, cache_only=_cache_only,
+                                     metrics=metrics)
+        _translation_services[api_key] = service
+    return service
+
+def get_translation_via_gemini_api(prompt_text: str, api_key: str | None) -> str | None:
+    if not _cache_only and not GEMINI_API_AVAILABLE:
         logger.warning("Библиотека google-generativeai недоступна. Пропуск вызова API.")
         return None
-    if not api_key:
+    if not _cache_only and not api_key:
         logger.warning("API ключ для Gemini не предоставлен. Пропуск вызова API.")
         return None
 
     logger.info("Попытка получить перевод через Gemini API...")
+    service = get_translation_service(api_key)
+    logger.info(f"Параметры генерации для API: {service.generation_config}")
     try:
-        genai.configure(api_key=api_key)
-        model_name = 'models/gemini-1.5-flash-latest'
-        logger.info(f"Используемая модель Gemini: {model_name}")
-        model = genai.GenerativeModel(model_name)
-        requested_temperature = 2.0
-        logger.info(f"Запрошенная температура: {requested_temperature}")
-
-        generation_config = genai.types.GenerationConfig(
-            temperature=requested_temperature, 
-            max_output_tokens=2048
-        )
-
-        logger.info(f"Параметры генерации для API: {generation_config}")
-
-        response = model.generate_content(
-            prompt_text,
-            generation_config=generation_config
-        )
-        
-        if response.parts:
-            translation = response.text
-            logger.info("Перевод успешно получен от Gemini API.")
-            return translation
-        else:
-            logger.warning("Gemini API вернул пустой ответ (no parts). Возможно, сработали фильтры безопасности или другая проблема.")
-            if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
-                 logger.warning(f"Prompt Feedback: {response.prompt_feedback}")
-            if hasattr(response, 'candidates') and response.candidates:
-                for candidate in response.candidates:
-                    if hasattr(candidate, 'finish_reason') and candidate.finish_reason != 'STOP':
-                        logger.warning(f"Кандидат завершился с причиной: {candidate.finish_reason}")
-                        if hasattr(candidate, 'safety_ratings'):
-                            logger.warning(f"  Safety Ratings: {candidate.safety_ratings}")
-            return None
-
+        return service.translate_sync(prompt_text)
     except Exception as e:
-        logger.error(f"Ошибка при вызове Gemini API: {e}", exc_info=True)
-        if "Unsupported parameter" in str(e) or "Invalid value" in str(e):
-            logger.error("Возможно, указанная температура или другие параметры не поддерживаются для этой модели/версии API.")
-        elif "Could not find model" in str(e) or "is not found" in str(e):
-            logger.error(f"Модель '{model_name}' не найдена. Проверьте правильность имени и доступность для вашего API ключа.")
-        elif "billing account" in str(e).lower() or "quota" in str(e).lower() or "resourceexhausted" in str(e).lower():
-            logger.error(f"Проблема с квотами или биллингом для модели '{model_name}'. Эта модель может не иметь бесплатного уровня или вы исчерпали лимиты.")
+        from poetry_translator.utils.translation_service import log_api_error
+        log_api_error(e, service.model_name, logger)
         return None
 
-def process_poem_and_translate(input_file: str, output_file: str, prompt_file: str):
+def analyze_poem_lines(lines: list[str], accentizer) -> tuple[list, str]:
+    line_analysis_details = []
+    all_meters = []
+
+    stress_patterns = preprocess.detect_stress_patterns_batch(lines, accentizer=accentizer)
+    meters = preprocess.identify_meters_batch(stress_patterns)
+    rhythms = preprocess.analyze_rhythms(stress_patterns)
+
+    for i, (line_text, stress_pattern, meter, rhythm_info) in enumerate(zip(lines, stress_patterns, meters, rhythms)):
+        if not line_text.strip():
+            continue
+        
+        logger.debug(f'Анализ строки {i+1}: "{line_text}"')
+        if meter != "неопределенный размер":
+            all_meters.append(meter)
+        
+        line_analysis_details.append(preprocess.LineAnalysis(line_text, stress_pattern, meter, rhythm_info,
+                                                             line_number=i + 1))
+        logger.debug(f"Строка {i+1} анализ: метр={meter}, ритм={rhythm_info['rhythm_type']}")
+
+    dominant_meter = "Не удалось определить"
+    if all_meters:
+        meter_counts = Counter(all_meters)
+        dominant_meter = meter_counts.most_common(1)[0][0]
+    logger.info(f"Доминирующий метр (если есть): {dominant_meter}")
+    return line_analysis_details, dominant_meter
+
+def load_accentizer(tiered: bool = False):
+    if _analysis_client is not None:
+        try:
+            health = _analysis_client.health()
+            logger.info(f"Используется сервер анализа {_analysis_client.url} ({health['accentizer']}), "
+                        f"модель ударений локально не загружается.")
+            return _analysis_client
+        except AnalysisServerError as e:
+            logger.warning(f"{e}. Модель ударений будет загружена локально.")
+    if tiered:
+        accentizer = preprocess.get_tiered_accentizer()
+        if accentizer:
+            logger.info("Используется многоуровневое определение ударений: словарь, затем модель.")
+            return accentizer
+    return preprocess.get_ruaccent_model()
+
+def log_tier_stats(accentizer):
+    if not isinstance(accentizer, preprocess.TieredAccentizer):
+        return
+    stats = accentizer.report()
+    word_rates = ", ".join(f"{tier} {rate * 100:.1f}%" for tier, rate in stats['word_rates'].items())
+    line_rates = ", ".join(f"{tier} {rate * 100:.1f}%" for tier, rate in stats['line_rates'].items())
+    logger.info(f"Уровни ударений по словам: {word_rates}")
+    logger.info(f"Уровни ударений по строкам: {line_rates}; вызовов модели: {stats['model_calls']}, "
+                f"{stats['ms_per_line']:.2f} мс/строка")
+
+def load_api_key() -> str | None:
     gemini_api_key = None
     if DOTENV_AVAILABLE:
-        load_dotenv()
+        backends.get('dotenv').load_dotenv()
         gemini_api_key = os.getenv("GEMINI_API_KEY")
         if gemini_api_key:
             logger.info("API ключ GEMINI_API_KEY загружен из .env файла.")
@@ -126,6 +206,11 @@ def process_poem_and_translate(input_file: str, output_file: str, prompt_file: s
             logger.warning("Переменная GEMINI_API_KEY не найдена в .env файле.")
     else:
         logger.warning("Библиотека python-dotenv недоступна, API ключ не будет загружен автоматически из .env.")
+    return gemini_api_key
+
+def process_poem_and_translate(input_file: str, output_file: str, prompt_file: str, analysis_format: str = 'full',
+                               tiered: bool = False):
+    gemini_api_key = load_api_key()
 
     try:
         logger.info(f"Начинаем анализ стихотворения из файла '{input_file}' для подготовки промпта GPT...")
@@ -141,7 +226,7 @@ def process_poem_and_translate(input_file: str, output_file: str, prompt_file: s
         logger.info("Входной файл успешно прочитан.")
 
         logger.info("Загрузка модели для анализа ударений...")
-        accentizer = preprocess.load_ruaccent_model()
+        accentizer = load_accentizer(tiered)
         
         if not accentizer:
             logger.error("Не удалось загрузить модель. Анализ метра и ритма невозможен.")
@@ -161,79 +246,13 @@ def process_poem_and_translate(input_file: str, output_file: str, prompt_file: s
 
         logger.info(f"Текст разделен на {len(lines)} строк для анализа.")
         
-        line_analysis_details = []
-        all_meters = []
-
-        for i, line_text in enumerate(lines):
-            if not line_text.strip():
-                continue
-            
-            logger.debug(f'Анализ строки {i+1}: "{line_text}"')
-            stress_pattern = preprocess.detect_stress_pattern(line_text, accentizer=accentizer, language='ru')
-            meter = "неопределенный размер"
-            rhythm_info = {"rhythm_type": "неопределенный", "stress_density": 0, "stress_intervals": []}
-
-            if stress_pattern:
-                meter = preprocess.identify_meter(stress_pattern)
-                rhythm_info = preprocess.analyze_rhythm(stress_pattern)
-                if meter != "неопределенный размер":
-                    all_meters.append(meter)
-            
-            line_analysis_details.append({
-                "line_number": i + 1,
-                "text": line_text,
-                "stress_pattern": stress_pattern,
-                "meter": meter,
-                "rhythm_type": rhythm_info['rhythm_type'],
-                "stress_density": rhythm_info['stress_density'],
-                "stress_intervals": rhythm_info['stress_intervals']
-            })
-            logger.debug(f"Строка {i+1} анализ: метр={meter}, ритм={rhythm_info['rhythm_type']}")
-
-        dominant_meter = "Не удалось определить"
-        if all_meters:
-            meter_counts = Counter(all_meters)
-            dominant_meter = meter_counts.most_common(1)[0][0]
-        logger.info(f"Доминирующий метр (если есть): {dominant_meter}")
-
-        analysis_summary_parts = [f"Общий доминирующий метр: {dominant_meter}"]
-        for detail in line_analysis_details:
-            analysis_summary_parts.append(
-                f"Строка {detail['line_number']}: \"{detail['text']}\"\n"
-                f"  - Ударения (позиции слогов): {detail['stress_pattern']}\n"
-                f"  - Метр: {detail['meter']}\n"
-                f"  - Тип ритма: {detail['rhythm_type']}\n"
-                f"  - Плотность ударений: {detail['stress_density']:.2f}\n"
-                f"  - Интервалы между ударениями: {detail['stress_intervals']}"
-            )
-        full_analysis_text = "\n".join(analysis_summary_parts)
+        line_analysis_details, dominant_meter = analyze_poem_lines(lines, accentizer)
+        log_tier_stats(accentizer)
+        with metrics.timer('prompt'):
+            full_analysis_text = build_analysis(line_analysis_details, dominant_meter, analysis_format)
+            prompt_text = build_translation_prompt(original_text, full_analysis_text)
         
         logger.info("Анализ стихотворения завершен.")
-
-        prompt_text = f"""Тебе будет дано стихотворение на русском языке и подробный анализ его стихотворного размера (метра) и ритма.
-Твоя задача — выполнить высококачественный художественный перевод этого стихотворения на английский язык.
-
-Ключевые требования к переводу:
-1.  **Сохранение смысла**: Точно передать оригинальное сообщение, эмоции и образы стихотворения.
-2.  **Соблюдение стихотворного размера и ритма**: Постарайся максимально приблизить английский перевод к метру и ритму оригинала. Используй предоставленный анализ как ориентир. Если точное соответствие невозможно, стремись к гармоничному поэтическому звучанию на английском.
-3.  **ОБЯЗАТЕЛЬНОЕ НАЛИЧIE РИФМЫ**: Перевод должен быть рифмованным. Рифма должна быть естественной, осмысленной и благозвучной в английском языке. Избегай примитивных или натянутых рифм.
-4.  **Поэтичность и стиль**: Перевод должен звучать как настоящее стихотворение на английском, а не как дословный или технический пересказ. Сохрани, по возможности, стиль и тон оригинала.
-5.  **Целостность**: Переведи все строки и строфы стихотворения.
-
-Оригинальное стихотворение (Русский):
----
-{original_text}
----
-
-Подробный анализ оригинального стихотворения:
----
-{full_analysis_text}
----
-
-Пожалуйста, предоставь ТОЛЬКО английский перевод стихотворения, без дополнительных комментариев или пояснений с твоей стороны.
-
-Английский перевод:
-"""
         logger.info("Промпт для GPT успешно сформирован.")
 
         prompt_file_path = Path(prompt_file)
@@ -242,7 +261,7 @@ def process_poem_and_translate(input_file: str, output_file: str, prompt_file: s
         logger.info(f"Промпт сохранен в файл: {prompt_file_path.absolute()} (на случай, если API не сработает или для справки)")
 
         api_translation = None
-        if gemini_api_key and GEMINI_API_AVAILABLE:
+        if can_translate(gemini_api_key):
             api_translation = get_translation_via_gemini_api(prompt_text, gemini_api_key)
         
         output_file_path = Path(output_file)
@@ -289,15 +308,170 @@ def process_poem_and_translate(input_file: str, output_file: str, prompt_file: s
             logger.error(f"Не удалось даже записать сообщение об ошибке в output_file: {e_write}")
         raise
 
-if __name__ == "__main__":
+def iter_batch_inputs(input_path: str):
+    path = Path(input_path)
+    if path.is_dir():
+        for file_path in sorted(path.glob("*.txt")):
+            yield file_path.stem, file_path.read_text(encoding="utf-8")
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get("source_text") or record.get("text") or ""
+            yield str(record.get("id", index + 1)), text
+
+def prepare_batch_item(poem_id: str, original_text: str, accentizer, analysis_format: str = 'full') -> dict:
+    lines = preprocess.split_into_lines(original_text)
+    if not lines:
+        return {"id": poem_id, "status": "empty", "source_text": original_text}
+
+    line_analysis_details, dominant_meter = analyze_poem_lines(lines, accentizer)
+    with metrics.timer('prompt'):
+        prompt_text = build_translation_prompt(original_text, build_analysis(line_analysis_details, dominant_meter, analysis_format))
+    return {
+        "id": poem_id,
+        "status": None,
+        "source_text": original_text,
+        "dominant_meter": dominant_meter,
+        "prompt": prompt_text
+    }
+
+async def run_batch_translation(input_path: str, output_path: str, api_key: str | None,
+                                max_concurrency: int = 4, qps: float = 1.0, queue_size: int = 8,
+                                analysis_format: str = 'full', tiered: bool = False) -> Counter:
+    import asyncio
+
+    accentizer = load_accentizer(tiered)
+    if not accentizer:
+        logger.error("Не удалось загрузить модель. Пакетный анализ невозможен.")
+        return Counter()
+
+    service = None
+    if can_translate(api_key):
+        service = get_translation_service(api_key, max_concurrency=max_concurrency, qps=qps)
+    else:
+        logger.warning("Gemini API недоступен, в результат будут записаны только промпты.")
+
+    statuses = Counter()
+    queue = asyncio.Queue(maxsize=queue_size)
+
+    with open(output_path, "w", encoding="utf-8") as f_out:
+        def write_result(record: dict):
+            f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f_out.flush()
+            statuses[record["status"]] += 1
+            logger.info(f"Стихотворение {record['id']}: {record['status']}")
+
+        async def produce():
+            for poem_id, original_text in iter_batch_inputs(input_path):
+                try:
+                    item = await asyncio.to_thread(prepare_batch_item, poem_id, original_text, accentizer, analysis_format)
+                except Exception as e:
+                    logger.error(f"Ошибка анализа стихотворения {poem_id}: {e}", exc_info=True)
+                    item = {"id": poem_id, "status": "error", "source_text": original_text, "error": str(e)}
+                await queue.put(item)
+            for _ in range(max_concurrency):
+                await queue.put(None)
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                try:
+                    if item["status"] is None:
+                        if service is None:
+                            item["status"] = "prompt_only"
+                        else:
+                            translation = await service.translate(item["prompt"])
+                            if translation:
+                                item["status"] = "translated"
+                                item["translation"] = translation
+                                del item["prompt"]
+                            else:
+                                item["status"] = "cache_miss" if service.cache_only else "api_failed"
+                except Exception as e:
+                    logger.error(f"Ошибка перевода стихотворения {item['id']}: {e}", exc_info=True)
+                    item["status"] = "error"
+                    item["error"] = str(e)
+                write_result(item)
+
+        await asyncio.gather(produce(), *(consume() for _ in range(max_concurrency)))
+
+    log_tier_stats(accentizer)
+
+    return statuses
+
+def translate_batch(input_path: str, output_path: str, max_concurrency: int = 4, qps: float = 1.0,
+                    analysis_format: str = 'full', tiered: bool = False):
+    import asyncio
+
+    api_key = load_api_key()
+    logger.info(f"Пакетная обработка '{input_path}', результаты в '{output_path}'")
+    statuses = asyncio.run(run_batch_translation(input_path, output_path, api_key, max_concurrency, qps,
+                                                   analysis_format=analysis_format, tiered=tiered))
+    summary = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+    logger.info(f"Пакетная обработка завершена. {summary or 'нет стихотворений'}")
+    print(f"Пакетная обработка завершена ({summary or 'нет стихотворений'}). Результаты в '{output_path}'.")
+
+def main():
     base_dir = Path(__file__).parent.parent
-    
-    input_filename = base_dir / "input_file.txt"
-    output_filename = base_dir / "output_file.txt"
-    gpt_prompt_filename = base_dir / "gpt_prompt.txt"
 
-    if 'preprocess' not in globals() or not callable(getattr(preprocess, 'load_ruaccent_model', None)):
+    parser = argparse.ArgumentParser(description="Анализ и перевод русских стихов через Gemini API")
+    parser.add_argument("--input", type=str, default=str(base_dir / "input_file.txt"), help="Файл со стихотворением")
+    parser.add_argument("--output", type=str, default=str(base_dir / "output_file.txt"), help="Файл для перевода")
+    parser.add_argument("--prompt", type=str, default=str(base_dir / "gpt_prompt.txt"), help="Файл для промпта")
+    parser.add_argument("--batch", type=str, default=None, help="Папка с .txt или JSONL-файл со стихами для пакетной обработки")
+    parser.add_argument("--batch-output", type=str, default=str(base_dir / "batch_translations.jsonl"), help="JSONL-файл с результатами пакетной обработки")
+    parser.add_argument("--concurrency", type=int, default=4, help="Количество одновременных запросов к API")
+    parser.add_argument("--qps", type=float, default=1.0, help="Максимум запросов к API в секунду")
+    parser.add_argument("--analysis-format", choices=sorted(ANALYSIS_BUILDERS), default="full",
+                        help="Формат анализа в промпте: подробный (full) или компактная таблица (compact)")
+    parser.add_argument("--tiered", action="store_true",
+                        help="Сначала искать ударения в словаре, а RuAccent вызывать только для неизвестных слов и омографов")
+    parser.add_argument("--meter-engine", choices=preprocess.METER_ENGINES, default=None,
+                        help="Способ определения размера: эвристика по шаблонам или скандирование динамическим программированием")
+    parser.add_argument("--analysis-server", type=str, default=None,
+                        help="Адрес запущенного server.py (по умолчанию берется из переменной POETRY_ANALYSIS_SERVER)")
+    parser.add_argument("--cache", type=str, default=str(DEFAULT_CACHE_PATH),
+                        help="Файл кэша ответов API (по умолчанию в пользовательском каталоге кэша)")
+    parser.add_argument("--no-cache", action="store_true", help="Не использовать кэш ответов API")
+    parser.add_argument("--cache-only", action="store_true", help="Брать переводы только из кэша, без обращений к API")
+    parser.add_argument("--cache-ttl-days", type=float, default=30, help="Срок жизни записей кэша, дней")
+    parser.add_argument("--cache-max-mb", type=float, default=100, help="Максимальный размер ответов в кэше, МБ")
+    parser.add_argument("--metrics-file", type=str, default=None,
+                        help="Файл для метрик по этапам в формате Prometheus (профилирование включается переменной POETRY_PROFILE=cpu,memory)")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="WARNING",
+                        help="Уровень логов анализатора (DEBUG показывает проакцентированные строки)")
+    args = parser.parse_args()
+
+    setup_logger()
+    logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    logger.setLevel(min(logger.level, logging.getLevelName(args.log_level)))
+
+    if 'preprocess' not in globals() or not callable(getattr(preprocess, 'get_ruaccent_model', None)):
         logger.critical("Модуль preprocess не был корректно загружен. Выполнение прервано.")
         print("Ошибка: Модуль preprocess не загружен. Проверьте импорты и пути.")
     else:
-        process_poem_and_translate(str(input_filename), str(output_filename), str(gpt_prompt_filename)) 
\ No newline at end of file
+        if args.meter_engine:
+            preprocess.set_meter_engine(args.meter_engine)
+        configure_analysis_server(args.analysis_server)
+        configure_translation_cache(None if args.no_cache else args.cache, ttl_days=args.cache_ttl_days,
+                                    max_mb=args.cache_max_mb, cache_only=args.cache_only)
+        try:
+            with profiling("translate_poem"):
+                if args.batch:
+                    translate_batch(args.batch, args.batch_output, max_concurrency=args.concurrency, qps=args.qps,
+                                    analysis_format=args.analysis_format, tiered=args.tiered)
+                else:
+                    process_poem_and_translate(args.input, args.output, args.prompt, args.analysis_format, args.tiered)
+        finally:
+            close_translation_services()
+            close_translation_cache()
+            report_metrics(args.metrics_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+class AnalysisCache:
+    def __init__(self, path: str, version: str, max_entries: int = 100000,
+                 max_age_days: Optional[float] = None):
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS analyses_accessed ON analyses (accessed)")
+        self.conn.commit()
+
+    def key(self, text: str, lang: str) -> str:
+        payload = '\0'.join([self.version, lang, text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT value FROM analyses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE analyses SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO analyses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now, now)
+        )
+        self.conn.commit()
+        self.stored += 1
+
+    def evict(self) -> int:
+        removed = 0
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += self.conn.execute("DELETE FROM analyses WHERE accessed < ?", (cutoff,)).rowcount
+        count = self.conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        if count > self.max_entries:
+            removed += self.conn.execute(
+                "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,)
+            ).rowcount
+        self.conn.commit()
+        self.evicted += removed
+        return removed
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stored": self.stored,
+            "evicted": self.evicted,
+            "entries": self.conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        return (f"Кэш анализа: попаданий {stats['hits']}, промахов {stats['misses']} "
+                f"({stats['hit_rate'] * 100:.1f}% попаданий), сохранено {stats['stored']}, "
+                f"удалено {stats['evicted']}, записей в кэше {stats['entries']}")
+
+    def close(self):
+        self.conn.close()
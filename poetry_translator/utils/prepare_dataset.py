@@ -1,109 +1,220 @@
 import os
 import json
+import logging
 import sys
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from poetry_meter_detector.utils.preprocess import (
-    clean_text, detect_stress_pattern, identify_meter, 
-    load_ruaccent_model, analyze_rhythm, count_syllables_ru
+    clean_text, detect_stress_patterns_batch, identify_meter, identify_meters_batch,
+    get_ruaccent_model, get_ru_stress_engine, get_tiered_accentizer, analyze_rhythms, analysis_version,
+    METER_ENGINES, get_meter_engine, set_meter_engine
 )
+from poetry_meter_detector.utils.metrics import metrics, profiling
+from poetry_meter_detector.utils.records import LineAnalysis, PoemAnalysis, json_default
+from poetry_translator.utils.analysis_cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
 
 class DatasetPreparator:
-    def __init__(self):
-        self.accentizer = load_ruaccent_model()
-        if self.accentizer is None:
-            print("Предупреждение: модель RuAccent не загружена. Будет использован упрощенный анализ.")
+    def __init__(self, load_model: bool = True, cache: Optional[AnalysisCache] = None, tiered: bool = False):
+        self.cache = cache
+        self.tiered = tiered
+        self.accentizer = None
+        if load_model:
+            self.accentizer = get_tiered_accentizer() if tiered else get_ruaccent_model()
+        self.stress_engine = None
+        if load_model and self.accentizer is None:
+            print("Предупреждение: модель RuAccent не загружена. Будет использован словарь ударений с правилами по суффиксам.")
+            self.stress_engine = get_ru_stress_engine()
 
-    def analyze_poem(self, text: str, lang: str = 'ru') -> Dict:
+    def analyze_poem(self, text: str, lang: str = 'ru') -> PoemAnalysis:
         if lang != 'ru':
-            return {
-                "meter": "неопределенный размер",
-                "rhythm": []
-            }
+            return PoemAnalysis([], "неопределенный размер")
 
         lines = [line.strip() for line in text.split('\n') if line.strip()]
         if not lines:
-            return {
-                "meter": "неопределенный размер",
-                "rhythm": []
-            }
+            return PoemAnalysis([], "неопределенный размер")
 
         line_analyses = []
         all_stress_patterns = []
         
-        for line in lines:
-            clean_line = clean_text(line)
-            if not clean_line.strip():
-                continue
-                
-            try:
-                stress_pattern = detect_stress_pattern(clean_line, language='ru', use_ruaccent=True, accentizer=self.accentizer)
-                if not stress_pattern and self.accentizer is None:
-                    words = clean_line.split()
-                    stress_pattern = []
-                    syllable_count = 0
-                    for word in words:
-                        syllables = count_syllables_ru(word)
-                        if syllables > 0:
-                            stress_pattern.append(syllable_count)
-                        syllable_count += syllables
-            except Exception as e:
-                print(f"Ошибка при анализе строки '{line}': {e}")
-                continue
-                
+        pairs = [(line, clean_text(line)) for line in lines]
+        pairs = [(line, clean_line) for line, clean_line in pairs if clean_line.strip()]
+        
+        try:
+            stress_patterns = detect_stress_patterns_batch([clean_line for _, clean_line in pairs],
+                                                           accentizer=self.accentizer or self.stress_engine)
+        except Exception as e:
+            logger.warning(f"Ошибка при пакетном анализе стихотворения: {e}")
+            stress_patterns = [[] for _ in pairs]
+        
+        analysed_lines = [(line, stress_pattern) for (line, _), stress_pattern in zip(pairs, stress_patterns)]
+        
+        meters = identify_meters_batch([stress_pattern for _, stress_pattern in analysed_lines])
+        rhythms = analyze_rhythms([stress_pattern for _, stress_pattern in analysed_lines])
+        
+        for (line, stress_pattern), meter, rhythm_info in zip(analysed_lines, meters, rhythms):
             all_stress_patterns.extend(stress_pattern)
             
-            meter = identify_meter(stress_pattern)
-            rhythm_info = analyze_rhythm(stress_pattern)
-            
-            line_analyses.append({
-                'line': line,
-                'stress_pattern': stress_pattern,
-                'meter': meter,
-                'rhythm_info': rhythm_info
-            })
+            line_analyses.append(LineAnalysis(line, stress_pattern, meter, rhythm_info))
 
         overall_meter = identify_meter(all_stress_patterns)
         
-        return {
-            "meter": overall_meter,
-            "rhythm": all_stress_patterns,
-            "line_analyses": line_analyses
-        }
+        return PoemAnalysis(line_analyses, overall_meter, all_stress_patterns)
 
     def prepare_parallel_poems(self, source_file: str, target_file: str, 
-                             source_lang: str = 'ru', target_lang: str = 'en') -> List[Dict]:
-        with open(source_file, 'r', encoding='utf-8') as f:
-            source_poems = [p.strip() for p in f.read().split('\n\n') if p.strip()]
-            
-        with open(target_file, 'r', encoding='utf-8') as f:
-            target_poems = [p.strip() for p in f.read().split('\n\n') if p.strip()]
-            
-        if len(source_poems) != len(target_poems):
+                             source_lang: str = 'ru', target_lang: str = 'en',
+                             workers: int = 1) -> List[Dict]:
+        return list(self.iter_parallel_poems(source_file, target_file, source_lang, target_lang, workers=workers))
+
+    def iter_parallel_poems(self, source_file: str, target_file: str,
+                            source_lang: str = 'ru', target_lang: str = 'en',
+                            workers: int = 1, skip: int = 0) -> Iterator[Dict]:
+        if count_poems(source_file) != count_poems(target_file):
             raise ValueError("Количество стихотворений в файлах не совпадает")
             
-        dataset = []
-        for source, target in zip(source_poems, target_poems):
-            source_analysis = self.analyze_poem(source, source_lang)
+        pairs = islice(zip(iter_poems(source_file), iter_poems(target_file)), skip, None)
+        
+        if workers > 1:
+            analysed = self._analyze_in_pool(pairs, source_lang, workers)
+        else:
+            analysed = self._analyze_serial(pairs, source_lang)
             
-            dataset.append({
+        for source, target, source_analysis in analysed:
+            yield {
                 "source_text": source,
                 "target_text": target,
-                "meter": source_analysis["meter"],
-                "rhythm": source_analysis["rhythm"],
-                "line_analyses": source_analysis.get("line_analyses", [])
-            })
-            
-        return dataset
+                "meter": source_analysis.meter,
+                "rhythm": source_analysis.rhythm,
+                "line_analyses": source_analysis.lines
+            }
+
+    def _cached_analysis(self, text: str, lang: str) -> Tuple[Optional[str], Optional[PoemAnalysis]]:
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(text, lang)
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        return key, PoemAnalysis.from_dict(cached)
+
+    def _analyze_serial(self, pairs: Iterable[Tuple[str, str]], lang: str) -> Iterator[Tuple[str, str, PoemAnalysis]]:
+        for source, target in pairs:
+            key, analysis = self._cached_analysis(source, lang)
+            if analysis is None:
+                analysis = self.analyze_poem(source, lang)
+                if key is not None and self.accentizer is not None:
+                    self.cache.put(key, analysis.to_dict())
+            yield source, target, analysis
+
+    def _analyze_in_pool(self, pairs: Iterable[Tuple[str, str]], lang: str,
+                         workers: int) -> Iterator[Tuple[str, str, PoemAnalysis]]:
+        window = workers * 4
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.tiered, get_meter_engine())) as executor:
+            for source, target in pairs:
+                key, analysis = self._cached_analysis(source, lang)
+                future = None
+                if analysis is None:
+                    future = executor.submit(_analyze_in_worker, (source, lang))
+                pending.append((source, target, key, analysis, future))
+                while pending and (pending[0][4] is None or len(pending) >= window):
+                    yield self._complete_pending(pending.popleft())
+            while pending:
+                yield self._complete_pending(pending.popleft())
+
+    def _complete_pending(self, entry) -> Tuple[str, str, PoemAnalysis]:
+        source, target, key, analysis, future = entry
+        if future is not None:
+            analysis, from_model = future.result()
+            if key is not None and from_model:
+                self.cache.put(key, analysis.to_dict())
+        return source, target, analysis
 
     def save_dataset(self, dataset: List[Dict], output_file: str):
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(dataset, f, ensure_ascii=False, indent=2)
+            json.dump(dataset, f, ensure_ascii=False, indent=2, default=json_default)
+
+    def save_dataset_jsonl(self, records: Iterable[Dict], output_file: str, append: bool = False) -> int:
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        written = 0
+        with open(output_file, 'a' if append else 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=json_default) + '\n')
+                f.flush()
+                written += 1
+        return written
+
+def iter_poems(path: str) -> Iterator[str]:
+    buffer = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line:
+                buffer.append(line)
+                continue
+            poem = '\n'.join(buffer).strip()
+            buffer = []
+            if poem:
+                yield poem
+    poem = '\n'.join(buffer).strip()
+    if poem:
+        yield poem
+
+def count_poems(path: str) -> int:
+    return sum(1 for _ in iter_poems(path))
+
+def iter_dataset(path: str) -> Iterator[Dict]:
+    if not path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def recover_jsonl(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    valid_end = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+            count += 1
+            valid_end = f.tell()
+    if valid_end != os.path.getsize(path):
+        print(f"Обнаружена незавершенная запись в {path}, файл обрезан до {count} записей")
+        with open(path, 'r+b') as f:
+            f.truncate(valid_end)
+    return count
+
+_worker_preparator = None
+
+def _init_worker(tiered: bool = False, meter_engine: str = 'heuristic'):
+    global _worker_preparator
+    set_meter_engine(meter_engine)
+    _worker_preparator = DatasetPreparator(tiered=tiered)
+
+def _analyze_in_worker(task: Tuple[str, str]) -> Tuple[PoemAnalysis, bool]:
+    text, lang = task
+    return _worker_preparator.analyze_poem(text, lang), _worker_preparator.accentizer is not None
 
 def main():
     import argparse
@@ -113,15 +224,85 @@ def main():
     parser.add_argument('--output_file', type=str, required=True, help='Путь для сохранения датасета')
     parser.add_argument('--source_lang', type=str, default='ru', help='Язык исходных стихов')
     parser.add_argument('--target_lang', type=str, default='en', help='Язык переводов')
+    parser.add_argument('--workers', type=int, default=1, help='Количество процессов для анализа стихов')
+    parser.add_argument('--format', type=str, choices=['json', 'jsonl'], default=None,
+                        help='Формат датасета (по умолчанию определяется по расширению output_file)')
+    parser.add_argument('--resume', action='store_true', help='Продолжить запись JSONL-датасета с последней записи')
+    parser.add_argument('--tiered', action='store_true',
+                        help='Сначала искать ударения в словаре, а RuAccent вызывать только для неизвестных слов и омографов')
+    parser.add_argument('--meter-engine', type=str, choices=METER_ENGINES, default=get_meter_engine(),
+                        help='Способ определения размера: эвристика по шаблонам или скандирование динамическим программированием')
+    parser.add_argument('--cache', type=str, default=None,
+                        help='Путь к кэшу анализа (по умолчанию analysis_cache.sqlite рядом с output_file)')
+    parser.add_argument('--no-cache', action='store_true', help='Не использовать кэш анализа')
+    parser.add_argument('--cache-max-entries', type=int, default=100000, help='Максимальное количество записей в кэше')
+    parser.add_argument('--cache-max-age-days', type=float, default=None, help='Удалять записи, не использованные дольше N дней')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='Файл для метрик по этапам в формате Prometheus (при --workers > 1 учитывается только основной процесс)')
+    parser.add_argument('--log-level', type=str, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='WARNING',
+                        help='Уровень логов анализатора')
     
     args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    output_format = args.format or ('jsonl' if args.output_file.endswith('.jsonl') else 'json')
+    if args.resume and output_format != 'jsonl':
+        parser.error('--resume работает только с форматом jsonl')
+    set_meter_engine(args.meter_engine)
+    
+    cache = None
+    if not args.no_cache:
+        cache_path = args.cache or os.path.join(os.path.dirname(args.output_file), 'analysis_cache.sqlite')
+        cache = AnalysisCache(cache_path, analysis_version(args.source_lang, tiered=args.tiered),
+                              max_entries=args.cache_max_entries, max_age_days=args.cache_max_age_days)
+    
+    preparator = DatasetPreparator(load_model=args.workers <= 1, cache=cache, tiered=args.tiered)
+    try:
+        with profiling('prepare_dataset'):
+            _run(preparator, args, output_format)
+        if hasattr(preparator.accentizer, 'report'):
+            print_tier_report(preparator.accentizer.report())
+    finally:
+        if cache is not None:
+            cache.evict()
+            print(cache.report())
+            cache.close()
+        print(metrics.report())
+        if args.metrics_file:
+            metrics.write(args.metrics_file)
+            print(f"Метрики сохранены в {args.metrics_file}")
+
+def print_tier_report(stats: Dict):
+    print("Уровни определения ударений (по словам): " + ", ".join(
+        f"{tier} {rate * 100:.1f}%" for tier, rate in stats['word_rates'].items()))
+    print("Уровни определения ударений (по строкам): " + ", ".join(
+        f"{tier} {rate * 100:.1f}%" for tier, rate in stats['line_rates'].items()))
+    print(f"Вызовов модели: {stats['model_calls']}, слов через модель: {stats['model_words']}, "
+          f"{stats['ms_per_line']:.2f} мс/строка")
+
+def _run(preparator: DatasetPreparator, args, output_format: str):
+    if output_format == 'jsonl':
+        done = recover_jsonl(args.output_file) if args.resume else 0
+        if done:
+            print(f"Продолжение с записи {done + 1}")
+        records = preparator.iter_parallel_poems(
+            args.source_file,
+            args.target_file,
+            args.source_lang,
+            args.target_lang,
+            workers=args.workers,
+            skip=done
+        )
+        written = preparator.save_dataset_jsonl(records, args.output_file, append=args.resume)
+        print(f"Датасет сохранен в {args.output_file}")
+        print(f"Количество пар стихотворений: {done + written}")
+        return
     
-    preparator = DatasetPreparator()
     dataset = preparator.prepare_parallel_poems(
         args.source_file,
         args.target_file,
         args.source_lang,
-        args.target_lang
+        args.target_lang,
+        workers=args.workers
     )
     
     preparator.save_dataset(dataset, args.output_file)
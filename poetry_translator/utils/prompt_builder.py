@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+PROMPT_TEMPLATE = """Тебе будет дано стихотворение на русском языке и подробный анализ его стихотворного размера (метра) и ритма.
+Твоя задача — выполнить высококачественный художественный перевод этого стихотворения на английский язык.
+
+Ключевые требования к переводу:
+1.  **Сохранение смысла**: Точно передать оригинальное сообщение, эмоции и образы стихотворения.
+2.  **Соблюдение стихотворного размера и ритма**: Постарайся максимально приблизить английский перевод к метру и ритму оригинала. Используй предоставленный анализ как ориентир. Если точное соответствие невозможно, стремись к гармоничному поэтическому звучанию на английском.
+3.  **ОБЯЗАТЕЛЬНОЕ НАЛИЧIE РИФМЫ**: Перевод должен быть рифмованным. Рифма должна быть естественной, осмысленной и благозвучной в английском языке. Избегай примитивных или натянутых рифм.
+4.  **Поэтичность и стиль**: Перевод должен звучать как настоящее стихотворение на английском, а не как дословный или технический пересказ. Сохрани, по возможности, стиль и тон оригинала.
+5.  **Целостность**: Переведи все строки и строфы стихотворения.
+
+Оригинальное стихотворение (Русский):
+---
+{original_text}
+---
+
+Подробный анализ оригинального стихотворения:
+---
+{full_analysis_text}
+---
+
+Пожалуйста, предоставь ТОЛЬКО английский перевод стихотворения, без дополнительных комментариев или пояснений с твоей стороны.
+
+Английский перевод:
+"""
+
+def build_analysis_text(line_analysis_details: List[Dict], dominant_meter: str) -> str:
+    analysis_summary_parts = [f"Общий доминирующий метр: {dominant_meter}"]
+    for detail in line_analysis_details:
+        analysis_summary_parts.append(
+            f"Строка {detail['line_number']}: \"{detail['text']}\"\n"
+            f"  - Ударения (позиции слогов): {detail['stress_pattern']}\n"
+            f"  - Метр: {detail['meter']}\n"
+            f"  - Тип ритма: {detail['rhythm_type']}\n"
+            f"  - Плотность ударений: {detail['stress_density']:.2f}\n"
+            f"  - Интервалы между ударениями: {detail['stress_intervals']}"
+        )
+    return "\n".join(analysis_summary_parts)
+
+def _format_line_numbers(numbers: List[int]) -> str:
+    ranges = []
+    start = previous = numbers[0]
+    for number in numbers[1:]:
+        if number == previous + 1:
+            previous = number
+            continue
+        ranges.append(f"{start}-{previous}" if previous != start else str(start))
+        start = previous = number
+    ranges.append(f"{start}-{previous}" if previous != start else str(start))
+    return ",".join(ranges)
+
+def _meter_runs(line_analysis_details: List[Dict]) -> str:
+    runs = []
+    for detail in line_analysis_details:
+        if runs and runs[-1][0] == detail['meter'] and runs[-1][2] == detail['line_number'] - 1:
+            runs[-1][2] = detail['line_number']
+        else:
+            runs.append([detail['meter'], detail['line_number'], detail['line_number']])
+    return "; ".join(
+        f"{start}-{end} {meter}" if end != start else f"{start} {meter}"
+        for meter, start, end in runs
+    )
+
+def build_compact_analysis(line_analysis_details: List[Dict], dominant_meter: str) -> str:
+    analysis_summary_parts = [f"Общий доминирующий метр: {dominant_meter}"]
+    if not line_analysis_details:
+        return analysis_summary_parts[0]
+
+    groups = {}
+    for detail in line_analysis_details:
+        signature = (tuple(detail['stress_pattern']), detail['meter'], detail['rhythm_type'])
+        groups.setdefault(signature, []).append(detail['line_number'])
+
+    analysis_summary_parts.append(f"Метр по строкам: {_meter_runs(line_analysis_details)}")
+    analysis_summary_parts.append("Строки | ударные слоги | метр | ритм")
+    for (stress_pattern, meter, rhythm_type), line_numbers in groups.items():
+        positions = " ".join(str(position) for position in stress_pattern) or "-"
+        analysis_summary_parts.append(f"{_format_line_numbers(line_numbers)} | {positions} | {meter} | {rhythm_type}")
+    return "\n".join(analysis_summary_parts)
+
+ANALYSIS_BUILDERS = {
+    'full': build_analysis_text,
+    'compact': build_compact_analysis
+}
+
+def build_analysis(line_analysis_details: List[Dict], dominant_meter: str, analysis_format: str = 'full') -> str:
+    return ANALYSIS_BUILDERS[analysis_format](line_analysis_details, dominant_meter)
+
+def build_translation_prompt(original_text: str, full_analysis_text: str) -> str:
+    return PROMPT_TEMPLATE.format(original_text=original_text, full_analysis_text=full_analysis_text)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+class TranslationCache:
+    def __init__(self, path: str, ttl_days: Optional[float] = 30, max_bytes: Optional[int] = 100 * 1024 * 1024,
+                 evict_every: int = 50):
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.path = path
+        self.ttl = ttl_days * 86400 if ttl_days is not None else None
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self.conn.commit()
+
+    @staticmethod
+    def key(model_name: str, generation_config: Dict, prompt_text: str) -> str:
+        prompt_hash = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+        config = json.dumps(generation_config, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256('\0'.join([model_name, config, prompt_hash]).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                self.evicted += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key: str, model_name: str, response_text: str):
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response_text, len(response_text.encode('utf-8')), now, now)
+            )
+            self.conn.commit()
+            self.stored += 1
+            should_evict = self.stored % self.evict_every == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            if self.ttl is not None:
+                removed += self.conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,)).rowcount
+            if self.max_bytes is not None:
+                total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+                    victims = []
+                    for key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        victims.append((key,))
+                        total -= size
+                    self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                    removed += len(victims)
+            self.conn.commit()
+            self.evicted += removed
+        return removed
+
+    def report(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0.0
+        return (f"Кэш переводов: попаданий {self.hits}, промахов {self.misses} ({hit_rate:.1f}% попаданий), "
+                f"сохранено {self.stored}, удалено {self.evicted}")
+
+    def close(self):
+        self.evict()
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from poetry_translator.utils.translation_cache import TranslationCache
+
+DEFAULT_MODEL_NAME = 'models/gemini-1.5-flash-latest'
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 2.0,
+    "max_output_tokens": 2048
+}
+RETRYABLE_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'DeadlineExceeded', 'InternalServerError'}
+
+def is_retryable_error(error: Exception) -> bool:
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def extract_translation(response, logger: logging.Logger) -> Optional[str]:
+    if response.parts:
+        return response.text
+
+    logger.warning("Gemini API вернул пустой ответ (no parts). Возможно, сработали фильтры безопасности или другая проблема.")
+    if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
+        logger.warning(f"Prompt Feedback: {response.prompt_feedback}")
+    if hasattr(response, 'candidates') and response.candidates:
+        for candidate in response.candidates:
+            if hasattr(candidate, 'finish_reason') and candidate.finish_reason != 'STOP':
+                logger.warning(f"Кандидат завершился с причиной: {candidate.finish_reason}")
+                if hasattr(candidate, 'safety_ratings'):
+                    logger.warning(f"  Safety Ratings: {candidate.safety_ratings}")
+    return None
+
+def log_api_error(error: Exception, model_name: str, logger: logging.Logger):
+    logger.error(f"Ошибка при вызове Gemini API: {error}", exc_info=True)
+    if "Unsupported parameter" in str(error) or "Invalid value" in str(error):
+        logger.error("Возможно, указанная температура или другие параметры не поддерживаются для этой модели/версии API.")
+    elif "Could not find model" in str(error) or "is not found" in str(error):
+        logger.error(f"Модель '{model_name}' не найдена. Проверьте правильность имени и доступность для вашего API ключа.")
+    elif "billing account" in str(error).lower() or "quota" in str(error).lower() or "resourceexhausted" in str(error).lower():
+        logger.error(f"Проблема с квотами или биллингом для модели '{model_name}'. Эта модель может не иметь бесплатного уровня или вы исчерпали лимиты.")
+
+class AsyncRateLimiter:
+    def __init__(self, qps: Optional[float] = None, tokens_per_minute: Optional[int] = None):
+        self.interval = 1.0 / qps if qps else 0.0
+        self.tokens_per_minute = tokens_per_minute
+        self._next_request = 0.0
+        self._token_window = deque()
+        self._tokens_in_window = 0
+        self._lock = None
+
+    async def acquire(self, tokens: int = 0):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next_request)
+            self._next_request = start + self.interval
+
+            if self.tokens_per_minute:
+                tokens = min(tokens, self.tokens_per_minute)
+                while self._token_window and self._token_window[0][0] <= start - 60:
+                    self._tokens_in_window -= self._token_window.popleft()[1]
+                while self._token_window and self._tokens_in_window + tokens > self.tokens_per_minute:
+                    sent_at, sent_tokens = self._token_window.popleft()
+                    self._tokens_in_window -= sent_tokens
+                    start = max(start, sent_at + 60)
+                self._token_window.append((start, tokens))
+                self._tokens_in_window += tokens
+
+            if start > now:
+                await asyncio.sleep(start - now)
+
+class TranslationService:
+    def __init__(self, api_key: Optional[str] = None, model_name: str = DEFAULT_MODEL_NAME,
+                 generation_config: Optional[Dict] = None, max_concurrency: int = 8,
+                 qps: Optional[float] = 1.0, tokens_per_minute: Optional[int] = None,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 api_endpoint: Optional[str] = None, model=None,
+                 logger: Optional[logging.Logger] = None,
+                 cache: Optional[TranslationCache] = None, cache_only: bool = False, metrics=None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.generation_config = dict(generation_config or DEFAULT_GENERATION_CONFIG)
+        self.max_concurrency = max_concurrency
+        self.qps = qps
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.api_endpoint = api_endpoint
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache = cache
+        self.cache_only = cache_only
+        self.metrics = metrics
+        self.stats = {"requests": 0, "retries": 0, "succeeded": 0, "failed": 0, "cache_hits": 0, "cache_misses": 0}
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._limiters = {}
+        self._sync_loop = None
+        self._sync_lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is not None:
+            return self._model
+        with self._model_lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                options = {"api_key": self.api_key}
+                if self.api_endpoint:
+                    options["transport"] = "rest"
+                    options["client_options"] = {"api_endpoint": self.api_endpoint}
+                genai.configure(**options)
+                self.logger.info(f"Используемая модель Gemini: {self.model_name}")
+                self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        state = self._limiters.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.max_concurrency), AsyncRateLimiter(self.qps, self.tokens_per_minute))
+            self._limiters = {loop: state}
+        return state
+
+    def _count(self, result: str):
+        self.stats[result] += 1
+        if self.metrics is not None:
+            self.metrics.inc('api_requests', result=result)
+
+    def _retry_delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _lookup_cache(self, prompt_text: str) -> Tuple[Optional[str], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        key = TranslationCache.key(self.model_name, self.generation_config, prompt_text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count("cache_hits")
+            self.logger.info(f"Перевод взят из кэша (модель {self.model_name}, ключ {key[:12]})")
+        else:
+            self._count("cache_misses")
+        return key, cached
+
+    async def translate(self, prompt_text: str) -> Optional[str]:
+        cache_key, cached = self._lookup_cache(prompt_text)
+        if cached is not None:
+            return cached
+        if self.cache_only:
+            self.logger.warning("Перевод не найден в кэше, режим --cache-only: запрос к API пропущен.")
+            return None
+
+        semaphore, limiter = self._loop_state()
+        model = self._get_model()
+        tokens = estimate_tokens(prompt_text) + self.generation_config.get("max_output_tokens", 0)
+
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                await limiter.acquire(tokens)
+                self._count("requests")
+                start = time.perf_counter()
+                try:
+                    response = await model.generate_content_async(
+                        prompt_text,
+                        generation_config=self.generation_config
+                    )
+                    if self.metrics is not None:
+                        self.metrics.observe('api', time.perf_counter() - start)
+                    translation = extract_translation(response, self.logger)
+                    if translation is not None:
+                        self._count("succeeded")
+                        if cache_key is not None:
+                            self.cache.put(cache_key, self.model_name, translation)
+                        self.logger.info("Перевод успешно получен от Gemini API.")
+                    else:
+                        self._count("failed")
+                    return translation
+                except Exception as e:
+                    if self.metrics is not None:
+                        self.metrics.observe('api', time.perf_counter() - start)
+                        self.metrics.inc('model_failures', model=self.model_name, stage='call')
+                    if is_retryable_error(e) and attempt < self.max_retries:
+                        delay = self._retry_delay(attempt)
+                        self._count("retries")
+                        self.logger.warning(f"Временная ошибка Gemini API ({type(e).__name__}), "
+                                            f"повтор {attempt + 1}/{self.max_retries} через {delay:.1f} с")
+                        await asyncio.sleep(delay)
+                        continue
+                    self._count("failed")
+                    log_api_error(e, self.model_name, self.logger)
+                    return None
+        return None
+
+    async def translate_many(self, prompts: List[str]) -> List[Optional[str]]:
+        return await asyncio.gather(*(self.translate(prompt) for prompt in prompts))
+
+    def translate_sync(self, prompt_text: str) -> Optional[str]:
+        with self._sync_lock:
+            if self._sync_loop is None or self._sync_loop.is_closed():
+                self._sync_loop = asyncio.new_event_loop()
+            return self._sync_loop.run_until_complete(self.translate(prompt_text))
+
+    def close(self):
+        with self._sync_lock:
+            if self._sync_loop is not None and not self._sync_loop.is_closed():
+                self._sync_loop.run_until_complete(self._sync_loop.shutdown_asyncgens())
+                self._sync_loop.close()
+            self._sync_loop = None
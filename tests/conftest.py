@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+for path in (ROOT, ROOT / 'poetry_meter_detector', ROOT / 'poetry_translator' / 'scripts'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,28 @@
+import logging
+
+from utils import preprocess
+from utils.metrics import metrics
+
+def load_failures(name):
+    return metrics.counter('model_failures', model=name, stage='load')
+
+def test_tiered_accentizer_falls_back_quietly_without_ruaccent(monkeypatch, caplog):
+    attempts = []
+
+    def load_missing_ruaccent():
+        attempts.append('ruaccent')
+        return None
+
+    registry = preprocess.ModelRegistry()
+    registry.register('ruaccent', load_missing_ruaccent)
+    registry.register('ru_tiered', preprocess.load_tiered_accentizer)
+    monkeypatch.setattr(preprocess, 'model_registry', registry)
+    before = load_failures('ruaccent'), load_failures('ru_tiered')
+
+    with caplog.at_level(logging.ERROR, logger=preprocess.logger.name):
+        assert preprocess.get_tiered_accentizer() is None
+        assert preprocess.get_tiered_accentizer() is None
+
+    assert attempts == ['ruaccent']
+    assert len(caplog.records) == 1 and "'ruaccent'" in caplog.records[0].getMessage()
+    assert (load_failures('ruaccent'), load_failures('ru_tiered')) == (before[0] + 1, before[1])
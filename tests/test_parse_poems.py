@@ -0,0 +1,163 @@
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import parse_poems
+
+SITE_PATH = '/site/poetryandtranslations/'
+POEMS = {
+    'poem-1': ('Белеет парус одинокий', 'A lonely sail is flashing white'),
+    'poem-2': ('Мороз и солнце день чудесный', 'Frost and sunshine a wonderful day'),
+    'poem-3': ('Я помню чудное мгновенье', 'I recall a wonderful moment'),
+}
+
+def poem_path(name):
+    return f'{SITE_PATH}author-a/{name}'
+
+def render(body):
+    return f'<html><body>{body}</body></html>'.encode('utf-8')
+
+class Site:
+    def __init__(self):
+        links = ''.join(f'<a href="{poem_path(name)}">{name}</a>' for name in POEMS)
+        self.pages = {
+            f'{SITE_PATH}homepage1': render(f'<a href="{SITE_PATH}author-a">Author</a>'),
+            f'{SITE_PATH}author-a': render(links),
+        }
+        for name, (ru, en) in POEMS.items():
+            self.pages[poem_path(name)] = render(f'<p>{ru}</p><p>{en}</p>')
+        self.missing = set()
+        self.log = []
+        self.lock = threading.Lock()
+
+    def poem_requests(self):
+        return sorted(path for path, _ in self.log if path.startswith(f'{SITE_PATH}author-a/'))
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        site = self.server.site
+        body = site.pages.get(self.path)
+        if body is None or self.path in site.missing:
+            status = 404
+            self.send_response(status)
+            self.end_headers()
+        else:
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            status = 304 if self.headers.get('If-None-Match') == etag else 200
+            self.send_response(status)
+            self.send_header('ETag', etag)
+            if status == 200:
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if status == 200:
+                self.wfile.write(body)
+        with site.lock:
+            site.log.append((self.path, status))
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    server.site = Site()
+    server.site.base_url = f'http://127.0.0.1:{server.server_address[1]}{SITE_PATH}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.site
+    server.shutdown()
+    server.server_close()
+
+def crawl(site, output_dir, monkeypatch, *options):
+    monkeypatch.setattr(sys, 'argv', ['parse_poems.py', '--base-url', site.base_url, '--output-dir', str(output_dir),
+                                      '--workers', '2', '--min-interval', '0', *options])
+    parse_poems.main()
+
+def corpus(output_dir):
+    return (parse_poems.read_poems(output_dir / 'source_poems.txt'),
+            parse_poems.read_poems(output_dir / 'target_poems.txt'))
+
+def test_unchanged_pages_are_revalidated_with_etag(site, tmp_path, monkeypatch):
+    crawl(site, tmp_path, monkeypatch, '--cache-max-age', '0')
+    first = corpus(tmp_path)
+    assert {status for _, status in site.log} == {200}
+
+    site.log.clear()
+    crawl(site, tmp_path, monkeypatch, '--cache-max-age', '0', '--fresh')
+
+    assert len(site.log) == len(site.pages)
+    assert {status for _, status in site.log} == {304}
+    assert corpus(tmp_path) == first
+    assert first[0] == [ru for ru, _ in POEMS.values()]
+
+def test_fresh_cache_skips_requests(site, tmp_path, monkeypatch):
+    crawl(site, tmp_path, monkeypatch)
+    site.log.clear()
+    crawl(site, tmp_path, monkeypatch, '--fresh')
+
+    assert site.log == []
+    assert corpus(tmp_path)[1] == [en for _, en in POEMS.values()]
+
+def test_resume_fetches_only_pending_poems(site, tmp_path, monkeypatch):
+    site.missing.add(poem_path('poem-3'))
+    crawl(site, tmp_path, monkeypatch, '--no-cache')
+    assert len(corpus(tmp_path)[0]) == 2
+    checkpoint = (tmp_path / 'crawl_checkpoint.txt').read_text(encoding='utf-8').splitlines()
+    assert [line.split('\t')[1] for line in checkpoint] == ['pair', 'pair']
+
+    site.missing.clear()
+    site.log.clear()
+    crawl(site, tmp_path, monkeypatch, '--no-cache')
+
+    assert site.poem_requests() == [poem_path('poem-3')]
+    assert corpus(tmp_path) == ([ru for ru, _ in POEMS.values()], [en for _, en in POEMS.values()])
+
+def test_resume_drops_pair_missing_from_checkpoint(site, tmp_path, monkeypatch):
+    site.missing.add(poem_path('poem-3'))
+    crawl(site, tmp_path, monkeypatch, '--no-cache')
+    with open(tmp_path / 'source_poems.txt', 'a', encoding='utf-8') as f:
+        f.write('\n\nнедописанное стихотворение')
+
+    site.missing.clear()
+    crawl(site, tmp_path, monkeypatch, '--no-cache')
+
+    assert corpus(tmp_path) == ([ru for ru, _ in POEMS.values()], [en for _, en in POEMS.values()])
+
+class Interrupted(BaseException):
+    pass
+
+def test_interrupted_fresh_crawl_leaves_no_partial_files(site, tmp_path, monkeypatch):
+    (tmp_path / 'source_poems.txt').write_text('старый корпус', encoding='utf-8')
+    (tmp_path / 'target_poems.txt').write_text('old corpus', encoding='utf-8')
+    extract = parse_poems.extract_poem_variants
+
+    def interrupt_on_second_poem(soup):
+        if POEMS['poem-2'][0] in soup.get_text():
+            raise Interrupted()
+        return extract(soup)
+
+    monkeypatch.setattr(parse_poems, 'extract_poem_variants', interrupt_on_second_poem)
+    with pytest.raises(Interrupted):
+        crawl(site, tmp_path, monkeypatch, '--no-cache', '--fresh')
+
+    assert list(tmp_path.glob('*.partial')) == []
+    assert corpus(tmp_path) == ([POEMS['poem-1'][0]], [POEMS['poem-1'][1]])
+
+    monkeypatch.setattr(parse_poems, 'extract_poem_variants', extract)
+    crawl(site, tmp_path, monkeypatch, '--no-cache')
+
+    assert corpus(tmp_path) == ([ru for ru, _ in POEMS.values()], [en for _, en in POEMS.values()])
+
+def test_fresh_crawl_without_pairs_keeps_corpus(site, tmp_path, monkeypatch):
+    (tmp_path / 'source_poems.txt').write_text('старый корпус', encoding='utf-8')
+    (tmp_path / 'target_poems.txt').write_text('old corpus', encoding='utf-8')
+    site.missing.update(poem_path(name) for name in POEMS)
+
+    crawl(site, tmp_path, monkeypatch, '--no-cache', '--fresh')
+
+    assert corpus(tmp_path) == (['старый корпус'], ['old corpus'])
+    assert list(tmp_path.glob('*.partial')) == []
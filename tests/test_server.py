@@ -0,0 +1,27 @@
+import threading
+
+from server import MicroBatcher
+
+class UpperAccentizer:
+    def __init__(self):
+        self.calls = []
+
+    def process_all(self, text):
+        self.calls.append(text)
+        return text.upper()
+
+def test_batched_requests_keep_their_line_breaks():
+    accentizer = UpperAccentizer()
+    batcher = MicroBatcher(accentizer, window=0.2)
+    texts = [f'раз два\nтри {i}\n\nчетыре' for i in range(3)]
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.update({i: batcher.process_all(texts[i])})) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert results == {i: text.upper() for i, text in enumerate(texts)}
+    assert len(accentizer.calls) == 1
+    assert batcher.stats()["fallbacks"] == 0
@@ -0,0 +1,28 @@
+from utils import preprocess
+from utils.stress_index import CompactStressDict, build_compact_stress_dict
+
+def test_get_returns_pattern_or_default(tmp_path):
+    path = tmp_path / 'stress_dict_en.bin'
+    build_compact_stress_dict({'river': [1, 0], 'away': [0, 1]}, path)
+
+    with CompactStressDict(path) as stress_dict:
+        assert stress_dict.get('away') == [0, 1]
+        assert stress_dict.get('moon') is None
+        assert stress_dict.get('moon', []) == []
+
+def test_reload_closes_previous_compact_dict(tmp_path, monkeypatch):
+    monkeypatch.setattr(preprocess, 'DICTIONARIES_DIR', str(tmp_path))
+    monkeypatch.setattr(preprocess, '_stress_dict_cache', {})
+    path = tmp_path / 'stress_dict_en.bin'
+    build_compact_stress_dict({'river': [1, 0]}, path)
+
+    first = preprocess.load_stress_dict(language='en')
+    assert preprocess.load_stress_dict(language='en') is first
+
+    build_compact_stress_dict({'river': [1, 0], 'away': [0, 1]}, path)
+    second = preprocess.load_stress_dict(language='en')
+
+    assert second is not first
+    assert second['away'] == [0, 1]
+    assert first._mm is None and first._file.closed
+    second.close()
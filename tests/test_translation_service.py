@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from poetry_translator.utils import translation_service
+from poetry_translator.utils.translation_cache import TranslationCache
+from poetry_translator.utils.translation_service import TranslationService
+
+class ResourceExhausted(Exception):
+    pass
+
+class InvalidArgument(Exception):
+    pass
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.parts = [text]
+
+class FakeModel:
+    def __init__(self, failures=(), delay=0.0):
+        self.failures = list(failures)
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_content_async(self, prompt_text, generation_config=None):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                raise self.failures.pop(0)
+            return FakeResponse(f'перевод: {prompt_text}')
+        finally:
+            self.active -= 1
+
+def make_service(model, **options):
+    options.setdefault('qps', None)
+    options.setdefault('base_delay', 0.001)
+    return TranslationService(model=model, **options)
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite'))
+    yield cache
+    cache.close()
+
+def test_retries_resource_exhausted_and_caches_result(cache):
+    model = FakeModel([ResourceExhausted('quota')])
+    service = make_service(model, cache=cache)
+
+    assert asyncio.run(service.translate('строка')) == 'перевод: строка'
+    assert service.stats == {"requests": 2, "retries": 1, "succeeded": 1, "failed": 0,
+                             "cache_hits": 0, "cache_misses": 1}
+
+    assert asyncio.run(service.translate('строка')) == 'перевод: строка'
+    assert model.calls == 2
+    assert service.stats["cache_hits"] == 1
+    assert (cache.hits, cache.misses, cache.stored) == (1, 1, 1)
+
+def test_gives_up_after_max_retries():
+    model = FakeModel([ResourceExhausted('quota')] * 3)
+    service = make_service(model, max_retries=2)
+
+    assert asyncio.run(service.translate('строка')) is None
+    assert model.calls == 3
+    assert (service.stats["retries"], service.stats["failed"], service.stats["succeeded"]) == (2, 1, 0)
+
+def test_does_not_retry_other_errors(cache):
+    model = FakeModel([InvalidArgument('bad prompt')])
+    service = make_service(model, cache=cache)
+
+    assert asyncio.run(service.translate('строка')) is None
+    assert model.calls == 1
+    assert (service.stats["retries"], service.stats["failed"]) == (0, 1)
+    assert cache.stored == 0
+
+def test_retry_delay_grows_exponentially_up_to_max_delay(monkeypatch):
+    monkeypatch.setattr(translation_service.random, 'uniform', lambda low, high: high)
+    service = make_service(FakeModel(), base_delay=1.0, max_delay=10.0)
+
+    assert [service._retry_delay(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 8.0, 10.0]
+
+def test_semaphore_limits_concurrent_requests():
+    model = FakeModel(delay=0.01)
+    service = make_service(model, max_concurrency=2)
+
+    results = asyncio.run(service.translate_many([f'строка {i}' for i in range(6)]))
+
+    assert results == [f'перевод: строка {i}' for i in range(6)]
+    assert model.max_active == 2
+
+def test_cache_only_skips_model_on_miss(cache):
+    model = FakeModel()
+    service = make_service(model, cache=cache, cache_only=True)
+
+    assert asyncio.run(service.translate('строка')) is None
+    assert model.calls == 0
+    assert service.stats["cache_misses"] == 1
+
+def test_expired_cache_entry_is_evicted(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite'), ttl_days=0)
+    cache.put('key', 'model', 'перевод')
+
+    assert cache.get('key') is None
+    assert (cache.misses, cache.evicted) == (1, 1)
+    cache.close()
+
+def test_translate_sync_reuses_one_event_loop():
+    model = FakeModel([ResourceExhausted('quota')])
+    service = make_service(model)
+
+    assert service.translate_sync('первая') == 'перевод: первая'
+    loop = service._sync_loop
+    assert service.translate_sync('вторая') == 'перевод: вторая'
+    assert service._sync_loop is loop
+    assert service.stats["retries"] == 1
+
+    service.close()
+    assert loop.is_closed()